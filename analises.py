@@ -0,0 +1,257 @@
+"""Cálculos de cada página de análise, separados da renderização.
+
+Cada função ``analisar_*`` recebe o :class:`~dataset.Dataset` e os parâmetros
+da barra lateral e devolve um dicionário com as tabelas, séries e métricas que
+a página exibe. Nada aqui chama ``st.*``, então as mesmas funções servem ao
+dashboard e ao gerador de relatórios em lote (``relatorio.py``).
+"""
+import os
+import warnings
+
+import pandas as pd
+
+from atrasos import TODOS_OS_ESTADOS, construir_motor_atrasos
+from cancelamentos import construir_fatos_cancelamento
+from cobertura import calcular_cobertura, calcular_cobertura_por_centro, construir_matriz_estoque, top_criticos
+from correlacoes import analisar_correlacoes, construir_cubo_categorias
+from dataset import contar_valores
+from financeiro import calcular_financeiro_pedidos
+from indice_datas import construir_indices_datas
+from instrumentacao import etapa
+from memo import chave_parametros
+from outliers import METODO_PADRAO, construir_filtro_outliers
+from rollup import calcular_rollup_diario, serie_desconto_medio, serie_pedidos_por_dia
+
+# Motor das análises com joins pesados: 'pandas' (padrão) ou 'duckdb' (requer o pacote duckdb)
+MOTOR = os.environ.get('DASHBOARD_MOTOR', 'pandas')
+
+
+def analisar_pedidos_por_dia(dataset):
+    """Série de pedidos distintos por dia e o total do período."""
+    serie_pedidos = serie_pedidos_por_dia(calcular_rollup_diario(dataset))
+    return {
+        'serie_pedidos': serie_pedidos,
+        'total_pedidos': int(serie_pedidos.sum()),
+    }
+
+
+def analisar_descontos(dataset, desconsiderar_outliers=False, metodo_outliers=METODO_PADRAO, limiar_outliers=None):
+    """Desconto médio e pedidos por dia, opcionalmente sem os dias outliers, e as correlações entre eles.
+
+    Os outliers são os dias com mais pedidos que o limite de ``metodo_outliers``
+    com ``limiar_outliers`` (ver :mod:`outliers`). O limite, os dias removidos,
+    o desconto médio e a correlação de Pearson saem do filtro pré-calculado da
+    versão; Spearman, a reta de regressão e as correlações móveis, defasadas e
+    por categoria, de :func:`correlacoes.analisar_correlacoes`, com os dias
+    removidos como ``NaN`` para as janelas e defasagens seguirem o calendário.
+    """
+    serie_desconto, serie_pedidos = serie_desconto_medio(calcular_rollup_diario(dataset))
+    filtro = construir_filtro_outliers(dataset)
+
+    limite_outlier = None
+    mascara = None
+    if desconsiderar_outliers:
+        limite_outlier = filtro.limite(metodo_outliers, limiar_outliers)
+        mascara = serie_pedidos <= limite_outlier
+
+    correlacoes = analisar_correlacoes(
+        serie_desconto.where(mascara) if mascara is not None else serie_desconto,
+        serie_pedidos.where(mascara) if mascara is not None else serie_pedidos,
+        construir_cubo_categorias(dataset),
+    )
+    if mascara is not None:
+        # Filtra os dados com base no limite de pedidos
+        serie_pedidos = serie_pedidos[mascara]
+        serie_desconto = serie_desconto[mascara]
+
+    return {
+        'serie_desconto': serie_desconto,
+        'serie_pedidos': serie_pedidos,
+        'limite_outlier': limite_outlier,
+        **filtro.resumo(limite_outlier),
+        **correlacoes,
+    }
+
+
+def analisar_faturamento(dataset, periodo=None, calcular_com_desconto=False):
+    """Faturamento e ticket médio por categoria e por produto.
+
+    ``periodo`` é uma tupla ``(data_inicio, data_fim)`` ou ``None`` para todo o
+    período. Se não houver pedidos válidos, ``vazio`` é ``True`` e as tabelas
+    não são calculadas.
+    """
+    df_pedido_filtrado = dataset.pedidos
+    df_itens_filtrado = dataset.itens
+    df_financeiro_pedidos = calcular_financeiro_pedidos(dataset)
+
+    if periodo is not None:
+        # Índices ordenados por data: o filtro vira uma busca binária + fatia
+        indices = construir_indices_datas(dataset)
+        data_inicio, data_fim = periodo
+        df_pedido_filtrado = indices['pedidos'].fatiar(data_inicio, data_fim)
+        df_financeiro_pedidos = indices['financeiro'].fatiar(data_inicio, data_fim)
+        df_itens_filtrado = indices['itens'].fatiar(data_inicio, data_fim)
+
+    df_financeiro_pedidos = df_financeiro_pedidos[(df_financeiro_pedidos['desconto_calculado'] >= 0) & (df_financeiro_pedidos['desconto_calculado'] <= 100)]
+    if df_financeiro_pedidos.empty:
+        return {'vazio': True}
+
+    df_financeiro_itens = df_itens_filtrado.merge(df_financeiro_pedidos[['order_id', 'desconto_calculado']], on='order_id', how='left')
+    # Filtra itens que não pertencem ao período de datas selecionado
+    df_financeiro_itens = df_financeiro_itens[df_financeiro_itens['order_id'].isin(df_financeiro_pedidos['order_id'])]
+
+    if calcular_com_desconto:
+        df_financeiro_itens['faturamento'] = df_financeiro_itens['price'] * (1 - df_financeiro_itens['desconto_calculado']/100)
+    else:
+        df_financeiro_itens['faturamento'] = df_financeiro_itens['price']
+
+    preco_por_categoria = df_financeiro_itens.groupby('material_category', observed=True)['faturamento'].sum().sort_values(ascending=False)
+    preco_por_nome = df_financeiro_itens.groupby('material_name', observed=True)['faturamento'].sum().sort_values(ascending=False)
+
+    # Ticket médio = Faturamento Total / Número de Pedidos Únicos
+    pedidos_por_categoria = df_financeiro_itens.groupby('material_category', observed=True)['order_id'].nunique()
+    pedidos_por_produto = df_financeiro_itens.groupby('material_name', observed=True)['order_id'].nunique()
+
+    return {
+        'vazio': False,
+        'faturamento_total': float(df_pedido_filtrado['Valor de NF (R$)'].sum()),
+        'preco_por_categoria': preco_por_categoria,
+        'preco_por_nome': preco_por_nome,
+        'ticket_medio_categoria': (preco_por_categoria / pedidos_por_categoria).round(2).sort_values(ascending=False),
+        'ticket_medio_produto': (preco_por_nome / pedidos_por_produto).round(2).sort_values(ascending=False),
+    }
+
+
+def analisar_cancelamento(dataset, X=20):
+    """Taxas de ruptura e de estoque crítico por status do pedido e volume de cancelamentos.
+
+    Tudo sai da tabela de fatos dos itens da versão dos dados
+    (:mod:`cancelamentos`); só a taxa de estoque crítico depende de ``X``.
+    """
+    fatos = construir_fatos_cancelamento(dataset)
+    return {
+        'taxa_ruptura': fatos.taxa_ruptura(),
+        'taxa_critico': fatos.taxa_critico(X),
+        'cancelamentos_categoria': fatos.cancelamentos_categoria,
+        'cancelamentos_produto': fatos.cancelamentos_produto,
+    }
+
+
+def analisar_estoque(dataset, X=15):
+    """Produtos com venda e estoque zerado, Top X de menor cobertura e sua distribuição por centro."""
+    df_cobertura = calcular_cobertura(dataset)
+
+    # Itens com 0 dias de estoque, mas que também não tiveram vendas, são filtrados
+    df_criticos = top_criticos(df_cobertura, X)
+    produtos_zerados = df_cobertura.query('dias_de_estoque == 0 and venda_media_diaria > 0')
+
+    # Estoque e cobertura de cada crítico em cada centro: linhas da matriz material x centro
+    df_distribuicao_estoque = construir_matriz_estoque(dataset).distribuicao(
+        df_criticos['material_id'], calcular_cobertura_por_centro(dataset)
+    )
+
+    return {
+        'produtos_zerados': produtos_zerados[['material_name', 'total_vendido', 'venda_media_diaria']],
+        'criticos': df_criticos[['material_id', 'material_name', 'dias_de_estoque', 'quantity', 'total_vendido', 'venda_media_diaria']],
+        'distribuicao': df_distribuicao_estoque,
+    }
+
+
+def estados_disponiveis(dataset):
+    """Opções do filtro de estado da página de atrasos."""
+    return [TODOS_OS_ESTADOS] + construir_motor_atrasos(dataset).estados()
+
+
+def tabelas_atraso(dataset, estado_selecionado=TODOS_OS_ESTADOS):
+    """Tabelas de atraso por estado, transportadora e região e os ids dos pedidos atrasados do filtro.
+
+    Ver :meth:`atrasos.MotorAtrasos.tabelas`.
+    """
+    return construir_motor_atrasos(dataset).tabelas(estado_selecionado)
+
+
+def analisar_atraso(dataset, estado_selecionado=TODOS_OS_ESTADOS, estoque_critico_limite=10):
+    """Atrasos por estado e transportadora e a relação dos itens atrasados com o estoque."""
+    df_itens, df_supply = dataset.itens, dataset.supply
+    tabelas, ids_pedidos_atrasados = tabelas_atraso(dataset, estado_selecionado)
+
+    # --- Itens dos pedidos atrasados x estoque ---
+    df_estoque_total = df_supply.groupby(['material_id', 'material_name'], observed=True)['quantity'].sum().reset_index()
+    df_financeiro_itens = df_itens[['order_id', 'material_name', 'material_id']]
+    itens_atrasados = df_financeiro_itens[df_financeiro_itens['order_id'].isin(ids_pedidos_atrasados)]
+    itens_atrasados_com_estoque = pd.merge(itens_atrasados, df_estoque_total, on=['material_id', 'material_name'], how='left').fillna({'quantity': 0})
+
+    produtos_estoque_zerado = itens_atrasados_com_estoque[itens_atrasados_com_estoque['quantity'] == 0]
+    produtos_estoque_critico = itens_atrasados_com_estoque[
+        (itens_atrasados_com_estoque['quantity'] > 0) &
+        (itens_atrasados_com_estoque['quantity'] <= estoque_critico_limite)
+    ]
+
+    total_itens_atrasados = len(itens_atrasados_com_estoque)
+    qtd_zerado = len(produtos_estoque_zerado)
+    qtd_critico = len(produtos_estoque_critico)
+
+    return {
+        **tabelas,
+        'total_itens_atrasados': total_itens_atrasados,
+        'qtd_zerado': qtd_zerado,
+        'qtd_critico': qtd_critico,
+        'perc_zerado': (qtd_zerado / total_itens_atrasados * 100) if total_itens_atrasados > 0 else 0,
+        'perc_critico': (qtd_critico / total_itens_atrasados * 100) if total_itens_atrasados > 0 else 0,
+        'ranking_zerado': contar_valores(produtos_estoque_zerado, 'material_name'),
+        'ranking_critico': contar_valores(produtos_estoque_critico, 'material_name'),
+    }
+
+
+# Registro usado pelo dashboard e pelo gerador de relatórios
+ANALISES = {
+    'pedidos': analisar_pedidos_por_dia,
+    'descontos': analisar_descontos,
+    'faturamento': analisar_faturamento,
+    'cancelamento': analisar_cancelamento,
+    'estoque': analisar_estoque,
+    'atraso': analisar_atraso,
+}
+
+
+def funcao_analise(nome):
+    """Função que executa a análise ``nome`` no motor configurado em :data:`MOTOR`."""
+    if MOTOR == 'duckdb':
+        from motor_duckdb import ANALISES_DUCKDB, disponivel
+
+        if not disponivel():
+            warnings.warn("DASHBOARD_MOTOR=duckdb, mas o pacote duckdb não está instalado; usando o pandas.", stacklevel=2)
+        elif nome in ANALISES_DUCKDB:
+            return ANALISES_DUCKDB[nome]
+    return ANALISES[nome]
+
+
+def calcular_analise(nome, dataset, parametros):
+    """Resultado da análise ``nome``: o pré-calculado pelo ``relatorio.py``, se houver, ou calculado agora."""
+    from relatorio import ler_resultado_precalculado
+
+    resultado = ler_resultado_precalculado(nome, dataset.versao, parametros)
+    if resultado is None:
+        resultado = funcao_analise(nome)(dataset, **parametros)
+    return resultado
+
+
+def executar_analise(nome, dataset, memo=None, **parametros):
+    """Executa a análise ``nome``, servindo o resultado pré-calculado quando disponível.
+
+    Se ``DASHBOARD_RELATORIOS`` aponta para a saída do ``relatorio.py`` e ela
+    contém esta combinação de parâmetros para a versão atual dos dados, o
+    resultado é lido do Parquet em vez de recalculado. Os parâmetros padrão
+    de cada página vêm do cache do processo, aquecido em segundo plano
+    (:mod:`aquecimento`). Com ``memo`` (um :class:`memo.MemoLRU`), o
+    resultado fica guardado por versão, página e parâmetros.
+    """
+    from aquecimento import aquecedor
+
+    def calcular():
+        with etapa(f'analise:{nome}'):
+            return aquecedor().obter(dataset, nome, parametros, lambda: calcular_analise(nome, dataset, parametros))
+
+    if memo is None:
+        return calcular()
+    return memo.obter((dataset.versao, nome, chave_parametros(parametros)), calcular)
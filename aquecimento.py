@@ -0,0 +1,156 @@
+"""Pré-cálculo em segundo plano dos resultados padrão das páginas.
+
+Assim que o dataset é carregado (na página inicial, o próprio aquecimento o
+carrega), um pool de threads calcula o resultado de cada página com os
+parâmetros padrão da barra lateral (:data:`PARAMETROS_PADRAO`). Os resultados
+ficam em um cache do processo, compartilhado entre sessões, consultado por
+:func:`analises.executar_analise`: o primeiro clique em uma página encontra o
+resultado pronto ou espera o cálculo em andamento, sem repeti-lo.
+
+Só as combinações padrão de cada página entram neste cache, e só para as
+versões mais recentes dos dados (:data:`~dataset.VERSOES_EM_CACHE`); as demais
+combinações continuam no memo da sessão. Desligado com
+``DASHBOARD_AQUECIMENTO=0``; ``DASHBOARD_AQUECIMENTO_THREADS`` define o
+tamanho do pool (padrão 2).
+"""
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from analises import calcular_analise
+from atrasos import TODOS_OS_ESTADOS
+from dataset import VERSOES_EM_CACHE
+from memo import chave_parametros
+
+ATIVO = os.environ.get('DASHBOARD_AQUECIMENTO', '1') not in ('', '0')
+THREADS = int(os.environ.get('DASHBOARD_AQUECIMENTO_THREADS', 2))
+
+# Parâmetros com que cada página abre (os controles da barra lateral no valor inicial)
+PARAMETROS_PADRAO = {
+    'pedidos': {},
+    'descontos': {'desconsiderar_outliers': False},
+    'faturamento': {'periodo': None, 'calcular_com_desconto': False},
+    'cancelamento': {'X': 20},
+    'estoque': {'X': 15},
+    'atraso': {'estado_selecionado': TODOS_OS_ESTADOS, 'estoque_critico_limite': 10},
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _e_padrao(nome, parametros):
+    return nome in PARAMETROS_PADRAO and chave_parametros(parametros) == chave_parametros(PARAMETROS_PADRAO[nome])
+
+
+class Aquecedor:
+    """Resultados padrão das páginas por versão dos dados, calculados uma única vez no processo.
+
+    Cada combinação tem um :class:`~concurrent.futures.Future`: quem pede um
+    resultado em cálculo espera por ele, e um cálculo que falhou é descartado
+    para ser refeito por quem pedir em seguida. Um cálculo ainda na fila do
+    pool é assumido por quem o pede: a tarefa do pool é cancelada e o
+    resultado é calculado na hora, sem esperar as páginas à frente na fila.
+    """
+
+    def __init__(self, threads=THREADS):
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='aquecimento')
+        self._resultados = {}
+        # Tarefa do pool de cada combinação agendada por aquecer(), para poder cancelá-la
+        self._tarefas = {}
+        self._versoes = []
+        self._carregando = False
+        self._lock = threading.Lock()
+
+    def _registrar(self, chave):
+        """Future da combinação e se quem chamou deve calculá-la (``True`` se ela é nova); requer o lock."""
+        futuro = self._resultados.get(chave)
+        if futuro is not None and not (futuro.done() and futuro.exception() is not None):
+            return futuro, False
+        versao = chave[0]
+        if versao not in self._versoes:
+            self._versoes.append(versao)
+            # Versões antigas saem do cache junto com os resultados
+            for antiga in self._versoes[:-VERSOES_EM_CACHE]:
+                self._resultados = {c: f for c, f in self._resultados.items() if c[0] != antiga}
+                self._tarefas = {c: t for c, t in self._tarefas.items() if c[0] != antiga}
+            del self._versoes[:-VERSOES_EM_CACHE]
+        futuro = self._resultados[chave] = Future()
+        return futuro, True
+
+    def obter(self, dataset, nome, parametros, calcular):
+        """Resultado de ``calcular()`` para uma combinação padrão, compartilhado no processo.
+
+        Combinações fora de :data:`PARAMETROS_PADRAO` são calculadas direto.
+        """
+        if not _e_padrao(nome, parametros):
+            return calcular()
+        chave = (dataset.versao, nome, chave_parametros(parametros))
+        with self._lock:
+            futuro, novo = self._registrar(chave)
+            if not novo:
+                # Ainda na fila: cancelada, a tarefa passa para quem pediu
+                tarefa = self._tarefas.pop(chave, None)
+                novo = tarefa is not None and tarefa.cancel()
+        if novo:
+            self._executar(futuro, calcular)
+        elif futuro.exception() is not None:
+            # O cálculo em segundo plano falhou: refeito aqui, para o erro aparecer na página
+            return calcular()
+        return futuro.result()
+
+    @staticmethod
+    def _executar(futuro, calcular, *args):
+        try:
+            futuro.set_result(calcular(*args))
+        except BaseException as erro:
+            futuro.set_exception(erro)
+
+    def aquecer(self, dataset):
+        """Agenda o cálculo das combinações padrão de ``dataset`` que ainda não existem."""
+        for nome, parametros in PARAMETROS_PADRAO.items():
+            chave = (dataset.versao, nome, chave_parametros(parametros))
+            with self._lock:
+                futuro, novo = self._registrar(chave)
+                if novo:
+                    self._tarefas[chave] = self._pool.submit(self._executar, futuro, calcular_analise, nome, dataset, parametros)
+
+    def carregar_e_aquecer(self, carregar):
+        """Carrega o dataset com ``carregar()`` em segundo plano e então o aquece."""
+        with self._lock:
+            if self._carregando:
+                return
+            self._carregando = True
+
+        def tarefa():
+            try:
+                self.aquecer(carregar())
+            except Exception:
+                logger.exception("Falha ao pré-calcular as páginas")
+            finally:
+                with self._lock:
+                    self._carregando = False
+
+        self._pool.submit(tarefa)
+
+    def estatisticas(self):
+        with self._lock:
+            futuros = list(self._resultados.values())
+        return {
+            'versoes': len(self._versoes),
+            'prontos': sum(f.done() and f.exception() is None for f in futuros),
+            'em_andamento': sum(not f.done() for f in futuros),
+        }
+
+
+_aquecedor = None
+_lock_aquecedor = threading.Lock()
+
+
+def aquecedor():
+    """:class:`Aquecedor` do processo (compartilhado entre as sessões)."""
+    global _aquecedor
+    with _lock_aquecedor:
+        if _aquecedor is None:
+            _aquecedor = Aquecedor()
+        return _aquecedor
@@ -0,0 +1,225 @@
+"""Armazém compartilhado do dataset para o modo com vários processos.
+
+Com ``DASHBOARD_ARMAZEM=<diretório>``, os processos do dashboard não leem as
+planilhas: um processo carregador (``python armazem.py``) normaliza o dataset,
+aplica os deltas e o publica no diretório como arquivos Arrow IPC sem
+compressão, e cada processo do dashboard mapeia esses arquivos em memória.
+As páginas do sistema operacional com os dados são compartilhadas entre os
+processos; cada um guarda só as próprias tabelas derivadas.
+
+As colunas são gravadas em formatos que o pandas consegue usar sem cópia: datas
+como inteiros (``NaT`` incluso), ``category`` como os códigos inteiros (com as
+categorias em um arquivo à parte) e números e textos como estão. Cada versão
+vai para um subdiretório próprio, e o arquivo :data:`ARQUIVO_ATUAL` passa a
+apontar para ela só depois de gravada (com ``os.replace``): os processos do
+dashboard trocam de versão de uma vez, no rerun seguinte.
+"""
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+from dataset import ARQUIVO_ITENS_SUPPLY, ARQUIVO_PEDIDOS, Dataset, ler_dataset
+from ingestao import versao_dados
+from instrumentacao import cronometrado
+
+DIRETORIO_ARMAZEM = os.environ.get('DASHBOARD_ARMAZEM', '')
+
+ARQUIVO_ATUAL = 'ATUAL'
+FRAMES = ('pedidos', 'itens', 'supply')
+
+# Versões mantidas no diretório; as mais antigas são apagadas (um processo que
+# ainda as tenha mapeadas continua lendo normalmente)
+VERSOES_MANTIDAS = 3
+
+
+# --- GRAVAÇÃO (PROCESSO CARREGADOR) ---
+
+def _gravar_arrow(tabela, caminho):
+    with pa.OSFile(caminho, 'wb') as arquivo, pa.ipc.new_file(arquivo, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+
+
+def _codificar(serie):
+    """Array Arrow sem cópia na leitura e a descrição da coluna para o arquivo de metadados."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return pa.array(serie.cat.codes.to_numpy()), {'tipo': 'categoria', 'ordenada': bool(serie.cat.ordered)}
+    if serie.dtype.kind == 'M':
+        return pa.array(serie.to_numpy().view('int64')), {'tipo': 'data', 'dtype': str(serie.dtype)}
+    if serie.dtype.kind in 'biuf':
+        return pa.array(serie.to_numpy()), {'tipo': 'numero'}
+    return pa.array(serie, from_pandas=True), {'tipo': 'arrow'}
+
+
+def gravar_frame(df, diretorio, nome):
+    """Grava ``df`` como ``<nome>.arrow`` e as categorias de cada coluna ``category`` em arquivos à parte."""
+    arrays, colunas = [], []
+    for posicao, (coluna, serie) in enumerate(df.items()):
+        array, descricao = _codificar(serie)
+        arrays.append(array)
+        colunas.append({'nome': coluna, **descricao})
+        if descricao['tipo'] == 'categoria':
+            categorias = pa.table({'categorias': pa.array(serie.cat.categories, from_pandas=True)})
+            _gravar_arrow(categorias, os.path.join(diretorio, f"{nome}.{posicao}.categorias.arrow"))
+    _gravar_arrow(pa.table(arrays, names=[f"c{i}" for i in range(len(arrays))]), os.path.join(diretorio, f"{nome}.arrow"))
+    return colunas
+
+
+def publicar(dataset, diretorio=DIRETORIO_ARMAZEM):
+    """Grava ``dataset`` como uma nova versão do armazém e passa a apontar para ela."""
+    destino = os.path.join(diretorio, dataset.versao)
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    shutil.rmtree(temporario, ignore_errors=True)
+    os.makedirs(temporario)
+
+    meta = {'versao': dataset.versao, 'memoria': dataset.memoria, 'frames': {}}
+    frames = {'pedidos': dataset.pedidos, 'itens': dataset.itens, 'supply': dataset.supply}
+    for nome, df in frames.items():
+        meta['frames'][nome] = gravar_frame(df, temporario, nome)
+    with open(os.path.join(temporario, 'meta.json'), 'w', encoding='utf-8') as arquivo:
+        json.dump(meta, arquivo, ensure_ascii=False)
+
+    if os.path.exists(destino):
+        # Mesma versão já publicada (reinício do carregador)
+        shutil.rmtree(temporario)
+    else:
+        os.replace(temporario, destino)
+
+    atual = os.path.join(diretorio, ARQUIVO_ATUAL)
+    with open(f"{atual}.tmp", 'w', encoding='utf-8') as arquivo:
+        arquivo.write(dataset.versao)
+    os.replace(f"{atual}.tmp", atual)
+    _remover_antigas(diretorio, dataset.versao)
+
+
+def _remover_antigas(diretorio, versao_atual):
+    versoes = [
+        os.path.join(diretorio, nome) for nome in os.listdir(diretorio)
+        if os.path.isfile(os.path.join(diretorio, nome, 'meta.json')) and nome != versao_atual
+    ]
+    versoes.sort(key=os.path.getmtime, reverse=True)
+    for antiga in versoes[VERSOES_MANTIDAS - 1:]:
+        shutil.rmtree(antiga, ignore_errors=True)
+
+
+# --- LEITURA (PROCESSOS DO DASHBOARD) ---
+
+def _ler_arrow(caminho):
+    """Tabela Arrow mapeada em memória (sem ler o arquivo para o heap)."""
+    return pa.ipc.open_file(pa.memory_map(caminho, 'r')).read_all()
+
+
+def _para_numpy(coluna):
+    return coluna.chunk(0).to_numpy(zero_copy_only=True) if coluna.num_chunks == 1 else coluna.to_numpy()
+
+
+def ler_frame(diretorio, nome, colunas):
+    """Frame ``nome`` da versão em ``diretorio``, com as colunas apoiadas no arquivo mapeado."""
+    tabela = _ler_arrow(os.path.join(diretorio, f"{nome}.arrow"))
+    dados = {}
+    for posicao, descricao in enumerate(colunas):
+        coluna = tabela.column(posicao)
+        if descricao['tipo'] == 'categoria':
+            categorias = pd.Index(_ler_arrow(os.path.join(diretorio, f"{nome}.{posicao}.categorias.arrow")).column(0).to_pandas().array)
+            tipo = pd.CategoricalDtype(categorias, ordered=descricao['ordenada'])
+            dados[descricao['nome']] = pd.Categorical.from_codes(_para_numpy(coluna), dtype=tipo, validate=False)
+        elif descricao['tipo'] == 'data':
+            dados[descricao['nome']] = _para_numpy(coluna).view(descricao['dtype'])
+        elif descricao['tipo'] == 'numero':
+            dados[descricao['nome']] = _para_numpy(coluna)
+        else:
+            dados[descricao['nome']] = coluna.to_pandas()
+    return pd.DataFrame(dados, copy=False)
+
+
+def versao_publicada(diretorio=DIRETORIO_ARMAZEM):
+    """Versão para a qual o armazém aponta (``None`` se nada foi publicado ainda)."""
+    try:
+        with open(os.path.join(diretorio, ARQUIVO_ATUAL), encoding='utf-8') as arquivo:
+            return arquivo.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+@cronometrado('abrir_armazem')
+def abrir(diretorio=DIRETORIO_ARMAZEM, versao=None):
+    """:class:`~dataset.Dataset` da versão publicada (ou de ``versao``), mapeado do armazém."""
+    versao = versao or versao_publicada(diretorio)
+    if versao is None:
+        raise FileNotFoundError(f"Nenhuma versão publicada no armazém {diretorio!r}; rode `python armazem.py` antes.")
+    caminho = os.path.join(diretorio, versao)
+    with open(os.path.join(caminho, 'meta.json'), encoding='utf-8') as arquivo:
+        meta = json.load(arquivo)
+    frames = {nome: ler_frame(caminho, nome, meta['frames'][nome]) for nome in FRAMES}
+    memoria = {nome: tuple(valores) for nome, valores in meta['memoria'].items()}
+    return Dataset(frames['pedidos'], frames['itens'], frames['supply'], meta['versao'], memoria)
+
+
+class LeitorArmazem:
+    """Dataset do armazém neste processo, trocado quando o carregador publica outra versão."""
+
+    def __init__(self, diretorio=DIRETORIO_ARMAZEM):
+        self.diretorio = diretorio
+        self.dataset = None
+        self._lock = threading.Lock()
+
+    def atual(self):
+        """Dataset da versão publicada; só lê o armazém quando a versão muda."""
+        versao = versao_publicada(self.diretorio)
+        with self._lock:
+            if self.dataset is None or (versao is not None and versao != self.dataset.versao):
+                self.dataset = abrir(self.diretorio, versao)
+            return self.dataset
+
+
+@st.cache_resource
+def _leitor():
+    return LeitorArmazem()
+
+
+def dataset_do_armazem():
+    """Dataset compartilhado do armazém (modo com vários processos)."""
+    return _leitor().atual()
+
+
+# --- PROCESSO CARREGADOR ---
+
+def carregar_e_publicar(diretorio, intervalo=None):
+    """Publica o dataset com os deltas aplicados e, com ``intervalo``, segue publicando as versões novas."""
+    from incremental import Atualizador
+
+    os.makedirs(diretorio, exist_ok=True)
+    versao_base = atualizador = None
+    while True:
+        if versao_dados(ARQUIVO_PEDIDOS, ARQUIVO_ITENS_SUPPLY) != versao_base:
+            # As planilhas mudaram: recomeça da base, e os deltas são reaplicados sobre ela
+            atualizador = Atualizador(ler_dataset())
+            versao_base = atualizador.dataset.versao
+        dataset = atualizador.atualizar()
+        if dataset.versao != versao_publicada(diretorio):
+            inicio = time.perf_counter()
+            publicar(dataset, diretorio)
+            print(f"Publicada a versão {dataset.versao} em {time.perf_counter() - inicio:.1f}s: {dataset!r}", flush=True)
+        if intervalo is None:
+            return dataset
+        time.sleep(intervalo)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publica o dataset normalizado no armazém compartilhado pelos processos do dashboard.")
+    parser.add_argument('--diretorio', default=DIRETORIO_ARMAZEM or os.path.join('data', 'armazem'),
+                        help="diretório do armazém (padrão: DASHBOARD_ARMAZEM ou data/armazem)")
+    parser.add_argument('--acompanhar', type=float, metavar='SEGUNDOS',
+                        help="continua rodando e publica uma versão nova quando as planilhas ou os deltas mudarem")
+    args = parser.parse_args(argv)
+    carregar_e_publicar(args.diretorio, args.acompanhar)
+
+
+if __name__ == '__main__':
+    main()
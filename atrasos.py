@@ -0,0 +1,174 @@
+"""Motor de atrasos de entrega usado pela página de atrasos.
+
+As colunas de prazo, entrega e criação dos pedidos são convertidas uma única
+vez por versão dos dados em arrays int64 (epoch em ns), junto com a máscara de
+pedidos atrasados, o tempo de entrega em dias e os códigos de estado e
+transportadora. Totais, atrasados e tempo médio de entrega por estado, por
+transportadora e por estado x transportadora saem de uma única contagem
+(``np.bincount``) sobre as células estado x transportadora; as tabelas de cada
+seleção de estado ficam guardadas no próprio motor.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dataset import COLUNA_ENTREGA, COLUNA_PRAZO, HASH_DATASET, VERSOES_EM_CACHE
+from instrumentacao import cronometrado
+
+TODOS_OS_ESTADOS = 'Todos os Estados'
+
+NS_POR_DIA = 86_400 * 10**9
+
+
+def _epoch_ns(serie):
+    return serie.to_numpy(dtype='datetime64[ns]').view('int64')
+
+
+def _codigos(serie):
+    """Códigos inteiros e categorias de uma coluna (``category`` ou não)."""
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype('category')
+    return serie.cat.codes.to_numpy(), serie.dtype
+
+
+def tabela_atrasos(total, atrasados):
+    """Total, atrasados e percentual de atraso a partir das contagens por grupo."""
+    df_analise = pd.DataFrame({
+        'Total de Pedidos': total,
+        'Pedidos Atrasados': atrasados
+    }).fillna(0)
+    df_analise['Pedidos Atrasados'] = df_analise['Pedidos Atrasados'].astype(int)
+    df_analise['Percentual de Atraso (%)'] = np.where(
+        df_analise['Total de Pedidos'] > 0,
+        (df_analise['Pedidos Atrasados'] / df_analise['Total de Pedidos']) * 100,
+        0
+    )
+    return df_analise
+
+
+def _contagem(contagens, categorias, nome):
+    """Contagens por categoria no formato de ``contar_valores``: só as presentes, da maior para a menor."""
+    indice = pd.CategoricalIndex(pd.Categorical.from_codes(np.arange(len(categorias.categories)), dtype=categorias), name=nome)
+    contagem = pd.Series(contagens.astype('int64'), index=indice, name='count').sort_values(ascending=False)
+    return contagem[contagem > 0]
+
+
+class MotorAtrasos:
+    """Pedidos com prazo e entrega reduzidos a arrays, com as tabelas de atraso por seleção de estado."""
+
+    def __init__(self, df_pedido):
+        datas = df_pedido[['created_at', COLUNA_PRAZO, COLUNA_ENTREGA]]
+        validos = datas.notna().all(axis=1).to_numpy()
+
+        criado = _epoch_ns(df_pedido['created_at'])[validos]
+        prazo = _epoch_ns(df_pedido[COLUNA_PRAZO])[validos]
+        entrega = _epoch_ns(df_pedido[COLUNA_ENTREGA])[validos]
+
+        self.atrasado = entrega > prazo
+        # Como ``Timedelta.days``: dias inteiros, arredondados para baixo
+        self.dias_entrega = (entrega - criado) // NS_POR_DIA
+        self.order_id = df_pedido['order_id'].to_numpy()[validos]
+
+        codigos_estado, self.tipo_estado = _codigos(df_pedido['Estado'])
+        codigos_transp, self.tipo_transp = _codigos(df_pedido['Transportadora'])
+        self.codigo_estado = codigos_estado[validos]
+        self.codigo_transp = codigos_transp[validos]
+        self.n_estados = len(self.tipo_estado.categories)
+        self.n_transp = len(self.tipo_transp.categories)
+
+        self._tabelas = {}
+        self._lock = threading.Lock()
+
+    def estados(self):
+        """Estados com ao menos um pedido com prazo e entrega, em ordem alfabética."""
+        presentes = np.unique(self.codigo_estado[self.codigo_estado >= 0])
+        return sorted(self.tipo_estado.categories[presentes].tolist())
+
+    def _selecao(self, estado_selecionado):
+        if estado_selecionado == TODOS_OS_ESTADOS:
+            return np.ones(len(self.codigo_estado), dtype=bool)
+        if estado_selecionado not in self.tipo_estado.categories:
+            return np.zeros(len(self.codigo_estado), dtype=bool)
+        return self.codigo_estado == self.tipo_estado.categories.get_loc(estado_selecionado)
+
+    def _celulas(self, selecao):
+        """Totais, atrasados e soma dos dias de entrega por célula estado x transportadora, em uma passada.
+
+        Pedidos sem estado ou sem transportadora vão para uma linha/coluna extra
+        (a última): entram nos totais da outra dimensão, mas não formam grupo,
+        como no ``groupby``.
+        """
+        estado = np.where(self.codigo_estado < 0, self.n_estados, self.codigo_estado)[selecao]
+        transp = np.where(self.codigo_transp < 0, self.n_transp, self.codigo_transp)[selecao]
+        forma = (self.n_estados + 1, self.n_transp + 1)
+        celula = estado.astype('int64') * forma[1] + transp
+        tamanho = forma[0] * forma[1]
+        total = np.bincount(celula, minlength=tamanho).reshape(forma)
+        atrasados = np.bincount(celula, weights=self.atrasado[selecao], minlength=tamanho).reshape(forma).astype('int64')
+        dias = np.bincount(celula, weights=self.dias_entrega[selecao], minlength=tamanho).reshape(forma)
+        return total, atrasados, dias
+
+    def tabelas(self, estado_selecionado=TODOS_OS_ESTADOS):
+        """Tabelas de atraso por estado, transportadora e região e os ids dos pedidos atrasados.
+
+        Devolve ``(tabelas, ids_pedidos_atrasados)``; ``tabelas`` tem as chaves
+        ``analise_estados``, ``analise_transportadoras`` e ``analise_regional``
+        (esta só na visão geral). O resultado é guardado por estado e deve ser
+        tratado como somente leitura.
+        """
+        with self._lock:
+            if estado_selecionado not in self._tabelas:
+                self._tabelas[estado_selecionado] = self._calcular(estado_selecionado)
+            return self._tabelas[estado_selecionado]
+
+    def _calcular(self, estado_selecionado):
+        selecao = self._selecao(estado_selecionado)
+        total, atrasados, dias = self._celulas(selecao)
+
+        # --- Atrasos por estado ---
+        total_estado = total[:-1].sum(axis=1)
+        df_analise_atrasos = tabela_atrasos(
+            _contagem(total_estado, self.tipo_estado, 'Estado'), _contagem(atrasados[:-1].sum(axis=1), self.tipo_estado, 'Estado')
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tempo_medio = dias[:-1].sum(axis=1) / total_estado
+        tempo_medio = pd.Series(tempo_medio, index=pd.CategoricalIndex(self.tipo_estado.categories, dtype=self.tipo_estado))
+        df_analise_atrasos['Tempo Médio de Entrega (dias)'] = tempo_medio
+        df_analise_atrasos = df_analise_atrasos.sort_values(by='Percentual de Atraso (%)', ascending=False)
+
+        # --- Atrasos por transportadora ---
+        df_analise_transp = tabela_atrasos(
+            _contagem(total[:, :-1].sum(axis=0), self.tipo_transp, 'Transportadora'),
+            _contagem(atrasados[:, :-1].sum(axis=0), self.tipo_transp, 'Transportadora'),
+        )
+
+        # --- Estado x transportadora (apenas na visão geral) ---
+        df_analise_regional = None
+        if estado_selecionado == TODOS_OS_ESTADOS:
+            estado, transp = np.nonzero(total[:-1, :-1])
+            indice = pd.MultiIndex.from_arrays([
+                pd.Categorical.from_codes(estado, dtype=self.tipo_estado),
+                pd.Categorical.from_codes(transp, dtype=self.tipo_transp),
+            ], names=['Estado', 'Transportadora'])
+            df_analise_regional = pd.DataFrame({
+                'Total de Pedidos': total[estado, transp],
+                'Pedidos Atrasados': atrasados[estado, transp],
+            }, index=indice)
+            df_analise_regional['Percentual de Atraso (%)'] = (df_analise_regional['Pedidos Atrasados'] / df_analise_regional['Total de Pedidos'] * 100)
+
+        tabelas = {
+            'analise_estados': df_analise_atrasos,
+            'analise_transportadoras': df_analise_transp,
+            'analise_regional': df_analise_regional,
+        }
+        ids_pedidos_atrasados = pd.unique(self.order_id[selecao & self.atrasado])
+        return tabelas, ids_pedidos_atrasados
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('construir_motor_atrasos')
+def construir_motor_atrasos(dataset):
+    """Motor de atrasos da versão dos dados (compartilhado entre sessões)."""
+    return MotorAtrasos(dataset.pedidos)
@@ -0,0 +1,314 @@
+"""Benchmark das análises do dashboard sobre dados sintéticos.
+
+O gerador produz ``pedidos``, ``Itens`` e ``Supply`` com as mesmas colunas das
+planilhas reais, em qualquer tamanho (de 10 mil a dezenas de milhões de itens).
+Para cada tamanho o harness mede, sem renderizar nada:
+
+- as etapas pré-calculadas em cache (tabela financeira, cobertura, rollup diário,
+  índices por data), que concentram os groupbys e merges mais pesados;
+- cada página (``analises.ANALISES``) a frio, com os caches limpos, e a quente,
+  com as etapas já em cache, como em um rerun do Streamlit;
+- o pico de memória de cada medição, em uma passada separada com ``tracemalloc``
+  para não distorcer os tempos;
+- a memória dos frames antes e depois da compactação de tipos da carga.
+
+O relatório é gravado em JSON e pode ser comparado com um relatório anterior::
+
+    python benchmark.py --tamanhos 10000 1000000 --saida atual.json
+    python benchmark.py --tamanhos 10000 1000000 --comparar atual.json
+    python benchmark.py --tamanhos 1000000 --motor duckdb --comparar atual.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import analises
+from cobertura import calcular_cobertura, calcular_cobertura_por_centro
+from dataset import COLUNA_ENTREGA, COLUNA_PRAZO, normalizar_dataset, relatorio_memoria
+from financeiro import calcular_financeiro_pedidos
+from indice_datas import construir_indices_datas
+from relatorio import slug_parametros
+from rollup import calcular_rollup_diario
+
+ARQUIVO_PADRAO = 'benchmark.json'
+
+INICIO_PERIODO = pd.Timestamp('2025-02-01')
+DIAS_PERIODO = 28
+
+STATUS_PEDIDO = ['Entregue', 'Em trânsito', 'Cancelado']
+ESTADOS = [
+    'AC', 'AL', 'AM', 'AP', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA', 'MG', 'MS', 'MT', 'PA',
+    'PB', 'PE', 'PI', 'PR', 'RJ', 'RN', 'RO', 'RR', 'RS', 'SC', 'SE', 'SP', 'TO',
+]
+TRANSPORTADORAS = ['Correios', 'Jadlog', 'Loggi', 'Total Express']
+CATEGORIAS = ['Capinha', 'Garrafa', 'Carteira', 'Pulseira', 'Mochila', 'Necessaire', 'Copo']
+ESTADOS_ITEM = ['delivered', 'shipped', 'canceled']
+
+# Etapas em cache compartilhadas pelas páginas
+ETAPAS = {
+    'financeiro': calcular_financeiro_pedidos,
+    'cobertura': calcular_cobertura,
+    'cobertura_por_centro': calcular_cobertura_por_centro,
+    'rollup_diario': calcular_rollup_diario,
+    'indices_datas': construir_indices_datas,
+}
+
+# Páginas com os parâmetros padrão da barra lateral e as variações mais usadas
+CENARIOS = [
+    ('pedidos', {}),
+    ('descontos', {}),
+    ('descontos', {'desconsiderar_outliers': True}),
+    ('faturamento', {}),
+    ('faturamento', {'periodo': (datetime.date(2025, 2, 1), datetime.date(2025, 2, 7)), 'calcular_com_desconto': True}),
+    ('cancelamento', {'X': 20}),
+    ('estoque', {'X': 15}),
+    ('atraso', {}),
+    ('atraso', {'estado_selecionado': 'SP'}),
+]
+
+
+# --- GERADOR DE DADOS SINTÉTICOS ---
+
+def _escolher(rng, opcoes, n, pesos=None):
+    return np.asarray(opcoes, dtype=object)[rng.choice(len(opcoes), size=n, p=pesos)]
+
+
+def gerar_dados_sinteticos(n_itens, seed=0, itens_por_pedido=2.0, n_materiais=None, n_centros=3):
+    """Frames ``(pedidos, itens, supply)`` no formato bruto das planilhas.
+
+    Os pedidos usam a coluna ``id`` e as datas ficam em fevereiro de 2025, como
+    nos dados reais; o ``Valor de NF (R$)`` é a soma dos itens com desconto de
+    até 30% mais o frete, então a tabela financeira tem descontos válidos.
+    """
+    rng = np.random.default_rng(seed)
+    n_pedidos = max(1, int(n_itens / itens_por_pedido))
+    if n_materiais is None:
+        n_materiais = int(np.clip(n_itens // 20, 50, 20_000))
+
+    # --- Supply: um registro por material e centro ---
+    ids_materiais = np.arange(1000, 1000 + n_materiais)
+    nomes_materiais = np.array([f'Produto {i}' for i in ids_materiais], dtype=object)
+    categorias_materiais = _escolher(rng, CATEGORIAS, n_materiais)
+    precos_materiais = np.round(rng.lognormal(4.3, 0.5, n_materiais), 2)
+
+    material_supply = np.repeat(np.arange(n_materiais), n_centros)
+    quantidades = rng.poisson(25, len(material_supply))
+    # Parte do estoque zerada para alimentar as análises de ruptura
+    quantidades[rng.random(len(material_supply)) < 0.1] = 0
+    df_supply = pd.DataFrame({
+        'material_id': ids_materiais[material_supply],
+        'material_name': nomes_materiais[material_supply],
+        'inventory_centre_id': np.tile(np.arange(1, n_centros + 1), n_materiais),
+        'quantity': quantidades,
+    })
+
+    # --- Itens: cada item pertence a um pedido e a um material ---
+    pedido_do_item = np.sort(rng.integers(0, n_pedidos, n_itens))
+    material_do_item = rng.zipf(1.3, n_itens) % n_materiais
+    precos = np.round(precos_materiais[material_do_item] * rng.uniform(0.9, 1.1, n_itens), 2)
+    df_itens = pd.DataFrame({
+        'order_id': pedido_do_item + 1,
+        'material_id': ids_materiais[material_do_item],
+        'material_name': nomes_materiais[material_do_item],
+        'material_category': categorias_materiais[material_do_item],
+        'price': precos,
+        'aasm_state': _escolher(rng, ESTADOS_ITEM, n_itens, pesos=[0.7, 0.2, 0.1]),
+    })
+
+    # --- Pedidos ---
+    created_at = INICIO_PERIODO + pd.to_timedelta(rng.integers(0, DIAS_PERIODO * 86_400, n_pedidos), unit='s')
+    prazo = created_at + pd.to_timedelta(rng.integers(3, 11, n_pedidos), unit='D')
+    entrega = created_at + pd.to_timedelta(rng.integers(1, 16, n_pedidos), unit='D')
+    status = _escolher(rng, STATUS_PEDIDO, n_pedidos, pesos=[0.6, 0.25, 0.15])
+    entrega = entrega.where(status == 'Entregue')
+
+    soma_itens = np.bincount(pedido_do_item, weights=precos, minlength=n_pedidos)
+    frete = np.round(rng.uniform(10, 30, n_pedidos), 2)
+    desconto = np.where(rng.random(n_pedidos) < 0.6, rng.uniform(0, 0.3, n_pedidos), 0)
+    df_pedido = pd.DataFrame({
+        'id': np.arange(1, n_pedidos + 1),
+        'created_at': created_at,
+        'Valor de NF (R$)': np.round(soma_itens * (1 - desconto) + frete, 2),
+        'Frete Cobrado do Cliente (R$)': frete,
+        'Status do Pedido': status,
+        'Estado': _escolher(rng, ESTADOS, n_pedidos),
+        'Transportadora': _escolher(rng, TRANSPORTADORAS, n_pedidos),
+        COLUNA_PRAZO: prazo,
+        COLUNA_ENTREGA: entrega,
+    })
+    return df_pedido, df_itens, df_supply
+
+
+def dataset_sintetico(n_itens, seed=0, **opcoes):
+    """:class:`~dataset.Dataset` normalizado a partir de :func:`gerar_dados_sinteticos`."""
+    df_pedido, df_itens, df_supply = gerar_dados_sinteticos(n_itens, seed=seed, **opcoes)
+    return normalizar_dataset(df_pedido, df_itens, df_supply, versao=f'sintetico-{n_itens}-{seed}')
+
+
+# --- MEDIÇÕES ---
+
+def _limpar_caches():
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+
+def _cronometrar(funcao, repeticoes, preparar=None):
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def _pico_memoria(funcao, preparar=None):
+    """Pico de memória alocada (MB) durante ``funcao()``, acima do que já estava em uso."""
+    if preparar:
+        preparar()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico / 2**20
+
+
+def _resumo(tempos):
+    return {'mediana_s': float(np.median(tempos)), 'minimo_s': float(np.min(tempos))}
+
+
+def rotulo_cenario(nome, parametros):
+    return f'{nome}[{slug_parametros(parametros)}]' if parametros else nome
+
+
+def medir(dataset, repeticoes=3, memoria=True):
+    """Mede etapas e páginas para um dataset. Devolve ``{rótulo: métricas}``."""
+    medicoes = {}
+
+    for nome, etapa in ETAPAS.items():
+        executar = lambda: etapa(dataset)
+        metricas = _resumo(_cronometrar(executar, repeticoes, preparar=_limpar_caches))
+        if memoria:
+            metricas['pico_memoria_mb'] = _pico_memoria(executar, preparar=_limpar_caches)
+        medicoes[f'etapa:{nome}'] = metricas
+
+    for nome, parametros in CENARIOS:
+        executar = lambda: analises.funcao_analise(nome)(dataset, **parametros)
+        frio = _cronometrar(executar, repeticoes, preparar=_limpar_caches)
+        quente = _cronometrar(executar, repeticoes)
+        metricas = {**_resumo(frio), 'quente_mediana_s': float(np.median(quente))}
+        if memoria:
+            metricas['pico_memoria_mb'] = _pico_memoria(executar, preparar=_limpar_caches)
+        medicoes[f'pagina:{rotulo_cenario(nome, parametros)}'] = metricas
+
+    _limpar_caches()
+    return medicoes
+
+
+def executar_benchmark(tamanhos, repeticoes=3, seed=0, memoria=True):
+    """Relatório completo: ambiente e medições por tamanho (número de itens)."""
+    import streamlit.logger
+
+    # Fora de uma sessão os caches do Streamlit funcionam em memória, mas avisam a cada chamada
+    streamlit.logger.set_log_level('error')
+
+    relatorio = {
+        'ambiente': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'motor': analises.MOTOR,
+            'plataforma': platform.platform(),
+            'data': datetime.datetime.now().isoformat(timespec='seconds'),
+        },
+        'repeticoes': repeticoes,
+        'seed': seed,
+        'resultados': {},
+    }
+    for n_itens in tamanhos:
+        inicio = time.perf_counter()
+        dataset = dataset_sintetico(n_itens, seed=seed)
+        geracao = time.perf_counter() - inicio
+        print(f"--- {n_itens:,} itens ({dataset!r}, gerado em {geracao:.1f}s) ---", flush=True)
+        memoria_dataset = relatorio_memoria(dataset)
+        print(memoria_dataset.round(2).to_string(), flush=True)
+
+        medicoes = medir(dataset, repeticoes=repeticoes, memoria=memoria)
+        for rotulo, metricas in medicoes.items():
+            memoria_mb = f"{metricas['pico_memoria_mb']:9.1f} MB" if 'pico_memoria_mb' in metricas else ''
+            quente = f"quente {metricas['quente_mediana_s'] * 1000:9.1f} ms" if 'quente_mediana_s' in metricas else ''
+            print(f"{rotulo:<70} {metricas['mediana_s'] * 1000:9.1f} ms  {quente:<20} {memoria_mb}", flush=True)
+        relatorio['resultados'][str(n_itens)] = medicoes
+        relatorio.setdefault('memoria_dataset', {})[str(n_itens)] = memoria_dataset.to_dict(orient='index')
+        del dataset
+    return relatorio
+
+
+def comparar(anterior, atual, tolerancia=0.10):
+    """Imprime a variação da mediana entre dois relatórios e devolve as regressões acima da tolerância."""
+    regressoes = []
+    for tamanho, medicoes in atual['resultados'].items():
+        base = anterior['resultados'].get(tamanho)
+        if base is None:
+            continue
+        print(f"--- {int(tamanho):,} itens: anterior -> atual ---")
+        for rotulo, metricas in medicoes.items():
+            if rotulo not in base:
+                continue
+            antes, depois = base[rotulo]['mediana_s'], metricas['mediana_s']
+            razao = depois / antes if antes > 0 else float('inf')
+            marca = ''
+            if razao > 1 + tolerancia:
+                marca = '  REGRESSÃO'
+                regressoes.append((tamanho, rotulo, razao))
+            elif razao < 1 - tolerancia:
+                marca = '  melhora'
+            print(f"{rotulo:<70} {antes * 1000:9.1f} -> {depois * 1000:9.1f} ms  x{razao:5.2f}{marca}")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo e a memória das análises do dashboard em dados sintéticos.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[10_000, 100_000], help="Números de itens a gerar (padrão: %(default)s)")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Repetições por medição (padrão: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0, help="Semente do gerador (padrão: %(default)s)")
+    parser.add_argument('--sem-memoria', action='store_true', help="Não mede o pico de memória (passada com tracemalloc)")
+    parser.add_argument('--saida', default=ARQUIVO_PADRAO, help="Arquivo JSON do relatório (padrão: %(default)s)")
+    parser.add_argument('--comparar', help="Relatório anterior para comparar com esta execução")
+    parser.add_argument('--tolerancia', type=float, default=0.10, help="Variação tolerada antes de acusar regressão (padrão: %(default)s)")
+    parser.add_argument('--motor', choices=['pandas', 'duckdb'], default=analises.MOTOR,
+                        help="Motor das análises, como DASHBOARD_MOTOR (padrão: %(default)s)")
+    args = parser.parse_args(argv)
+    analises.MOTOR = args.motor
+
+    relatorio = executar_benchmark(args.tamanhos, repeticoes=args.repeticoes, seed=args.seed, memoria=not args.sem_memoria)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            anterior = json.load(arquivo)
+        regressoes = comparar(anterior, relatorio, tolerancia=args.tolerancia)
+
+    if args.comparar != args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+        print(f"Relatório gravado em {args.saida}")
+
+    if args.comparar and regressoes:
+        print(f"{len(regressoes)} regressão(ões) acima de {args.tolerancia:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,433 @@
+"""Execução em blocos (out-of-core) para bases maiores que a memória.
+
+Em vez de carregar ``pedidos`` e ``Itens`` inteiros, as agregações de que as
+páginas precisam são calculadas a partir dos Parquet sem nunca ter a base
+inteira em memória:
+
+- vendas por material (o ``value_counts`` de ``material_id``), pedidos e
+  atrasos por estado, transportadora e estado x transportadora e
+  cancelamentos por categoria e por produto são lidos em blocos de linhas
+  (``iter_batches`` do pyarrow), somando agregados parciais. A memória fica
+  limitada ao bloco mais os agregados, que têm uma linha por chave de saída
+  (material, estado, transportadora, produto);
+- faturamento e ticket médio por categoria e por produto precisam de estado
+  por pedido (a soma dos itens, o desconto calculado e os pedidos distintos
+  de cada grupo). Pedidos e itens são antes repartidos em disco pelo hash do
+  ``order_id`` (:func:`particionar_por_pedido`), e cada partição é processada
+  inteira: um pedido e todos os seus itens caem na mesma partição, então os
+  pedidos distintos de um grupo são a soma dos de cada partição. A memória
+  fica limitada a uma partição (cerca de ``tamanho_bloco`` itens, mais os
+  pedidos deles) mais os agregados por categoria e produto; o disco
+  temporário guarda uma cópia das colunas usadas.
+
+As funções devolvem as mesmas estruturas das equivalentes em memória de
+:mod:`analises`; ``python blocos.py --verificar`` compara os dois caminhos.
+
+As fontes são arquivos Parquet: por padrão os snapshots das planilhas criados
+pela camada de ingestão, ou qualquer Parquet com as mesmas colunas::
+
+    python blocos.py --pedidos pedidos_2025.parquet --itens itens_2025.parquet --tamanho-bloco 500000
+"""
+import argparse
+import math
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from atrasos import TODOS_OS_ESTADOS, tabela_atrasos
+from dataset import (ARQUIVO_ITENS_SUPPLY, ARQUIVO_PEDIDOS, COLUNA_ENTREGA, COLUNA_PRAZO, normalizar_dataset,
+                     normalizar_pedidos)
+from ingestao import garantir_snapshot
+
+TAMANHO_BLOCO_PADRAO = 1_000_000
+
+# Acima deste número de linhas pendentes, os agregados parciais são consolidados
+LIMITE_PARCIAIS = 1_000_000
+
+
+class AgregadoParcial:
+    """Agregado por chave acumulado bloco a bloco.
+
+    Os parciais de cada bloco (Series ou DataFrame indexados pela chave) ficam
+    pendentes e são consolidados com ``operacao`` (``'sum'``, ``'max'``...) sempre
+    que passam de ``limite`` linhas ou do dobro do agregado já consolidado, o que
+    mantém a memória proporcional ao número de chaves e o custo total linear.
+    """
+
+    def __init__(self, operacao='sum', limite=LIMITE_PARCIAIS):
+        self.operacao = operacao
+        self.limite = limite
+        self._parciais = []
+        self._pendentes = 0
+        self._consolidadas = 0
+
+    def adicionar(self, parcial):
+        self._parciais.append(parcial)
+        self._pendentes += len(parcial)
+        if self._pendentes > max(self.limite, 2 * self._consolidadas):
+            self._consolidar()
+
+    def _consolidar(self):
+        if len(self._parciais) > 1:
+            juntos = pd.concat(self._parciais)
+            niveis = list(range(juntos.index.nlevels))
+            self._parciais = [juntos.groupby(level=niveis, sort=True).agg(self.operacao)]
+        self._consolidadas = len(self._parciais[0]) if self._parciais else 0
+        self._pendentes = 0
+
+    def resultado(self, vazio=None):
+        """Agregado final, ordenado pela chave (``vazio`` se nenhum bloco contribuiu)."""
+        self._consolidar()
+        if not self._parciais:
+            return vazio if vazio is not None else pd.Series(dtype='float64')
+        return self._parciais[0].sort_index()
+
+
+# --- FONTES ---
+
+# Planilha e aba de cada fonte padrão
+PLANILHAS = {
+    'pedidos': (ARQUIVO_PEDIDOS, 0),
+    'itens': (ARQUIVO_ITENS_SUPPLY, 'Itens'),
+    'supply': (ARQUIVO_ITENS_SUPPLY, 'Supply'),
+}
+
+
+def fontes_padrao(nomes=('pedidos', 'itens')):
+    """Snapshots Parquet das planilhas do dashboard para as fontes ``nomes``, criados se necessário."""
+    return {nome: garantir_snapshot(*PLANILHAS[nome]) for nome in nomes}
+
+
+def iterar_blocos(caminho, colunas=None, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Gera DataFrames com até ``tamanho_bloco`` linhas lidas do Parquet em ``caminho``."""
+    import pyarrow.parquet as pq
+
+    arquivo = pq.ParquetFile(caminho, memory_map=True)
+    for lote in arquivo.iter_batches(batch_size=tamanho_bloco, columns=colunas):
+        yield lote.to_pandas()
+
+
+def _colunas_da_fonte(caminho, colunas):
+    """``colunas`` com ``order_id`` trocado por ``id`` se o Parquet guarda a chave assim (como as planilhas de pedidos)."""
+    import pyarrow.parquet as pq
+
+    nomes = pq.read_schema(caminho).names
+    return ['id' if coluna == 'order_id' and 'id' in nomes else coluna for coluna in colunas]
+
+
+def iterar_pedidos(fontes, colunas, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Blocos de pedidos já normalizados (``order_id`` e datas convertidas)."""
+    for bloco in iterar_blocos(fontes['pedidos'], _colunas_da_fonte(fontes['pedidos'], colunas), tamanho_bloco):
+        yield normalizar_pedidos(bloco)
+
+
+def _particao_do_pedido(chaves, n_particoes):
+    """Partição de cada ``order_id``; ids numéricos viram float para inteiros e floats iguais caírem juntos."""
+    valores = chaves.to_numpy(zero_copy_only=False)
+    valores = valores.astype('float64') if valores.dtype.kind in 'iuf' else valores.astype(str)
+    return (pd.util.hash_array(valores) % n_particoes).astype(np.int64)
+
+
+def particionar_por_pedido(fontes, colunas, diretorio, n_particoes, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Reparte as ``colunas`` de cada fonte em ``n_particoes`` Parquet em ``diretorio``, pelo hash do ``order_id``.
+
+    ``colunas`` mapeia o nome da fonte (``'pedidos'``, ``'itens'``) às colunas
+    copiadas. Cada fonte é lida em blocos e cada bloco é distribuído entre as
+    partições, então a memória usada é a de um bloco. Devolve, por fonte, a
+    lista dos caminhos das partições.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    caminhos = {}
+    for fonte, colunas_fonte in colunas.items():
+        arquivo = pq.ParquetFile(fontes[fonte], memory_map=True)
+        colunas_fonte = _colunas_da_fonte(fontes[fonte], colunas_fonte)
+        chave = 'id' if 'id' in colunas_fonte else 'order_id'
+        esquema = pa.schema([arquivo.schema_arrow.field(coluna) for coluna in colunas_fonte])
+
+        caminhos[fonte] = [os.path.join(diretorio, f"{fonte}-{particao:05d}.parquet") for particao in range(n_particoes)]
+        escritores = [pq.ParquetWriter(caminho, esquema) for caminho in caminhos[fonte]]
+        try:
+            for lote in arquivo.iter_batches(batch_size=tamanho_bloco, columns=colunas_fonte):
+                tabela = pa.Table.from_batches([lote]).select(colunas_fonte).cast(esquema)
+                particoes = _particao_do_pedido(tabela.column(chave), n_particoes)
+                ordem = np.argsort(particoes, kind='stable')
+                limites = np.searchsorted(particoes[ordem], np.arange(n_particoes + 1))
+                tabela = tabela.take(ordem)
+                for particao in np.flatnonzero(np.diff(limites)):
+                    escritores[particao].write_table(tabela.slice(limites[particao], limites[particao + 1] - limites[particao]))
+        finally:
+            for escritor in escritores:
+                escritor.close()
+    return caminhos
+
+
+def iterar_particoes(fontes, colunas_pedidos, colunas_itens, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                     n_particoes=None, diretorio_temporario=None):
+    """Gera ``(pedidos, itens)`` de cada partição por ``order_id``: todos os itens de um pedido vêm juntos com ele.
+
+    Sem ``n_particoes``, as partições têm cerca de ``tamanho_bloco`` itens.
+    Os arquivos ficam em um diretório temporário (em ``diretorio_temporario``,
+    se dado), apagado ao fim.
+    """
+    import pyarrow.parquet as pq
+
+    if n_particoes is None:
+        n_particoes = max(1, math.ceil(pq.ParquetFile(fontes['itens']).metadata.num_rows / tamanho_bloco))
+    with tempfile.TemporaryDirectory(prefix='blocos-', dir=diretorio_temporario) as diretorio:
+        caminhos = particionar_por_pedido(
+            fontes, {'pedidos': colunas_pedidos, 'itens': colunas_itens}, diretorio, n_particoes, tamanho_bloco
+        )
+        for caminho_pedidos, caminho_itens in zip(caminhos['pedidos'], caminhos['itens']):
+            yield normalizar_pedidos(pd.read_parquet(caminho_pedidos)), pd.read_parquet(caminho_itens)
+
+
+def _no_periodo(datas, periodo):
+    """Máscara de datas entre os dias ``inicio`` e ``fim`` (inclusivos), como em ``IndiceDatas.fatiar``."""
+    if periodo is None:
+        return np.ones(len(datas), dtype=bool)
+    inicio, fim = periodo
+    return ((datas >= pd.Timestamp(inicio)) & (datas < pd.Timestamp(fim) + pd.Timedelta(days=1))).to_numpy()
+
+
+# --- AGREGAÇÕES ---
+
+def calcular_financeiro_da_particao(df_pedido, df_itens, periodo=None):
+    """Tabela financeira dos pedidos de uma partição (como em :func:`financeiro.calcular_financeiro_pedidos`) e o total de NF.
+
+    ``df_itens`` deve conter todos os itens dos pedidos de ``df_pedido``.
+    Devolve ``(financeiro, faturamento_total)``; a tabela tem apenas as colunas
+    usadas pelas agregações e, com ``periodo``, só os pedidos do período.
+    """
+    soma_por_pedido = df_itens.groupby('order_id')['price'].sum().rename('soma_precos_itens')
+
+    df_pedido = df_pedido[_no_periodo(df_pedido['created_at'], periodo)]
+    faturamento_total = float(df_pedido['Valor de NF (R$)'].sum())
+
+    financeiro = df_pedido.merge(soma_por_pedido, left_on='order_id', right_index=True, how='left')
+    soma_com_frete = financeiro['soma_precos_itens'].fillna(0) + financeiro['Frete Cobrado do Cliente (R$)']
+    financeiro = financeiro.assign(soma_dos_itens_e_frete=soma_com_frete)[soma_com_frete > 0]
+    financeiro['desconto_calculado'] = (1 - financeiro['Valor de NF (R$)'] / financeiro['soma_dos_itens_e_frete']) * 100
+    return financeiro[['order_id', 'soma_dos_itens_e_frete', 'desconto_calculado']], faturamento_total
+
+
+def analisar_faturamento_em_blocos(fontes, periodo=None, calcular_com_desconto=False, tamanho_bloco=TAMANHO_BLOCO_PADRAO,
+                                   n_particoes=None, diretorio_temporario=None):
+    """Mesmo resultado de :func:`analises.analisar_faturamento`, uma partição por ``order_id`` de cada vez."""
+    colunas_pedidos = ['order_id', 'created_at', 'Valor de NF (R$)', 'Frete Cobrado do Cliente (R$)']
+    colunas_itens = ['order_id', 'material_name', 'material_category', 'price']
+
+    faturamento_total = 0.0
+    com_pedidos_validos = False
+    por_categoria, por_nome = AgregadoParcial('sum'), AgregadoParcial('sum')
+    pedidos_categoria, pedidos_produto = AgregadoParcial('sum'), AgregadoParcial('sum')
+    particoes = iterar_particoes(fontes, colunas_pedidos, colunas_itens, tamanho_bloco, n_particoes, diretorio_temporario)
+    for df_pedido, df_itens in particoes:
+        financeiro, faturamento_particao = calcular_financeiro_da_particao(df_pedido, df_itens, periodo)
+        faturamento_total += faturamento_particao
+        financeiro = financeiro[(financeiro['desconto_calculado'] >= 0) & (financeiro['desconto_calculado'] <= 100)]
+        com_pedidos_validos |= not financeiro.empty
+
+        # O merge interno equivale ao merge à esquerda seguido do filtro pelos pedidos válidos
+        bloco = df_itens.merge(financeiro[['order_id', 'desconto_calculado']], on='order_id', how='inner')
+        if calcular_com_desconto:
+            bloco['faturamento'] = bloco['price'] * (1 - bloco['desconto_calculado']/100)
+        else:
+            bloco['faturamento'] = bloco['price']
+
+        por_categoria.adicionar(bloco.groupby('material_category')['faturamento'].sum())
+        por_nome.adicionar(bloco.groupby('material_name')['faturamento'].sum())
+        # Cada pedido está em uma única partição: os pedidos distintos por grupo somam entre partições
+        pedidos_categoria.adicionar(bloco.groupby('material_category')['order_id'].nunique())
+        pedidos_produto.adicionar(bloco.groupby('material_name')['order_id'].nunique())
+
+    if not com_pedidos_validos:
+        return {'vazio': True}
+
+    preco_por_categoria = por_categoria.resultado().rename('faturamento').rename_axis('material_category').sort_values(ascending=False)
+    preco_por_nome = por_nome.resultado().rename('faturamento').rename_axis('material_name').sort_values(ascending=False)
+    pedidos_por_categoria = pedidos_categoria.resultado()
+    pedidos_por_produto = pedidos_produto.resultado()
+
+    return {
+        'vazio': False,
+        'faturamento_total': faturamento_total,
+        'preco_por_categoria': preco_por_categoria,
+        'preco_por_nome': preco_por_nome,
+        'ticket_medio_categoria': (preco_por_categoria / pedidos_por_categoria).round(2).sort_values(ascending=False),
+        'ticket_medio_produto': (preco_por_nome / pedidos_por_produto).round(2).sort_values(ascending=False),
+    }
+
+
+def contar_vendas_por_material(fontes, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Itens vendidos por material, como ``df_itens['material_id'].value_counts()``."""
+    vendas = AgregadoParcial('sum')
+    for bloco in iterar_blocos(fontes['itens'], ['material_id'], tamanho_bloco):
+        vendas.adicionar(bloco['material_id'].value_counts())
+    return vendas.resultado(vazio=pd.Series(dtype='int64')).rename('count').sort_values(ascending=False)
+
+
+def analisar_atrasos_em_blocos(fontes, estado_selecionado=TODOS_OS_ESTADOS, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Tabelas de atraso por estado, transportadora e região de :func:`analises.analisar_atraso`."""
+    total_estado, atrasados_estado = AgregadoParcial('sum'), AgregadoParcial('sum')
+    total_transp, atrasados_transp = AgregadoParcial('sum'), AgregadoParcial('sum')
+    total_regional, atrasados_regional = AgregadoParcial('sum'), AgregadoParcial('sum')
+    tempo_estado = AgregadoParcial('sum')
+
+    colunas = ['created_at', 'Estado', 'Transportadora', COLUNA_PRAZO, COLUNA_ENTREGA]
+    for bloco in iterar_pedidos(fontes, colunas, tamanho_bloco):
+        bloco = bloco.dropna(subset=[COLUNA_PRAZO, COLUNA_ENTREGA, 'created_at'])
+        if estado_selecionado != TODOS_OS_ESTADOS:
+            bloco = bloco[bloco['Estado'] == estado_selecionado]
+        atrasado = bloco[COLUNA_ENTREGA] > bloco[COLUNA_PRAZO]
+        bloco_atrasado = bloco[atrasado]
+
+        total_estado.adicionar(bloco['Estado'].value_counts())
+        atrasados_estado.adicionar(bloco_atrasado['Estado'].value_counts())
+        total_transp.adicionar(bloco['Transportadora'].value_counts())
+        atrasados_transp.adicionar(bloco_atrasado['Transportadora'].value_counts())
+        if estado_selecionado == TODOS_OS_ESTADOS:
+            total_regional.adicionar(bloco.groupby(['Estado', 'Transportadora']).size())
+            atrasados_regional.adicionar(bloco_atrasado.groupby(['Estado', 'Transportadora']).size())
+
+        # Média do tempo de entrega = soma dos dias / número de pedidos, por estado
+        dias = (bloco[COLUNA_ENTREGA] - bloco['created_at']).dt.days
+        tempo_estado.adicionar(dias.groupby(bloco['Estado']).agg(['sum', 'count']))
+
+    contagem = lambda agregado: agregado.resultado(vazio=pd.Series(dtype='int64')).sort_values(ascending=False)
+
+    df_analise_atrasos = tabela_atrasos(contagem(total_estado), contagem(atrasados_estado))
+    tempo = tempo_estado.resultado(vazio=pd.DataFrame(columns=['sum', 'count']))
+    df_analise_atrasos['Tempo Médio de Entrega (dias)'] = tempo['sum'] / tempo['count']
+    df_analise_atrasos = df_analise_atrasos.sort_values(by='Percentual de Atraso (%)', ascending=False)
+
+    df_analise_regional = None
+    if estado_selecionado == TODOS_OS_ESTADOS:
+        df_analise_regional = pd.DataFrame({
+            'Total de Pedidos': total_regional.resultado(vazio=pd.Series(dtype='int64')),
+            'Pedidos Atrasados': atrasados_regional.resultado(vazio=pd.Series(dtype='int64'))
+        }).fillna(0)
+        df_analise_regional['Pedidos Atrasados'] = df_analise_regional['Pedidos Atrasados'].astype(int)
+        df_analise_regional['Percentual de Atraso (%)'] = (df_analise_regional['Pedidos Atrasados'] / df_analise_regional['Total de Pedidos'] * 100)
+
+    return {
+        'analise_estados': df_analise_atrasos,
+        'analise_transportadoras': tabela_atrasos(contagem(total_transp), contagem(atrasados_transp)),
+        'analise_regional': df_analise_regional,
+    }
+
+
+def contar_cancelamentos_em_blocos(fontes, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Itens cancelados por categoria e por produto, como na página de cancelamento."""
+    por_categoria, por_produto = AgregadoParcial('sum'), AgregadoParcial('sum')
+    colunas = ['material_name', 'material_category', 'aasm_state']
+    for bloco in iterar_blocos(fontes['itens'], colunas, tamanho_bloco):
+        cancelados = bloco[bloco['aasm_state'] == 'canceled']
+        por_categoria.adicionar(cancelados.groupby('material_category').size())
+        por_produto.adicionar(cancelados.groupby(['material_name', 'material_category']).size())
+
+    cancelamentos_categoria = por_categoria.resultado(vazio=pd.Series(dtype='int64')).rename('count').sort_values(ascending=False)
+    df_cancel_prod = por_produto.resultado(vazio=pd.Series(dtype='int64')).rename('count').sort_values(ascending=False).reset_index()
+    df_cancel_prod.columns = ['Produto', 'Categoria', 'Número de Cancelamentos']
+    return {
+        'cancelamentos_categoria': cancelamentos_categoria,
+        'cancelamentos_produto': df_cancel_prod,
+    }
+
+
+# --- VERIFICAÇÃO CONTRA O CAMINHO EM MEMÓRIA ---
+
+def _comparar(nome, em_blocos, em_memoria, atol=0.0):
+    """Compara ignorando a ordem entre empates, o tipo dos índices e a ordem de soma dos floats."""
+    if isinstance(em_blocos, (pd.Series, pd.DataFrame)):
+        if isinstance(em_blocos, pd.DataFrame) and isinstance(em_blocos.index, pd.RangeIndex):
+            chaves = list(em_blocos.columns)
+            em_blocos = em_blocos.sort_values(chaves, ignore_index=True)
+            em_memoria = em_memoria.sort_values(chaves, ignore_index=True)
+        else:
+            em_blocos, em_memoria = em_blocos.sort_index(), em_memoria.sort_index()
+        avaliar = pd.testing.assert_series_equal if isinstance(em_blocos, pd.Series) else pd.testing.assert_frame_equal
+        avaliar(em_blocos, em_memoria, check_dtype=False, check_index_type=False, check_categorical=False,
+                check_names=False, rtol=1e-9, atol=atol)
+    elif isinstance(em_blocos, float):
+        assert np.isclose(em_blocos, em_memoria, rtol=1e-12), (em_blocos, em_memoria)
+    else:
+        assert em_blocos == em_memoria, (em_blocos, em_memoria)
+    print(f"ok  {nome}")
+
+
+def verificar(fontes, tamanho_bloco=TAMANHO_BLOCO_PADRAO, diretorio_temporario=None):
+    """Executa cada agregação em blocos e no caminho em memória e compara os resultados.
+
+    O caminho em memória também precisa do supply: ``fontes['supply']``, se
+    dado, ou o snapshot da aba da planilha.
+    """
+    from analises import analisar_atraso, analisar_cancelamento, analisar_faturamento
+    from dataset import contar_valores
+
+    caminho_supply = fontes.get('supply') or fontes_padrao(['supply'])['supply']
+    df_supply = pd.read_parquet(caminho_supply)
+    dataset = normalizar_dataset(pd.read_parquet(fontes['pedidos']), pd.read_parquet(fontes['itens']), df_supply,
+                                 versao=f"verificacao-blocos-{id(fontes)}")
+
+    _comparar('vendas por material', contar_vendas_por_material(fontes, tamanho_bloco), contar_valores(dataset.itens, 'material_id'))
+
+    for periodo in (None, (dataset.pedidos['created_at'].min().date(),) * 2):
+        for liquido in (False, True):
+            em_blocos = analisar_faturamento_em_blocos(fontes, periodo, liquido, tamanho_bloco,
+                                                       diretorio_temporario=diretorio_temporario)
+            em_memoria = analisar_faturamento(dataset, periodo, liquido)
+            for chave in em_memoria:
+                # Os tickets são arredondados a centavos: somas em outra ordem podem cair do outro lado do meio centavo (1 centavo + folga do float)
+                atol = 0.011 if chave.startswith('ticket_medio') else 0.0
+                _comparar(f"faturamento[periodo={periodo}, liquido={liquido}] {chave}", em_blocos[chave], em_memoria[chave], atol)
+
+    estados = [TODOS_OS_ESTADOS, dataset.pedidos['Estado'].dropna().iloc[0]]
+    for estado in estados:
+        em_blocos = analisar_atrasos_em_blocos(fontes, estado, tamanho_bloco)
+        em_memoria = analisar_atraso(dataset, estado)
+        for chave, valor in em_blocos.items():
+            if valor is None:
+                assert em_memoria[chave] is None
+                continue
+            _comparar(f"atrasos[{estado}] {chave}", valor, em_memoria[chave])
+
+    em_blocos = contar_cancelamentos_em_blocos(fontes, tamanho_bloco)
+    em_memoria = analisar_cancelamento(dataset)
+    for chave, valor in em_blocos.items():
+        _comparar(f"cancelamentos {chave}", valor, em_memoria[chave])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calcula as agregações do dashboard lendo os dados em blocos.")
+    parser.add_argument('--pedidos', help="Parquet de pedidos (padrão: snapshot da planilha)")
+    parser.add_argument('--itens', help="Parquet de itens (padrão: snapshot da planilha)")
+    parser.add_argument('--supply', help="Parquet de supply, usado só por --verificar (padrão: snapshot da planilha)")
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO_PADRAO, help="Linhas por bloco (padrão: %(default)s)")
+    parser.add_argument('--temporario', help="Diretório das partições por pedido do faturamento (padrão: o temporário do sistema)")
+    parser.add_argument('--verificar', action='store_true', help="Compara cada agregação com o caminho em memória")
+    args = parser.parse_args(argv)
+
+    # As planilhas só são lidas para as fontes não informadas
+    fontes = {nome: caminho for nome, caminho in (('pedidos', args.pedidos), ('itens', args.itens), ('supply', args.supply)) if caminho}
+    fontes.update(fontes_padrao([nome for nome in ('pedidos', 'itens') if nome not in fontes]))
+
+    if args.verificar:
+        verificar(fontes, args.tamanho_bloco, args.temporario)
+        return
+
+    resultado = analisar_faturamento_em_blocos(fontes, tamanho_bloco=args.tamanho_bloco, diretorio_temporario=args.temporario)
+    if resultado['vazio']:
+        print("Não há dados de faturamento.")
+    else:
+        print(f"Faturamento total: R$ {resultado['faturamento_total']:,.2f}")
+        print(resultado['preco_por_categoria'].to_string())
+    print(analisar_atrasos_em_blocos(fontes, tamanho_bloco=args.tamanho_bloco)['analise_estados'].to_string())
+    print(contar_cancelamentos_em_blocos(fontes, tamanho_bloco=args.tamanho_bloco)['cancelamentos_categoria'].to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Tabela de fatos dos itens usada pela página de cancelamentos.
+
+Cada item vira uma linha com o status do pedido, o ``aasm_state``, se o
+material está com estoque zerado e o posto do material na ordem de cobertura
+(0 para o de menor cobertura positiva), montada uma única vez por versão dos
+dados. O "Top X" de estoque crítico são os materiais com posto menor que X,
+então a taxa de itens críticos por status sai de uma busca nos postos já
+ordenados de cada status (a contagem acumulada até X), sem refazer o merge dos
+itens a cada valor do slider. As taxas de ruptura e os volumes de
+cancelamento não dependem de X e são calculados junto com a tabela.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from cobertura import calcular_cobertura
+from dataset import HASH_DATASET, VERSOES_EM_CACHE, contar_valores
+from instrumentacao import cronometrado
+
+# Posto dos materiais fora do ranking de cobertura (sem estoque, sem vendas ou fora do supply)
+SEM_POSTO = np.iinfo(np.int32).max
+
+
+def postos_cobertura(df_cobertura):
+    """Posto de cada material da tabela de cobertura: a ordem entre os de cobertura positiva, ``SEM_POSTO`` nos demais."""
+    inicio = np.searchsorted(df_cobertura['dias_de_estoque'].to_numpy(), 0, side='right')
+    postos = np.full(len(df_cobertura), SEM_POSTO, dtype=np.int32)
+    postos[inicio:] = np.arange(len(df_cobertura) - inicio, dtype=np.int32)
+    return postos
+
+
+def montar_fatos(df_itens, df_pedido, df_cobertura):
+    """Fatos por item: status do pedido, ``aasm_state``, estoque zerado e posto de cobertura."""
+    df_fatos = df_itens[['order_id', 'material_id', 'aasm_state']].merge(
+        df_pedido[['order_id', 'Status do Pedido']], on='order_id', how='left'
+    )
+    # Posição do material na tabela de cobertura (-1: fora do supply, estoque zero)
+    posicao = pd.Index(df_cobertura['material_id']).get_indexer(df_fatos['material_id'])
+    encontrado = posicao >= 0
+    quantidade = np.where(encontrado, df_cobertura['quantity'].to_numpy()[posicao], 0)
+    return pd.DataFrame({
+        'Status do Pedido': df_fatos['Status do Pedido'],
+        'aasm_state': df_fatos['aasm_state'],
+        'estoque_zerado': quantidade == 0,
+        'posto_cobertura': np.where(encontrado, postos_cobertura(df_cobertura)[posicao], SEM_POSTO).astype(np.int32),
+    })
+
+
+class FatosCancelamento:
+    """Tabela de fatos dos itens com as contagens por status prontas para qualquer Top X."""
+
+    def __init__(self, df_fatos, df_itens):
+        self.fatos = df_fatos
+
+        status = df_fatos['Status do Pedido']
+        if not isinstance(status.dtype, pd.CategoricalDtype):
+            status = status.astype('category')
+        codigos, self.tipo_status = status.cat.codes.to_numpy(), status.dtype
+        n_status = len(self.tipo_status.categories)
+        com_status = codigos >= 0
+        codigos = codigos[com_status]
+        self.total = np.bincount(codigos, minlength=n_status)
+        self.zerados = np.bincount(codigos, weights=df_fatos['estoque_zerado'].to_numpy()[com_status], minlength=n_status)
+
+        # Postos de cobertura de cada status, ordenados: itens críticos no Top X = busca por X
+        postos = df_fatos['posto_cobertura'].to_numpy()[com_status]
+        ordem = np.lexsort((postos, codigos))
+        postos, codigos = postos[ordem], codigos[ordem]
+        limites = np.searchsorted(codigos, np.arange(n_status + 1))
+        self._postos_por_status = [postos[limites[s]:limites[s + 1]] for s in range(n_status)]
+
+        df_canceled = df_itens[df_itens['aasm_state'] == 'canceled']
+        self.cancelamentos_categoria = contar_valores(df_canceled, 'material_category')
+        df_cancel_prod = contar_valores(df_canceled, ['material_name', 'material_category']).reset_index()
+        df_cancel_prod.columns = ['Produto', 'Categoria', 'Número de Cancelamentos']
+        self.cancelamentos_produto = df_cancel_prod
+
+    def _por_status(self, valores, nome):
+        # Como o groupby por status: só os status presentes, na ordem das categorias
+        presentes = np.flatnonzero(self.total > 0)
+        indice = pd.CategoricalIndex(pd.Categorical.from_codes(presentes, dtype=self.tipo_status), name='Status do Pedido')
+        return pd.Series(valores[presentes], index=indice, name=nome)
+
+    def taxa_ruptura(self):
+        """Percentual de itens com estoque zerado por status do pedido."""
+        return self._por_status(self.zerados / np.maximum(self.total, 1) * 100, 'Taxa de Ruptura (%)')
+
+    def criticos_por_status(self, x):
+        """Itens cujo material está entre os ``x`` de menor cobertura positiva, por status."""
+        return np.array([np.searchsorted(postos, x) for postos in self._postos_por_status], dtype=np.int64)
+
+    def taxa_critico(self, x):
+        """Percentual de itens em estoque crítico (Top ``x`` de menor cobertura) por status do pedido."""
+        return self._por_status(self.criticos_por_status(x) / np.maximum(self.total, 1) * 100, 'Taxa de Estoque Crítico (%)')
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('construir_fatos_cancelamento')
+def construir_fatos_cancelamento(dataset):
+    """Fatos de cancelamento da versão dos dados (compartilhados entre sessões, somente leitura)."""
+    df_fatos = montar_fatos(dataset.itens, dataset.pedidos, calcular_cobertura(dataset))
+    return FatosCancelamento(df_fatos, dataset.itens)
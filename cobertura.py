@@ -0,0 +1,138 @@
+"""Motor de cobertura de estoque compartilhado pelas páginas de cancelamento e estoque.
+
+A cobertura (dias de estoque) de cada material é calculada uma vez por versão
+dos dados e guardada já ordenada, de modo que o "Top X" de menor cobertura é
+apenas uma fatia do início da tabela. A parte cara, a contagem de vendas sobre
+todos os itens, fica em um cache próprio que a ingestão incremental atualiza
+sem recontar.
+
+O supply é agregado uma vez por versão em uma matriz material x centro de
+inventário (:class:`MatrizEstoque`): o estoque total, a distribuição dos
+materiais pelos centros e a cobertura por centro são fatias dessa matriz.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dataset import HASH_DATASET, VERSOES_EM_CACHE, contar_valores
+from instrumentacao import cronometrado
+
+
+def calcular_num_dias(df_pedido):
+    """Número de dias cobertos pelos pedidos (inclusive)."""
+    return (df_pedido['created_at'].max() - df_pedido['created_at'].min()).days + 1
+
+
+def contar_vendas(df_itens):
+    """Itens vendidos por material (só os materiais com vendas)."""
+    return contar_valores(df_itens, 'material_id').rename('total_vendido')
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('calcular_vendas_por_material')
+def calcular_vendas_por_material(dataset):
+    """Itens vendidos por material da versão dos dados (somente leitura)."""
+    if 'vendas_por_material' in dataset.derivados:
+        return dataset.derivados['vendas_por_material']
+    return contar_vendas(dataset.itens)
+
+
+def _vendas_medias(dataset):
+    vendas_totais = calcular_vendas_por_material(dataset)
+    venda_media_diaria = (vendas_totais / calcular_num_dias(dataset.pedidos)).rename('venda_media_diaria')
+    return vendas_totais, venda_media_diaria
+
+
+def _dias_de_estoque(quantity, venda_media_diaria):
+    # Estoque "infinito" se não há vendas
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(venda_media_diaria > 0, quantity / venda_media_diaria, np.inf)
+
+
+class MatrizEstoque:
+    """Quantidade em estoque por material (linhas) e centro de inventário (colunas).
+
+    ``materiais`` e ``centros`` são os índices das linhas e colunas; ``presente``
+    marca os pares que existem no supply (um par pode existir com quantidade
+    zero). Os centros são poucos, então a matriz é densa.
+    """
+
+    def __init__(self, df_supply):
+        self.por_material = df_supply.groupby('material_id', observed=True).agg(
+            material_name=('material_name', 'first'),
+            quantity=('quantity', 'sum'),
+        )
+        self.materiais = self.por_material.index
+        self.centros = pd.Index(np.sort(df_supply['inventory_centre_id'].unique()), name='inventory_centre_id')
+
+        forma = (len(self.materiais), len(self.centros))
+        celula = (self.materiais.get_indexer(df_supply['material_id']).astype('int64') * forma[1]
+                  + self.centros.get_indexer(df_supply['inventory_centre_id']))
+        tamanho = forma[0] * forma[1]
+        self.presente = (np.bincount(celula, minlength=tamanho) > 0).reshape(forma)
+        quantidade = np.bincount(celula, weights=df_supply['quantity'].to_numpy(dtype='float64', na_value=0), minlength=tamanho)
+        self.quantidade = quantidade.reshape(forma).astype(self.por_material['quantity'].dtype)
+
+    def linhas(self, ids_materiais):
+        """Posições de ``ids_materiais`` nas linhas da matriz (os ausentes do supply ficam de fora)."""
+        posicoes = self.materiais.get_indexer(ids_materiais)
+        return posicoes[posicoes >= 0]
+
+    def distribuicao(self, ids_materiais, dias_por_centro):
+        """Pares material x centro existentes dos materiais pedidos, na ordem deles e dos centros."""
+        linhas = self.linhas(ids_materiais)
+        linha, coluna = np.nonzero(self.presente[linhas])
+        linha = linhas[linha]
+        return pd.DataFrame({
+            'material_name': self.por_material['material_name'].array.take(linha),
+            'inventory_centre_id': self.centros.to_numpy()[coluna],
+            'quantity': self.quantidade[linha, coluna],
+            'dias_de_estoque': dias_por_centro[linha, coluna],
+            'material_id': self.materiais.array.take(linha),
+        })
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('construir_matriz_estoque')
+def construir_matriz_estoque(dataset):
+    """Matriz material x centro do supply da versão dos dados (somente leitura)."""
+    return MatrizEstoque(dataset.supply)
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('calcular_cobertura')
+def calcular_cobertura(dataset):
+    """Cobertura de estoque por material, ordenada pela menor cobertura.
+
+    O resultado é compartilhado entre sessões sem cópia e deve ser tratado como
+    somente leitura.
+    """
+    df_estoque_total = construir_matriz_estoque(dataset).por_material
+    vendas_totais, venda_media_diaria = _vendas_medias(dataset)
+
+    df_cobertura = df_estoque_total.join(vendas_totais).join(venda_media_diaria).reset_index()
+    df_cobertura[['total_vendido', 'venda_media_diaria']] = df_cobertura[['total_vendido', 'venda_media_diaria']].fillna(0)
+    df_cobertura['dias_de_estoque'] = _dias_de_estoque(df_cobertura['quantity'], df_cobertura['venda_media_diaria'])
+
+    return df_cobertura.sort_values('dias_de_estoque', kind='stable', ignore_index=True)
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('calcular_cobertura_por_centro')
+def calcular_cobertura_por_centro(dataset):
+    """Dias de cobertura de cada material em cada centro, alinhados à :func:`construir_matriz_estoque` (somente leitura)."""
+    matriz = construir_matriz_estoque(dataset)
+    _, venda_media_diaria = _vendas_medias(dataset)
+
+    venda_media = venda_media_diaria.reindex(matriz.materiais, fill_value=0).to_numpy()
+    return _dias_de_estoque(matriz.quantidade, venda_media[:, np.newaxis])
+
+
+def top_criticos(df_cobertura, x):
+    """Os X materiais com menor cobertura positiva.
+
+    Como a tabela já está ordenada, basta localizar por busca binária o primeiro
+    material com cobertura > 0 e fatiar X linhas a partir dele.
+    """
+    inicio = np.searchsorted(df_cobertura['dias_de_estoque'].to_numpy(), 0, side='right')
+    return df_cobertura.iloc[inicio:inicio + x]
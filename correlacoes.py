@@ -0,0 +1,160 @@
+"""Correlações entre o desconto médio e os pedidos por dia.
+
+As medidas da página de descontos saem das mesmas somas por dia (pares
+válidos, x, y, x², y² e xy, com as séries centralizadas na média para evitar
+cancelamento numérico): a correlação de Pearson e a reta de regressão usam os
+totais, a correlação móvel de cada janela é a diferença das somas acumuladas
+nas pontas da janela, e a correlação defasada empilha as séries de pedidos
+deslocadas de 0 a :data:`DEFASAGEM_MAXIMA` dias em uma matriz e soma as
+colunas de uma vez. Nada aqui é ajustado por ponto ou por janela, então o
+custo é proporcional ao número de dias, e nada chama ``st.*`` além do cache
+do cubo por categoria.
+
+Dias sem dado (sem desconto calculado ou removidos como outliers) ficam como
+``NaN`` nas séries: saem dos pares das somas, e as janelas da correlação móvel
+que os contêm ficam sem valor, como no ``rolling(janela).corr`` do pandas.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dataset import HASH_DATASET, VERSOES_EM_CACHE
+from financeiro import calcular_financeiro_pedidos
+from instrumentacao import cronometrado
+
+# Janelas (em dias) da correlação móvel, calculadas juntas
+JANELAS = (7, 14, 28)
+DEFASAGEM_MAXIMA = 7
+
+
+def somas_pares(x, y, eixo=-1, acumular=False):
+    """Pares válidos, x, y, x², y² e xy somados ao longo de ``eixo`` (ou acumulados, com um zero à frente)."""
+    validos = ~(np.isnan(x) | np.isnan(y))
+    # Centralizar não muda a correlação nem a inclinação, só reduz o erro de arredondamento
+    centro_x = np.nanmean(x) if validos.any() else 0.0
+    centro_y = np.nanmean(y) if validos.any() else 0.0
+    x = np.where(validos, x - centro_x, 0.0)
+    y = np.where(validos, y - centro_y, 0.0)
+    produtos = np.stack([validos.astype(float), x, y, x * x, y * y, x * y])
+    eixo = eixo % x.ndim + 1
+    if not acumular:
+        return produtos.sum(axis=eixo), (centro_x, centro_y)
+    acumuladas = np.cumsum(produtos, axis=eixo)
+    zeros = np.zeros_like(np.take(acumuladas, [0], axis=eixo))
+    return np.concatenate([zeros, acumuladas], axis=eixo), (centro_x, centro_y)
+
+
+def pearson_das_somas(somas, minimo=2):
+    """Correlação de Pearson a partir das somas de :func:`somas_pares` (``NaN`` com menos de ``minimo`` pares)."""
+    n, sx, sy, sxx, syy, sxy = somas
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariancia = sxy - sx * sy / n
+        variancia_x = sxx - sx * sx / n
+        variancia_y = syy - sy * sy / n
+        r = covariancia / np.sqrt(variancia_x * variancia_y)
+    valido = (n >= max(minimo, 2)) & (variancia_x > 0) & (variancia_y > 0)
+    return np.where(valido, np.clip(r, -1.0, 1.0), np.nan)
+
+
+def pearson(x, y):
+    """Correlação de Pearson entre duas séries alinhadas, ignorando os pares com ``NaN``."""
+    somas, _ = somas_pares(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    return float(pearson_das_somas(somas))
+
+
+def reta_regressao(x, y):
+    """Inclinação e intercepto da regressão linear de ``y`` em ``x`` (mínimos quadrados)."""
+    (n, sx, sy, sxx, _, sxy), (centro_x, centro_y) = somas_pares(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    if n < 2 or sxx - sx * sx / n <= 0:
+        return None
+    inclinacao = (sxy - sx * sy / n) / (sxx - sx * sx / n)
+    intercepto = centro_y + sy / n - inclinacao * (centro_x + sx / n)
+    return float(inclinacao), float(intercepto)
+
+
+def correlacao_movel(x, y, janelas=JANELAS):
+    """Correlação de Pearson em janelas móveis, uma coluna por janela, indexada pelo último dia da janela.
+
+    As somas acumuladas são calculadas uma vez; cada janela é uma subtração.
+    """
+    valores_x, valores_y = x.to_numpy(dtype=float), y.to_numpy(dtype=float)
+    acumuladas, _ = somas_pares(valores_x, valores_y, acumular=True)
+    colunas = {}
+    for janela in janelas:
+        r = np.full(len(valores_x), np.nan)
+        if janela <= len(valores_x):
+            r[janela - 1:] = pearson_das_somas(acumuladas[:, janela:] - acumuladas[:, :-janela], minimo=janela)
+        colunas[f'{janela} dias'] = r
+    return pd.DataFrame(colunas, index=x.index)
+
+
+def correlacao_defasada(x, y, defasagem_maxima=DEFASAGEM_MAXIMA):
+    """Correlação entre o desconto de um dia e os pedidos ``k`` dias depois, para ``k`` de 0 a ``defasagem_maxima``."""
+    valores_x, valores_y = x.to_numpy(dtype=float), y.to_numpy(dtype=float)
+    n = len(valores_y)
+    defasagens = np.arange(defasagem_maxima + 1)
+    # Linha k: pedidos deslocados k dias para trás (o fim fica sem par)
+    deslocados = np.full((len(defasagens), n), np.nan)
+    for k in defasagens[defasagens < n]:
+        deslocados[k, :n - k] = valores_y[k:]
+    somas, _ = somas_pares(np.broadcast_to(valores_x, deslocados.shape), deslocados)
+    return pd.Series(pearson_das_somas(somas), index=pd.Index(defasagens, name='Defasagem (dias)'), name='Correlação')
+
+
+def spearman(x, y):
+    """Correlação de Spearman: a de Pearson entre os postos (média nos empates) dos pares válidos."""
+    validos = x.notna().to_numpy() & y.notna().to_numpy()
+    return pearson(x[validos].rank().to_numpy(), y[validos].rank().to_numpy())
+
+
+def montar_cubo_categorias(df_itens, df_financeiro_pedidos):
+    """Soma e contagem de descontos e pedidos por dia e categoria (colunas em dois níveis)."""
+    pares = df_itens[['order_id', 'material_category']].drop_duplicates()
+    df_pares = pares.merge(df_financeiro_pedidos[['order_id', 'created_at', 'desconto_calculado']], on='order_id')
+    dia = df_pares['created_at'].dt.floor('D').rename('created_at')
+    cubo = df_pares.groupby([dia, 'material_category'], observed=True).agg(
+        soma_desconto=('desconto_calculado', 'sum'),
+        contagem_desconto=('desconto_calculado', 'count'),
+        pedidos=('order_id', 'size'),
+    )
+    return cubo.unstack('material_category', fill_value=0)
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('construir_cubo_categorias')
+def construir_cubo_categorias(dataset):
+    """Cubo dia x categoria da versão dos dados (compartilhado entre sessões, somente leitura)."""
+    return montar_cubo_categorias(dataset.itens, calcular_financeiro_pedidos(dataset))
+
+
+def correlacao_por_categoria(cubo, dias):
+    """Correlação entre o desconto médio e os pedidos com a categoria, por dia, para cada categoria.
+
+    ``dias`` são os dias considerados (os demais, como os outliers, ficam de
+    fora); as colunas das categorias são somadas juntas, sem laço.
+    """
+    cubo = cubo.reindex(dias, fill_value=0)
+    soma, contagem = cubo['soma_desconto'], cubo['contagem_desconto']
+    desconto = (soma / contagem.where(contagem > 0)).to_numpy(dtype=float)
+    pedidos = cubo['pedidos'].to_numpy(dtype=float)
+    somas, _ = somas_pares(desconto, pedidos, eixo=0)
+    return pd.Series(pearson_das_somas(somas), index=soma.columns.rename('Categoria'), name='Correlação').sort_values(ascending=False)
+
+
+def analisar_correlacoes(serie_desconto, serie_pedidos, cubo_categorias=None):
+    """Spearman, reta de regressão e correlações móveis, defasadas e por categoria das mesmas séries diárias.
+
+    As séries devem cobrir dias consecutivos; os dias a desconsiderar entram
+    como ``NaN``. A correlação de Pearson do período sai do filtro de outliers
+    (:meth:`outliers.FiltroOutliers.resumo`), que a tem pronta para qualquer limite.
+    """
+    resultado = {
+        'correlacao_spearman': spearman(serie_desconto, serie_pedidos),
+        'reta_regressao': reta_regressao(serie_desconto, serie_pedidos),
+        'correlacao_movel': correlacao_movel(serie_desconto, serie_pedidos),
+        'correlacao_defasada': correlacao_defasada(serie_desconto, serie_pedidos),
+    }
+    if cubo_categorias is not None:
+        dias = serie_pedidos.index[serie_pedidos.notna().to_numpy()]
+        resultado['correlacao_categorias'] = correlacao_por_categoria(cubo_categorias, dias)
+    return resultado
@@ -0,0 +1,232 @@
+"""Conjunto de dados normalizado e imutável compartilhado por todas as páginas.
+
+Os três frames são carregados e normalizados uma única vez (datas já
+convertidas, chave ``order_id`` consistente entre pedidos e itens) e mantidos
+em ``st.cache_resource``: todas as sessões recebem a mesma instância, sem cópia
+por rerun. As páginas acessam os frames por propriedades que devolvem visões
+copy-on-write, então qualquer alteração feita por uma página fica local a ela.
+
+Na carga, o :data:`ESQUEMA` converte os textos repetidos em ``category`` e
+reduz os inteiros ao menor tipo que os comporta. ``material_id`` e
+``material_name`` usam o mesmo dicionário em itens e supply, então merges e
+groupbys entre os dois frames operam sobre os códigos inteiros.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from ingestao import ler_planilha, versao_dados
+from instrumentacao import cronometrado
+
+# Com copy-on-write, as visões devolvidas pelo Dataset nunca alteram os frames
+# em cache. A partir do pandas 3.0 esse já é o comportamento padrão.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+ARQUIVO_PEDIDOS = 'data/pedidos.xlsx'
+ARQUIVO_ITENS_SUPPLY = 'data/itens_supply.xlsx'
+
+COLUNA_PRAZO = 'Prazo a transportadora entregar no cliente'
+COLUNA_ENTREGA = 'Entregue para o cliente em:'
+COLUNAS_DATA_PEDIDO = ['created_at', COLUNA_PRAZO, COLUNA_ENTREGA]
+
+# Tipo compacto de cada coluna na carga:
+# - 'categoria': texto repetido vira category com dicionário próprio do frame
+# - 'compartilhada': category com o mesmo dicionário em itens e supply
+# - 'inteiro': reduzido ao menor inteiro que comporta os valores
+# Valores monetários continuam float64: em float32 as somas perderiam centavos.
+ESQUEMA = {
+    'pedidos': {
+        'order_id': 'inteiro',
+        'Status do Pedido': 'categoria',
+        'Estado': 'categoria',
+        'Transportadora': 'categoria',
+    },
+    'itens': {
+        'order_id': 'inteiro',
+        'material_id': 'compartilhada',
+        'material_name': 'compartilhada',
+        'material_category': 'categoria',
+        'aasm_state': 'categoria',
+    },
+    'supply': {
+        'material_id': 'compartilhada',
+        'material_name': 'compartilhada',
+        'inventory_centre_id': 'inteiro',
+        'quantity': 'inteiro',
+    },
+}
+
+
+class Dataset:
+    """Pedidos, itens e supply normalizados, identificados por ``versao``."""
+
+    __slots__ = ('_pedidos', '_itens', '_supply', 'versao', 'memoria', 'derivados')
+
+    def __init__(self, pedidos, itens, supply, versao, memoria=None, derivados=None):
+        self._pedidos = pedidos
+        self._itens = itens
+        self._supply = supply
+        self.versao = versao
+        # Bytes de cada frame antes e depois da compactação de tipos (ver relatorio_memoria)
+        self.memoria = memoria or {}
+        # Agregações já atualizadas pela ingestão incremental (ver incremental.py); os
+        # caches derivados as usam em vez de recalcular tudo
+        self.derivados = derivados or {}
+
+    @property
+    def pedidos(self):
+        return self._pedidos.copy(deep=False)
+
+    @property
+    def itens(self):
+        return self._itens.copy(deep=False)
+
+    @property
+    def supply(self):
+        return self._supply.copy(deep=False)
+
+    def __repr__(self):
+        return (f"Dataset(versao={self.versao!r}, pedidos={len(self._pedidos)}, "
+                f"itens={len(self._itens)}, supply={len(self._supply)})")
+
+
+# Usado como hash_funcs nos caches derivados: o Dataset é identificado apenas pela versão
+HASH_DATASET = {Dataset: lambda dataset: dataset.versao}
+
+# Versões mantidas nos caches derivados: com a ingestão incremental cada delta cria
+# uma versão nova, e as tabelas das antigas não devem ficar na memória para sempre
+VERSOES_EM_CACHE = 2
+
+
+def uso_memoria(df):
+    """Bytes ocupados pelo frame, incluindo o conteúdo dos textos."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _dicionario_compartilhado(coluna, *frames):
+    valores = pd.concat([df[coluna].dropna() for df in frames if coluna in df.columns])
+    return pd.CategoricalDtype(pd.Index(valores.unique()).sort_values())
+
+
+def aplicar_esquema(frames, esquema=ESQUEMA):
+    """Converte as colunas de cada frame para os tipos compactos do ``esquema``.
+
+    ``frames`` é um dicionário ``{nome: DataFrame}`` com as mesmas chaves do
+    esquema; colunas ausentes são ignoradas.
+    """
+    compartilhadas = {coluna for colunas in esquema.values() for coluna, tipo in colunas.items() if tipo == 'compartilhada'}
+    dicionarios = {coluna: _dicionario_compartilhado(coluna, *frames.values()) for coluna in compartilhadas}
+
+    convertidos = {}
+    for nome, df in frames.items():
+        conversoes = {}
+        for coluna, tipo in esquema.get(nome, {}).items():
+            if coluna not in df.columns:
+                continue
+            if tipo == 'compartilhada':
+                conversoes[coluna] = df[coluna].astype(dicionarios[coluna])
+            elif tipo == 'categoria':
+                conversoes[coluna] = df[coluna].astype('category')
+            elif tipo == 'inteiro' and pd.api.types.is_integer_dtype(df[coluna]):
+                conversoes[coluna] = pd.to_numeric(df[coluna], downcast='integer')
+        convertidos[nome] = df.assign(**conversoes)
+    return convertidos
+
+
+def _categorias_unidas(coluna, *frames):
+    indices = [
+        df[coluna].cat.categories if isinstance(df[coluna].dtype, pd.CategoricalDtype) else pd.Index(df[coluna].dropna().unique())
+        for df in frames if coluna in df.columns
+    ]
+    unidas = indices[0]
+    for indice in indices[1:]:
+        unidas = unidas.union(indice)
+    return pd.CategoricalDtype(unidas.sort_values())
+
+
+def unificar_tipos(frames, deltas, esquema=ESQUEMA):
+    """Converte frames já compactos e seus deltas para os mesmos tipos, antes de concatená-los.
+
+    ``frames`` e ``deltas`` são dicionários ``{nome: DataFrame}``; ``deltas`` pode
+    ter só parte dos nomes. Cada coluna ``category`` passa a usar a união ordenada
+    das categorias dos dois lados (as compartilhadas, a união sobre todos os
+    frames) e os inteiros o menor tipo que comporta os dois. Sem isso o ``concat``
+    devolveria ``object`` ou ``int64``. Devolve ``(frames, deltas)`` convertidos.
+    """
+    todos = [*frames.values(), *deltas.values()]
+    tipos = {}
+    for nome in frames:
+        lados = [frames[nome]] + ([deltas[nome]] if nome in deltas else [])
+        for coluna, tipo in esquema.get(nome, {}).items():
+            if not all(coluna in df.columns for df in lados):
+                continue
+            if tipo == 'compartilhada':
+                tipos[nome, coluna] = _categorias_unidas(coluna, *todos)
+            elif tipo == 'categoria':
+                tipos[nome, coluna] = _categorias_unidas(coluna, *lados)
+            elif tipo == 'inteiro' and all(pd.api.types.is_integer_dtype(df[coluna]) for df in lados):
+                reduzidos = [pd.to_numeric(df[coluna], downcast='integer').dtype for df in lados]
+                tipos[nome, coluna] = np.result_type(*reduzidos)
+
+    def converter(nome, df):
+        conversoes = {coluna: df[coluna].astype(tipo) for (frame, coluna), tipo in tipos.items() if frame == nome}
+        return df.assign(**conversoes)
+
+    return ({nome: converter(nome, df) for nome, df in frames.items()},
+            {nome: converter(nome, df) for nome, df in deltas.items()})
+
+
+def contar_valores(df, colunas):
+    """Equivalente a ``df.value_counts(colunas)`` só com as combinações presentes.
+
+    Em colunas ``category`` o ``value_counts`` lista também as categorias sem
+    ocorrência; aqui elas são descartadas, como acontecia com os textos.
+    """
+    if isinstance(colunas, str):
+        # Para uma coluna só, o value_counts de um category é uma contagem direta dos códigos
+        contagem = df[colunas].value_counts()
+        return contagem[contagem > 0]
+    return df.groupby(colunas, observed=True).size().rename('count').sort_values(ascending=False)
+
+
+def relatorio_memoria(dataset):
+    """Tabela com a memória de cada frame antes e depois da compactação de tipos (MB)."""
+    tabela = pd.DataFrame.from_dict(dataset.memoria, orient='index', columns=['antes', 'depois']) / 2**20
+    tabela.loc['total'] = tabela.sum()
+    tabela['reducao_%'] = (1 - tabela['depois'] / tabela['antes']) * 100
+    return tabela.rename(columns={'antes': 'antes_mb', 'depois': 'depois_mb'})
+
+
+def normalizar_pedidos(df_pedido):
+    """Padroniza a chave dos pedidos como ``order_id`` e converte as colunas de data."""
+    df_pedido = df_pedido.rename(columns={'id': 'order_id'})
+    for coluna in COLUNAS_DATA_PEDIDO:
+        if coluna in df_pedido.columns:
+            df_pedido[coluna] = pd.to_datetime(df_pedido[coluna], errors='coerce')
+    return df_pedido
+
+
+def normalizar_dataset(df_pedido, df_itens, df_supply, versao):
+    """Converte as colunas de data, padroniza a chave dos pedidos como ``order_id`` e compacta os tipos."""
+    df_pedido = normalizar_pedidos(df_pedido)
+    frames = {'pedidos': df_pedido, 'itens': df_itens, 'supply': df_supply}
+    compactos = aplicar_esquema(frames)
+    memoria = {nome: (uso_memoria(frames[nome]), uso_memoria(compactos[nome])) for nome in frames}
+    return Dataset(compactos['pedidos'], compactos['itens'], compactos['supply'], versao, memoria)
+
+
+@cronometrado('ler_dataset')
+def ler_dataset():
+    """Lê os arquivos excel (via snapshot Parquet) e os normaliza, sem cache."""
+    df_pedido = ler_planilha(ARQUIVO_PEDIDOS)
+    df_itens = ler_planilha(ARQUIVO_ITENS_SUPPLY, sheet_name='Itens')
+    df_supply = ler_planilha(ARQUIVO_ITENS_SUPPLY, sheet_name='Supply')
+    versao = versao_dados(ARQUIVO_PEDIDOS, ARQUIVO_ITENS_SUPPLY)
+    return normalizar_dataset(df_pedido, df_itens, df_supply, versao)
+
+
+@st.cache_resource
+def carregar_dataset():
+    """Carrega os dados uma única vez por processo do Streamlit."""
+    return ler_dataset()
@@ -0,0 +1,45 @@
+"""Tabela derivada de financeiro por pedido, compartilhada pelas páginas de descontos e faturamento."""
+import streamlit as st
+
+from dataset import HASH_DATASET, VERSOES_EM_CACHE
+from instrumentacao import cronometrado
+
+
+def somar_itens(df_itens):
+    """Soma dos preços dos itens de cada pedido (índice ``order_id``)."""
+    return df_itens.groupby('order_id')['price'].sum().rename('soma_precos_itens')
+
+
+def montar_financeiro(df_pedido, soma_dos_itens_por_pedido):
+    """Soma dos itens, soma com frete e desconto calculado de cada pedido."""
+    df_financeiro_pedidos = df_pedido.merge(soma_dos_itens_por_pedido, left_on='order_id', right_index=True, how='left')
+    df_financeiro_pedidos['soma_dos_itens_e_frete'] = df_financeiro_pedidos['soma_precos_itens'].fillna(0) + df_financeiro_pedidos['Frete Cobrado do Cliente (R$)']
+
+    # Evitar divisão por zero ou valores negativos que geram descontos > 100%
+    df_financeiro_pedidos = df_financeiro_pedidos[df_financeiro_pedidos['soma_dos_itens_e_frete'] > 0].reset_index(drop=True)
+
+    termo_divisao = df_financeiro_pedidos['Valor de NF (R$)'] / df_financeiro_pedidos['soma_dos_itens_e_frete']
+    df_financeiro_pedidos['desconto_calculado'] = (1 - termo_divisao) * 100
+    return df_financeiro_pedidos
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('calcular_soma_itens_por_pedido')
+def calcular_soma_itens_por_pedido(dataset):
+    """Soma dos itens por pedido da versão dos dados (somente leitura)."""
+    if 'soma_itens' in dataset.derivados:
+        return dataset.derivados['soma_itens']
+    return somar_itens(dataset.itens)
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('calcular_financeiro_pedidos')
+def calcular_financeiro_pedidos(dataset):
+    """Soma dos itens, soma com frete e desconto calculado de cada pedido.
+
+    Calculada uma vez por versão dos dados e compartilhada entre sessões sem
+    cópia; o resultado deve ser tratado como somente leitura.
+    """
+    if 'financeiro' in dataset.derivados:
+        return dataset.derivados['financeiro']
+    return montar_financeiro(dataset.pedidos, calcular_soma_itens_por_pedido(dataset))
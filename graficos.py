@@ -0,0 +1,290 @@
+"""API de gráficos do dashboard com backends intercambiáveis.
+
+As páginas descrevem *o que* desenhar (linha diária, regressão, rankings em
+barras horizontais, barras por categoria e barras agrupadas por centro) e o
+backend decide *como*:
+
+- ``vegalite`` (padrão): gera uma especificação Vega-Lite declarativa que o
+  navegador renderiza; o servidor só serializa os poucos pontos do gráfico.
+- ``matplotlib``: desenha com seaborn/matplotlib no servidor e guarda a imagem
+  em cache, identificada pela chave (página, gráfico, parâmetros e versão dos dados).
+
+O backend é escolhido pela variável de ambiente ``DASHBOARD_GRAFICOS``.
+"""
+import io
+import os
+
+import pandas as pd
+import streamlit as st
+
+from instrumentacao import cronometrado, etapa
+
+BACKEND = os.environ.get('DASHBOARD_GRAFICOS', 'vegalite')
+
+# Mesmos padrões usados pelo st.pyplot
+OPCOES_SAVEFIG = {'bbox_inches': 'tight', 'dpi': 200}
+
+COR_MEDIA = 'darkorange'
+COR_REGRESSAO = 'red'
+
+
+# --- BACKEND MATPLOTLIB (IMAGEM EM CACHE) ---
+
+@st.cache_data(show_spinner=False, max_entries=256)
+@cronometrado('grafico:matplotlib')
+def _renderizar(chave, formato, _desenhar):
+    """Desenha a figura e devolve os bytes da imagem, liberando a figura em seguida."""
+    import matplotlib.pyplot as plt
+
+    fig = _desenhar()
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=formato, **OPCOES_SAVEFIG)
+    finally:
+        # Sem isso o pyplot mantém todas as figuras vivas e a memória do servidor só cresce
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def exibir_figura(desenhar, *chave, formato='png', width='stretch'):
+    """Exibe o gráfico produzido por ``desenhar()`` usando a imagem em cache para ``chave``.
+
+    ``desenhar`` deve criar e devolver uma figura do matplotlib; ``chave`` deve
+    conter tudo de que o gráfico depende (página, parâmetros e versão dos dados).
+    """
+    imagem = _renderizar(chave, formato, desenhar)
+    if formato == 'svg':
+        imagem = imagem.decode('utf-8')
+    st.image(imagem, width=width)
+
+
+def _eixos(tamanho):
+    import matplotlib.pyplot as plt
+
+    return plt.subplots(figsize=tamanho)
+
+
+def _titulos(ax, titulo, rotulo_x, rotulo_y, tamanho_titulo=14):
+    ax.set_title(titulo, fontsize=tamanho_titulo, fontweight='bold', pad=20)
+    ax.set_xlabel(rotulo_x, fontsize=12, fontweight='bold')
+    ax.set_ylabel(rotulo_y, fontsize=12, fontweight='bold')
+
+
+# --- BACKEND VEGA-LITE (RENDERIZADO NO NAVEGADOR) ---
+
+def _spec_barras(titulo, rotulo_x, rotulo_y, horizontal, n_barras):
+    categoria = {'field': 'categoria', 'type': 'nominal', 'sort': None, 'title': rotulo_y if horizontal else rotulo_x}
+    valor = {'field': 'valor', 'type': 'quantitative', 'title': rotulo_x if horizontal else rotulo_y}
+    encoding = {'y': categoria, 'x': valor} if horizontal else {'x': categoria, 'y': valor}
+    texto = {'align': 'left', 'dx': 3} if horizontal else {'baseline': 'bottom', 'dy': -3}
+
+    spec = {
+        'title': titulo,
+        'encoding': encoding,
+        'layer': [
+            {'mark': {'type': 'bar', 'tooltip': True}},
+            {'mark': {'type': 'text', **texto}, 'encoding': {'text': {'field': 'rotulo'}}},
+        ],
+    }
+    if horizontal:
+        spec['height'] = max(200, 22 * n_barras)
+    return spec
+
+
+def _exibir_vegalite(dados, spec):
+    with etapa('grafico:vegalite'):
+        st.vega_lite_chart(dados, spec, width='stretch')
+
+
+def _dados_barras(valores, formato_rotulo):
+    dados = pd.DataFrame({'categoria': valores.index.astype(str), 'valor': valores.to_numpy()})
+    dados['rotulo'] = dados['valor'].map(formato_rotulo.format) if formato_rotulo else dados['valor'].astype(str)
+    return dados
+
+
+# --- API PÚBLICA ---
+
+def linha_diaria(serie, titulo, rotulo_x, rotulo_y, rotulo_media, formato_data='%d', tamanho=(12, 5), chave=()):
+    """Linha de uma série diária com marcadores e a linha tracejada da média.
+
+    ``rotulo_media`` é um texto com ``{}`` onde a média será formatada, por exemplo
+    ``'Média: {:.1f} pedidos/dia'``.
+    """
+    media = serie.mean()
+    legenda_media = rotulo_media.format(media)
+
+    if BACKEND == 'vegalite':
+        dados = pd.DataFrame({'dia': serie.index, 'valor': serie.to_numpy()}).dropna()
+        spec = {
+            'title': titulo,
+            'layer': [
+                {
+                    'mark': {'type': 'line', 'point': True, 'strokeWidth': 2.5, 'tooltip': True},
+                    'encoding': {
+                        # Vega-Lite usa a mesma sintaxe strftime do matplotlib para datas
+                        'x': {'field': 'dia', 'type': 'temporal', 'title': rotulo_x, 'axis': {'format': formato_data}},
+                        'y': {'field': 'valor', 'type': 'quantitative', 'title': rotulo_y},
+                    },
+                },
+                {
+                    'mark': {'type': 'rule', 'color': COR_MEDIA, 'strokeDash': [6, 4]},
+                    'encoding': {'y': {'datum': float(media)}},
+                },
+                {
+                    'mark': {'type': 'text', 'color': COR_MEDIA, 'align': 'right', 'baseline': 'bottom', 'x': 'width', 'dy': -4},
+                    'encoding': {'y': {'datum': float(media)}, 'text': {'value': legenda_media}},
+                },
+            ],
+        }
+        _exibir_vegalite(dados, spec)
+        return
+
+    def desenhar():
+        import matplotlib.dates as mdates
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        sns.set_style("whitegrid", {"grid.color": ".8", "grid.linestyle": "--"})
+        fig, ax = _eixos(tamanho)
+        sns.lineplot(x=serie.index, y=serie.to_numpy(), linewidth=2.5, marker='o', markersize=6, ax=ax)
+        if formato_data == '%d':
+            ax.xaxis.set_major_locator(mdates.DayLocator())
+        ax.xaxis.set_major_formatter(mdates.DateFormatter(formato_data))
+        ax.axhline(y=media, color=COR_MEDIA, linestyle='--', alpha=0.8, label=legenda_media)
+        _titulos(ax, titulo, rotulo_x, rotulo_y)
+        ax.legend()
+        plt.tight_layout()
+        return fig
+
+    exibir_figura(desenhar, 'linha_diaria', titulo, *chave)
+
+
+def regressao(x, y, titulo, rotulo_x, rotulo_y, reta=None, tamanho=(8, 5), chave=()):
+    """Dispersão de ``y`` contra ``x`` com a reta de regressão linear.
+
+    ``reta`` é ``(inclinacao, intercepto)`` já calculada (ver
+    :func:`correlacoes.reta_regressao`); sem ela, a reta é ajustada no gráfico.
+    """
+    if BACKEND == 'vegalite':
+        dados = pd.DataFrame({'x': x.to_numpy(), 'y': y.to_numpy()}).dropna()
+        encoding = {
+            'x': {'field': 'x', 'type': 'quantitative', 'title': rotulo_x, 'scale': {'zero': False}},
+            'y': {'field': 'y', 'type': 'quantitative', 'title': rotulo_y, 'scale': {'zero': False}},
+        }
+        camada_reta = {'mark': {'type': 'line', 'color': COR_REGRESSAO, 'strokeDash': [6, 4]}}
+        if reta is None:
+            camada_reta['transform'] = [{'regression': 'y', 'on': 'x'}]
+        else:
+            inclinacao, intercepto = reta
+            camada_reta['transform'] = [{'calculate': f"{inclinacao!r} * datum.x + {intercepto!r}", 'as': 'y_reta'}]
+            camada_reta['encoding'] = {'y': {**encoding['y'], 'field': 'y_reta'}}
+        spec = {
+            'title': titulo,
+            'encoding': encoding,
+            'layer': [
+                {'mark': {'type': 'point', 'filled': True, 'tooltip': True}},
+                camada_reta,
+            ],
+        }
+        _exibir_vegalite(dados, spec)
+        return
+
+    def desenhar():
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
+        fig, ax = _eixos(tamanho)
+        estilo_reta = {"color": COR_REGRESSAO, "linestyle": "--"}
+        if reta is None:
+            sns.regplot(x=x, y=y, ax=ax, ci=None, line_kws=estilo_reta)
+        else:
+            sns.regplot(x=x, y=y, ax=ax, fit_reg=False)
+            inclinacao, intercepto = reta
+            limites_x = [x.min(), x.max()]
+            ax.plot(limites_x, [inclinacao * valor + intercepto for valor in limites_x], **estilo_reta)
+        _titulos(ax, titulo, rotulo_x, rotulo_y)
+        plt.tight_layout()
+        return fig
+
+    exibir_figura(desenhar, 'regressao', titulo, *chave)
+
+
+def barras_horizontais(valores, titulo, rotulo_x, rotulo_y, formato_rotulo=None, rotulo_centralizado=False,
+                       tamanho=(12, 8), chave=()):
+    """Ranking em barras horizontais de uma Series (índice = categoria), na ordem recebida.
+
+    ``formato_rotulo`` é um texto com ``{}`` usado para o rótulo de cada barra,
+    por exemplo ``'R$ {:.0f}'``.
+    """
+    if BACKEND == 'vegalite':
+        spec = _spec_barras(titulo, rotulo_x, rotulo_y, horizontal=True, n_barras=len(valores))
+        _exibir_vegalite(_dados_barras(valores, formato_rotulo), spec)
+        return
+
+    def desenhar():
+        import seaborn as sns
+
+        fig, ax = _eixos(tamanho)
+        sns.barplot(x=valores.to_numpy(), y=valores.index.astype(str), errorbar=None, ax=ax, orient='h')
+        if rotulo_centralizado:
+            ax.bar_label(ax.containers[0], fmt=formato_rotulo or '{}', label_type='center', color='white', fontweight='bold')
+        else:
+            ax.bar_label(ax.containers[0], fmt=formato_rotulo or '{}')
+        _titulos(ax, titulo, rotulo_x, rotulo_y)
+        return fig
+
+    exibir_figura(desenhar, 'barras_horizontais', titulo, *chave)
+
+
+def barras_verticais(valores, titulo, rotulo_x, rotulo_y, formato_rotulo=None, tamanho=(8, 6), chave=()):
+    """Barras verticais de uma Series (índice = categoria)."""
+    if BACKEND == 'vegalite':
+        spec = _spec_barras(titulo, rotulo_x, rotulo_y, horizontal=False, n_barras=len(valores))
+        _exibir_vegalite(_dados_barras(valores, formato_rotulo), spec)
+        return
+
+    def desenhar():
+        import seaborn as sns
+
+        fig, ax = _eixos(tamanho)
+        sns.barplot(x=valores.index.astype(str), y=valores.to_numpy(), errorbar=None, ax=ax)
+        ax.bar_label(ax.containers[0], fmt=formato_rotulo or '{}')
+        _titulos(ax, titulo, rotulo_x, rotulo_y)
+        return fig
+
+    exibir_figura(desenhar, 'barras_verticais', titulo, *chave)
+
+
+def barras_agrupadas(df, valor, categoria, grupo, titulo, rotulo_x, rotulo_y, rotulo_grupo,
+                     tamanho=(14, 8), chave=()):
+    """Barras horizontais de ``valor`` por ``categoria``, separadas por ``grupo`` (cor)."""
+    if BACKEND == 'vegalite':
+        dados = df[[categoria, grupo, valor]].copy()
+        dados[grupo] = dados[grupo].astype(str)
+        spec = {
+            'title': titulo,
+            'mark': {'type': 'bar', 'tooltip': True},
+            'height': max(200, 14 * len(dados)),
+            'encoding': {
+                'y': {'field': categoria, 'type': 'nominal', 'sort': None, 'title': rotulo_y},
+                'x': {'field': valor, 'type': 'quantitative', 'title': rotulo_x},
+                'yOffset': {'field': grupo},
+                'color': {'field': grupo, 'type': 'nominal', 'title': rotulo_grupo},
+            },
+        }
+        _exibir_vegalite(dados, spec)
+        return
+
+    def desenhar():
+        import seaborn as sns
+
+        fig, ax = _eixos(tamanho)
+        # Em colunas category o seaborn desenharia também as categorias sem dados
+        dados = df.assign(**{categoria: df[categoria].astype(str)})
+        # Os valores já vêm agregados por categoria e grupo: sem intervalo de confiança (bootstrap)
+        sns.barplot(data=dados, x=valor, y=categoria, hue=grupo, errorbar=None, ax=ax)
+        _titulos(ax, titulo, rotulo_x, rotulo_y, tamanho_titulo=16)
+        ax.legend(title=rotulo_grupo)
+        return fig
+
+    exibir_figura(desenhar, 'barras_agrupadas', titulo, *chave)
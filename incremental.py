@@ -0,0 +1,177 @@
+"""Atualização incremental do dataset a partir de arquivos delta.
+
+Ao longo do dia o pipeline deposita em :data:`DIRETORIO_DELTAS` (variável de
+ambiente ``DASHBOARD_DELTAS``) arquivos ``<tipo>-<lote>.<ext>``, com tipo
+``pedidos``, ``itens`` ou ``supply`` e extensão .parquet, .csv ou .xlsx. Os
+arquivos de um mesmo lote são aplicados juntos, em ordem de lote, como upsert:
+
+- pedidos substituem os pedidos com o mesmo ``order_id`` ou são acrescentados;
+- itens substituem todos os itens dos pedidos que aparecem no delta;
+- linhas de supply substituem todas as linhas dos materiais que aparecem no delta.
+
+Cada lote gera um novo :class:`~dataset.Dataset`, com versão derivada da
+anterior e do conteúdo do delta, que já leva as agregações caras atualizadas
+só nos pedidos, dias e materiais afetados: soma dos itens por pedido, vendas
+por material e cubo diário. As demais tabelas derivadas partem delas.
+
+O pipeline deve gravar cada arquivo com outro nome e renomeá-lo ao final, para
+que o dashboard nunca leia um delta pela metade. Reaplicar um lote é inofensivo.
+"""
+import glob
+import hashlib
+import os
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from cobertura import calcular_vendas_por_material, contar_vendas
+from dataset import Dataset, carregar_dataset, normalizar_pedidos, unificar_tipos
+from financeiro import calcular_soma_itens_por_pedido, montar_financeiro, somar_itens
+from ingestao import assinatura_arquivo, ler_planilha
+from instrumentacao import cronometrado
+from rollup import calcular_rollup_diario, reagregar_dias
+
+DIRETORIO_DELTAS = os.environ.get('DASHBOARD_DELTAS', os.path.join('data', 'deltas'))
+
+TIPOS_DELTA = ('pedidos', 'itens', 'supply')
+FORMATOS_DELTA = ('.parquet', '.csv', '.xlsx')
+
+
+def ler_delta(caminho):
+    """Lê um arquivo delta (.parquet, .csv ou .xlsx, este via snapshot Parquet)."""
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == '.parquet':
+        return pd.read_parquet(caminho)
+    if extensao == '.csv':
+        return pd.read_csv(caminho)
+    if extensao == '.xlsx':
+        return ler_planilha(caminho)
+    raise ValueError(f"Formato de delta não suportado: {caminho}")
+
+
+def listar_deltas(diretorio=DIRETORIO_DELTAS):
+    """Arquivos delta de ``diretorio`` agrupados por lote: ``{lote: {tipo: caminho}}``, em ordem de lote."""
+    lotes = {}
+    for caminho in sorted(glob.glob(os.path.join(diretorio, '*'))):
+        nome, extensao = os.path.splitext(os.path.basename(caminho))
+        tipo, _, lote = nome.partition('-')
+        if tipo in TIPOS_DELTA and extensao.lower() in FORMATOS_DELTA:
+            lotes.setdefault(lote, {})[tipo] = caminho
+    return dict(sorted(lotes.items()))
+
+
+def _versao_delta(versao, deltas):
+    """Versão do dataset resultante: a anterior mais o conteúdo do delta."""
+    conteudo = '|'.join(f"{nome}:{pd.util.hash_pandas_object(df, index=False).sum()}" for nome, df in sorted(deltas.items()))
+    return hashlib.sha1(f"{versao}|{conteudo}".encode('utf-8')).hexdigest()[:16]
+
+
+def _atualizar_vendas(vendas, tipo_material, removidos, acrescentados):
+    """Vendas por material descontando os itens removidos e somando os acrescentados."""
+    vendas = vendas.set_axis(vendas.index.astype(tipo_material))
+    contagem = pd.concat([vendas, contar_vendas(acrescentados), -contar_vendas(removidos)]).groupby(level=0, observed=True).sum()
+    return contagem[contagem > 0].sort_values(ascending=False).rename('total_vendido')
+
+
+@cronometrado('aplicar_delta')
+def aplicar_delta(dataset, pedidos=None, itens=None, supply=None):
+    """Novo :class:`~dataset.Dataset` com o delta mesclado e as agregações derivadas atualizadas.
+
+    ``pedidos``, ``itens`` e ``supply`` são frames no formato das planilhas; os
+    ausentes ficam como estão.
+    """
+    deltas = {nome: df for nome, df in (('pedidos', pedidos), ('itens', itens), ('supply', supply)) if df is not None}
+    if not deltas:
+        return dataset
+    if 'pedidos' in deltas:
+        deltas['pedidos'] = normalizar_pedidos(deltas['pedidos']).drop_duplicates('order_id', keep='last')
+
+    antigos, deltas = unificar_tipos({'pedidos': dataset.pedidos, 'itens': dataset.itens, 'supply': dataset.supply}, deltas)
+    vazio = pd.Index([])
+    ids_pedidos = pd.Index(deltas['pedidos']['order_id'].unique()) if 'pedidos' in deltas else vazio
+    ids_itens = pd.Index(deltas['itens']['order_id'].unique()) if 'itens' in deltas else vazio
+
+    df_pedido = antigos['pedidos']
+    if 'pedidos' in deltas:
+        df_pedido = pd.concat([df_pedido[~df_pedido['order_id'].isin(ids_pedidos)], deltas['pedidos']], ignore_index=True)
+
+    df_itens = antigos['itens']
+    itens_removidos = df_itens.iloc[:0]
+    if 'itens' in deltas:
+        substituidos = df_itens['order_id'].isin(ids_itens)
+        itens_removidos = df_itens[substituidos]
+        df_itens = pd.concat([df_itens[~substituidos], deltas['itens']], ignore_index=True)
+
+    df_supply = antigos['supply']
+    if 'supply' in deltas:
+        df_supply = pd.concat([df_supply[~df_supply['material_id'].isin(deltas['supply']['material_id'])], deltas['supply']], ignore_index=True)
+
+    # Soma por pedido: só os pedidos com itens no delta são somados de novo
+    soma_itens = calcular_soma_itens_por_pedido(dataset)
+    if 'itens' in deltas:
+        soma_itens = pd.concat([soma_itens.drop(ids_itens, errors='ignore'), somar_itens(deltas['itens'])]).sort_index()
+    df_financeiro = montar_financeiro(df_pedido, soma_itens)
+
+    # Cubo diário: só os dias em que os pedidos afetados estavam ou passaram a estar
+    afetados = ids_pedidos.union(ids_itens)
+    dias = pd.concat([
+        antigos['pedidos'].loc[antigos['pedidos']['order_id'].isin(afetados), 'created_at'],
+        df_pedido.loc[df_pedido['order_id'].isin(afetados), 'created_at'],
+    ]).dt.floor('D')
+    rollup = reagregar_dias(calcular_rollup_diario(dataset), df_pedido, df_financeiro, dias)
+
+    vendas = calcular_vendas_por_material(dataset)
+    if 'itens' in deltas:
+        vendas = _atualizar_vendas(vendas, df_itens['material_id'].dtype, itens_removidos, deltas['itens'])
+
+    derivados = {'soma_itens': soma_itens, 'financeiro': df_financeiro, 'rollup': rollup, 'vendas_por_material': vendas}
+    return Dataset(df_pedido, df_itens, df_supply, _versao_delta(dataset.versao, deltas), derivados=derivados)
+
+
+class Atualizador:
+    """Dataset corrente do processo, mantido em dia com os lotes que chegam em ``diretorio``.
+
+    Um lote é reaplicado se algum de seus arquivos mudar; as sessões que chamam
+    :meth:`atualizar` ao mesmo tempo esperam a mesma aplicação.
+    """
+
+    def __init__(self, dataset, diretorio=DIRETORIO_DELTAS):
+        self.dataset = dataset
+        self.diretorio = diretorio
+        self._aplicados = set()
+        self._lock = threading.Lock()
+
+    def atualizar(self):
+        """Aplica os lotes novos ou alterados e devolve o dataset corrente."""
+        with self._lock:
+            for lote, arquivos in listar_deltas(self.diretorio).items():
+                chave = (lote, tuple((tipo, assinatura_arquivo(caminho)) for tipo, caminho in sorted(arquivos.items())))
+                if chave in self._aplicados:
+                    continue
+                self.dataset = aplicar_delta(self.dataset, **{tipo: ler_delta(caminho) for tipo, caminho in arquivos.items()})
+                self._aplicados.add(chave)
+            return self.dataset
+
+
+def aplicar_deltas(dataset, diretorio=DIRETORIO_DELTAS):
+    """``dataset`` com todos os lotes de ``diretorio`` aplicados (uso fora do Streamlit)."""
+    return Atualizador(dataset, diretorio).atualizar()
+
+
+@st.cache_resource
+def _atualizador():
+    return Atualizador(carregar_dataset())
+
+
+def carregar_dataset_atualizado():
+    """Dataset do processo com os deltas já aplicados; barato quando não há lote novo.
+
+    No modo com vários processos (``DASHBOARD_ARMAZEM``), o carregador já
+    aplicou os deltas e o dataset vem do armazém compartilhado.
+    """
+    import armazem
+
+    if armazem.DIRETORIO_ARMAZEM:
+        return armazem.dataset_do_armazem()
+    return _atualizador().atualizar()
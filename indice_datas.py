@@ -0,0 +1,53 @@
+"""Índice particionado por data sobre pedidos e itens.
+
+Os frames são ordenados uma única vez pelo timestamp do pedido; qualquer filtro
+de dia ou período vira uma busca binária (``searchsorted``) sobre os
+timestamps em int64 seguida de uma fatia, sem comparar linha a linha.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dataset import HASH_DATASET, VERSOES_EM_CACHE
+from financeiro import calcular_financeiro_pedidos
+from instrumentacao import cronometrado
+
+
+class IndiceDatas:
+    """Frame ordenado por uma coluna de data, com fatiamento por período."""
+
+    def __init__(self, df, datas):
+        datas = pd.to_datetime(pd.Series(datas, index=df.index))
+        timestamps = datas.to_numpy(dtype='datetime64[ns]').view('int64')
+        ordem = np.argsort(timestamps, kind='stable')
+
+        self.df = df.iloc[ordem].reset_index(drop=True)
+        self._timestamps = timestamps[ordem]
+        validos = datas.dropna()
+        self.data_minima = validos.min().date() if not validos.empty else None
+        self.data_maxima = validos.max().date() if not validos.empty else None
+
+    def fatiar(self, inicio, fim):
+        """Linhas com data entre ``inicio`` e ``fim`` (dias inclusivos)."""
+        limite_inferior = pd.Timestamp(inicio).value
+        limite_superior = (pd.Timestamp(fim) + pd.Timedelta(days=1)).value
+        i, j = np.searchsorted(self._timestamps, [limite_inferior, limite_superior], side='left')
+        return self.df.iloc[i:j]
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('construir_indices_datas')
+def construir_indices_datas(dataset):
+    """Índices por data dos pedidos, da tabela financeira e dos itens (somente leitura).
+
+    Os itens são indexados pela data de criação do seu pedido.
+    """
+    df_pedido, df_itens = dataset.pedidos, dataset.itens
+    df_financeiro_pedidos = calcular_financeiro_pedidos(dataset)
+    data_por_pedido = df_pedido.drop_duplicates('order_id').set_index('order_id')['created_at']
+
+    return {
+        'pedidos': IndiceDatas(df_pedido, df_pedido['created_at']),
+        'financeiro': IndiceDatas(df_financeiro_pedidos, df_financeiro_pedidos['created_at']),
+        'itens': IndiceDatas(df_itens, df_itens['order_id'].map(data_por_pedido)),
+    }
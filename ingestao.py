@@ -0,0 +1,79 @@
+"""Camada de ingestão: converte as planilhas Excel em snapshots Parquet tipados.
+
+A leitura de um .xlsx com openpyxl é lenta e consome muita memória. Cada
+planilha (arquivo + aba) é convertida uma única vez para Parquet e o snapshot
+é reutilizado enquanto o arquivo de origem não mudar (mtime + tamanho).
+"""
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+DIRETORIO_CACHE = os.path.join('data', '.cache')
+
+
+def assinatura_arquivo(caminho):
+    """Retorna uma assinatura barata do arquivo fonte (mtime em ns + tamanho)."""
+    stat = os.stat(caminho)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _prefixo_snapshot(caminho, sheet_name):
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    aba = 'default' if sheet_name in (None, 0) else str(sheet_name)
+    return os.path.join(DIRETORIO_CACHE, f"{nome}-{aba}")
+
+
+def caminho_snapshot(caminho, sheet_name=0):
+    """Caminho do snapshot Parquet correspondente à versão atual da planilha."""
+    chave = f"{os.path.abspath(caminho)}|{sheet_name}|{assinatura_arquivo(caminho)}"
+    digest = hashlib.sha1(chave.encode('utf-8')).hexdigest()[:16]
+    return f"{_prefixo_snapshot(caminho, sheet_name)}-{digest}.parquet"
+
+
+def _normalizar_tipos(df):
+    """Converte colunas object com tipos misturados para texto, para que o Arrow consiga tipá-las."""
+    for coluna in df.columns:
+        if df[coluna].dtype == object:
+            tipo = pd.api.types.infer_dtype(df[coluna], skipna=True)
+            if tipo.startswith('mixed'):
+                df[coluna] = df[coluna].where(df[coluna].isna(), df[coluna].astype(str))
+    return df
+
+
+def _gravar_snapshot(df, destino, prefixo):
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    # Escreve em um arquivo temporário e renomeia, para que um leitor concorrente
+    # nunca veja um snapshot pela metade.
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    df.to_parquet(temporario, index=False)
+    os.replace(temporario, destino)
+
+    # Remove snapshots de versões anteriores da mesma planilha
+    for antigo in glob.glob(f"{prefixo}-*.parquet"):
+        if antigo != destino:
+            try:
+                os.remove(antigo)
+            except OSError:
+                pass
+
+
+def garantir_snapshot(caminho, sheet_name=0):
+    """Caminho do snapshot Parquet de uma aba da planilha, criando-o se necessário."""
+    destino = caminho_snapshot(caminho, sheet_name)
+    if not os.path.exists(destino):
+        df = _normalizar_tipos(pd.read_excel(caminho, sheet_name=sheet_name))
+        _gravar_snapshot(df, destino, _prefixo_snapshot(caminho, sheet_name))
+    return destino
+
+
+def ler_planilha(caminho, sheet_name=0):
+    """Lê uma aba da planilha a partir do snapshot Parquet, criando-o se necessário."""
+    return pd.read_parquet(garantir_snapshot(caminho, sheet_name), memory_map=True)
+
+
+def versao_dados(*caminhos):
+    """Impressão digital da versão dos dados, derivada das assinaturas dos arquivos fonte."""
+    assinaturas = '|'.join(f"{os.path.abspath(c)}:{assinatura_arquivo(c)}" for c in caminhos)
+    return hashlib.sha1(assinaturas.encode('utf-8')).hexdigest()[:16]
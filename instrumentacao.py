@@ -0,0 +1,211 @@
+"""Instrumentação do dashboard: tempo e memória de cada etapa de um rerun.
+
+Ligada pela variável de ambiente ``DASHBOARD_INSTRUMENTACAO=1``. Cada rerun
+registra as etapas marcadas com :func:`cronometrado` ou :func:`etapa` (carga
+dos dados, páginas, análises, tabelas derivadas e desenho de gráficos), com a
+duração e a variação da memória do processo, aninhadas como foram chamadas.
+O resultado aparece em um painel na barra lateral e é acrescentado, uma linha
+JSON por rerun, ao arquivo ``DASHBOARD_LOG_TEMPOS`` (padrão ``tempos.jsonl``).
+
+Com ``DASHBOARD_PERFIL=cprofile`` (ou ``pyinstrument``, se instalado) cada
+rerun também é perfilado, e o perfil é gravado em ``DASHBOARD_DIRETORIO_PERFIS``
+(padrão ``perfis``). Desligada, a instrumentação custa uma verificação por
+chamada.
+"""
+import contextlib
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+
+ATIVA = os.environ.get('DASHBOARD_INSTRUMENTACAO', '') not in ('', '0')
+ARQUIVO_LOG = os.environ.get('DASHBOARD_LOG_TEMPOS', 'tempos.jsonl')
+PERFIL = os.environ.get('DASHBOARD_PERFIL', '')
+DIRETORIO_PERFIS = os.environ.get('DASHBOARD_DIRETORIO_PERFIS', 'perfis')
+
+# Cada sessão do Streamlit roda o script em uma thread própria
+_local = threading.local()
+_lock_log = threading.Lock()
+
+
+def memoria_processo_mb():
+    """Memória residente do processo em MB (``None`` se não for possível medir)."""
+    try:
+        with open('/proc/self/statm') as arquivo:
+            paginas_residentes = int(arquivo.read().split()[1])
+        return paginas_residentes * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+
+        # Fora do Linux só há o pico (em KB no Linux, em bytes no macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+    except ImportError:
+        return None
+
+
+class Execucao:
+    """Etapas medidas em um rerun do script."""
+
+    def __init__(self, pagina):
+        self.pagina = pagina
+        self.inicio = datetime.datetime.now()
+        self.etapas = []
+        self._pilha = []
+        self._t0 = time.perf_counter()
+        self.duracao_s = None
+
+    @contextlib.contextmanager
+    def medir(self, nome):
+        registro = {'etapa': nome, 'profundidade': len(self._pilha), 'duracao_ms': None, 'memoria_mb': None}
+        self.etapas.append(registro)
+        self._pilha.append(nome)
+        memoria_antes = memoria_processo_mb()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            registro['duracao_ms'] = (time.perf_counter() - inicio) * 1000
+            memoria_depois = memoria_processo_mb()
+            if memoria_antes is not None and memoria_depois is not None:
+                registro['memoria_mb'] = memoria_depois - memoria_antes
+            self._pilha.pop()
+
+    def encerrar(self):
+        self.duracao_s = time.perf_counter() - self._t0
+
+    def como_dict(self):
+        return {
+            'inicio': self.inicio.isoformat(timespec='milliseconds'),
+            'pagina': self.pagina,
+            'duracao_ms': self.duracao_s * 1000 if self.duracao_s is not None else None,
+            'memoria_processo_mb': memoria_processo_mb(),
+            'etapas': self.etapas,
+        }
+
+
+def execucao_atual():
+    """A :class:`Execucao` do rerun em andamento nesta thread, ou ``None``."""
+    return getattr(_local, 'execucao', None)
+
+
+@contextlib.contextmanager
+def etapa(nome):
+    """Mede o bloco como uma etapa do rerun atual (sem efeito se a instrumentação estiver desligada)."""
+    execucao = execucao_atual() if ATIVA else None
+    if execucao is None:
+        yield
+        return
+    with execucao.medir(nome):
+        yield
+
+
+def cronometrado(nome):
+    """Decorador que mede cada chamada da função como a etapa ``nome``.
+
+    Abaixo de um ``st.cache_*``, só as chamadas que de fato calculam aparecem.
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            if not ATIVA or execucao_atual() is None:
+                return funcao(*args, **kwargs)
+            with execucao_atual().medir(nome):
+                return funcao(*args, **kwargs)
+        return medida
+    return decorador
+
+
+def _iniciar_perfil():
+    if PERFIL == 'pyinstrument':
+        from pyinstrument import Profiler
+
+        perfil = Profiler()
+        perfil.start()
+        return perfil
+    if PERFIL == 'cprofile':
+        import cProfile
+
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+        except ValueError:
+            # Outra sessão já está perfilando neste processo
+            return None
+        return perfil
+    return None
+
+
+def _gravar_perfil(perfil, execucao):
+    os.makedirs(DIRETORIO_PERFIS, exist_ok=True)
+    nome = f"{execucao.inicio:%Y%m%d-%H%M%S-%f}-{execucao.pagina}"
+    if PERFIL == 'pyinstrument':
+        perfil.stop()
+        with open(os.path.join(DIRETORIO_PERFIS, f"{nome}.html"), 'w', encoding='utf-8') as arquivo:
+            arquivo.write(perfil.output_html())
+    else:
+        perfil.disable()
+        perfil.dump_stats(os.path.join(DIRETORIO_PERFIS, f"{nome}.prof"))
+
+
+def _gravar_log(registro):
+    linha = json.dumps(registro, ensure_ascii=False, default=str)
+    with _lock_log:
+        with open(ARQUIVO_LOG, 'a', encoding='utf-8') as arquivo:
+            arquivo.write(linha + '\n')
+
+
+@contextlib.contextmanager
+def execucao(pagina, extras=None):
+    """Delimita um rerun: mede as etapas internas, grava o log e o perfil e exibe o painel.
+
+    ``extras`` é chamado ao final e devolve um dicionário acrescentado ao
+    registro (por exemplo, os contadores do cache de resultados). Se o rerun
+    for interrompido (``st.rerun``, ``st.stop``), o registro é gravado, mas o
+    painel não é exibido.
+    """
+    if not ATIVA:
+        yield None
+        return
+
+    atual = Execucao(pagina)
+    _local.execucao = atual
+    perfil = _iniciar_perfil()
+    concluida = False
+    try:
+        yield atual
+        concluida = True
+    finally:
+        atual.encerrar()
+        _local.execucao = None
+        if perfil is not None:
+            _gravar_perfil(perfil, atual)
+        registro = atual.como_dict()
+        if extras is not None:
+            registro.update(extras())
+        _gravar_log(registro)
+        if concluida:
+            exibir_painel(registro)
+
+
+def exibir_painel(registro):
+    """Painel na barra lateral com as etapas do rerun e os demais dados do registro."""
+    # Importados aqui para que a página inicial não carregue o pandas
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander(f"⏱️ Instrumentação: {registro['duracao_ms']:.0f} ms", expanded=False):
+        etapas = pd.DataFrame(registro['etapas'], columns=['etapa', 'profundidade', 'duracao_ms', 'memoria_mb'])
+        if not etapas.empty:
+            etapas['etapa'] = [' ' * p + e for p, e in zip(etapas['profundidade'], etapas['etapa'])]
+            st.dataframe(etapas.drop(columns='profundidade').style.format({'duracao_ms': '{:.1f}', 'memoria_mb': '{:+.1f}'}, na_rep='-'),
+                         hide_index=True, width='stretch')
+        if registro.get('memoria_processo_mb') is not None:
+            st.caption(f"Memória do processo: {registro['memoria_processo_mb']:.0f} MB")
+        for chave, valor in registro.items():
+            if isinstance(valor, dict):
+                st.caption(chave)
+                st.json(valor, expanded=False)
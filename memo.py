@@ -0,0 +1,109 @@
+"""Memoização por sessão dos resultados das páginas.
+
+Cada interação na barra lateral reexecuta o script inteiro. Os resultados de
+cada página ficam guardados por ``(versão dos dados, página, parâmetros)`` em
+um LRU da sessão, limitado pela memória estimada dos resultados (variável de
+ambiente ``DASHBOARD_MEMO_MB``): voltar a um Top X ou estado já visto não
+recalcula nada, e os resultados menos usados são descartados quando o limite
+é atingido. Os resultados são compartilhados entre reruns e devem ser tratados
+como somente leitura.
+"""
+import os
+import sys
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from dataset import uso_memoria
+
+LIMITE_MEMO_MB = float(os.environ.get('DASHBOARD_MEMO_MB', 64))
+
+CHAVE_SESSAO = '_memo_analises'
+
+
+def tamanho_em_bytes(valor):
+    """Estimativa da memória ocupada por um resultado (frames, séries, arrays e coleções deles)."""
+    if isinstance(valor, pd.DataFrame):
+        return uso_memoria(valor)
+    if isinstance(valor, (pd.Series, pd.Index)):
+        return int(valor.memory_usage(deep=True))
+    if isinstance(valor, np.ndarray):
+        return valor.nbytes
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_em_bytes(v) for v in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(tamanho_em_bytes(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+def _congelar(valor):
+    """Versão hashable de um parâmetro (listas viram tuplas)."""
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+def chave_parametros(parametros):
+    return tuple(sorted((nome, _congelar(valor)) for nome, valor in parametros.items()))
+
+
+class MemoLRU:
+    """Cache LRU limitado pela memória estimada das entradas, com contadores de acertos e faltas."""
+
+    def __init__(self, limite_bytes):
+        self.limite_bytes = limite_bytes
+        self._entradas = OrderedDict()
+        self.bytes = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.descartes = 0
+
+    def obter(self, chave, calcular):
+        """Valor de ``chave``, calculado com ``calcular()`` se ainda não estiver guardado."""
+        if chave in self._entradas:
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return self._entradas[chave][0]
+
+        self.faltas += 1
+        valor = calcular()
+        tamanho = tamanho_em_bytes(valor)
+        # Uma entrada maior que o limite inteiro não é guardada, para não esvaziar o cache por nada
+        if tamanho <= self.limite_bytes:
+            self._entradas[chave] = (valor, tamanho)
+            self.bytes += tamanho
+            while self.bytes > self.limite_bytes:
+                _, (_, tamanho_antigo) = self._entradas.popitem(last=False)
+                self.bytes -= tamanho_antigo
+                self.descartes += 1
+        return valor
+
+    def limpar(self):
+        self._entradas.clear()
+        self.bytes = 0
+
+    def estatisticas(self):
+        consultas = self.acertos + self.faltas
+        return {
+            'entradas': len(self._entradas),
+            'memoria_mb': self.bytes / 2**20,
+            'limite_mb': self.limite_bytes / 2**20,
+            'acertos': self.acertos,
+            'faltas': self.faltas,
+            'descartes': self.descartes,
+            'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+        }
+
+    def __repr__(self):
+        estatisticas = self.estatisticas()
+        return (f"MemoLRU(entradas={estatisticas['entradas']}, memoria_mb={estatisticas['memoria_mb']:.1f}, "
+                f"acertos={self.acertos}, faltas={self.faltas}, descartes={self.descartes})")
+
+
+def memo_da_sessao():
+    """LRU de resultados da sessão atual do Streamlit, criado no primeiro uso."""
+    if CHAVE_SESSAO not in st.session_state:
+        st.session_state[CHAVE_SESSAO] = MemoLRU(int(LIMITE_MEMO_MB * 2**20))
+    return st.session_state[CHAVE_SESSAO]
@@ -0,0 +1,265 @@
+"""Motor de consultas opcional em DuckDB para os joins e groupbys pesados.
+
+Com ``DASHBOARD_MOTOR=duckdb`` (e o pacote ``duckdb`` instalado), as páginas de
+faturamento, cancelamento e atrasos calculam suas agregações como consultas SQL
+em um DuckDB embutido no processo: os frames do :class:`~dataset.Dataset` são
+registrados sem cópia, a consulta roda vetorizada e em todos os núcleos, e só
+as tabelas pequenas de resultado voltam para o pandas, sem materializar os
+merges de itens x pedidos x estoque.
+
+As funções devolvem os mesmos dicionários das equivalentes de :mod:`analises`.
+Sem o ``duckdb`` instalado, o dashboard continua no pandas.
+"""
+import importlib.util
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from analises import TODOS_OS_ESTADOS, tabelas_atraso
+from cobertura import calcular_cobertura, top_criticos
+from dataset import HASH_DATASET, VERSOES_EM_CACHE
+from financeiro import calcular_financeiro_pedidos
+from instrumentacao import cronometrado
+
+
+def disponivel():
+    """``True`` se o pacote ``duckdb`` estiver instalado."""
+    return importlib.util.find_spec('duckdb') is not None
+
+
+class ConexaoDuckDB:
+    """Banco DuckDB em memória com as tabelas do dashboard registradas.
+
+    Tabelas registradas só são visíveis na própria conexão, então as consultas
+    das sessões são serializadas por um lock; cada consulta em si usa todas as
+    threads do DuckDB.
+    """
+
+    def __init__(self, tabelas=None, comandos=()):
+        import duckdb
+
+        self._con = duckdb.connect()
+        self._lock = threading.Lock()
+        for nome, df in (tabelas or {}).items():
+            self._con.register(nome, df)
+        for comando in comandos:
+            self._con.execute(comando)
+
+    def consultar(self, sql, parametros=None, **temporarias):
+        """Executa ``sql`` e devolve o resultado como DataFrame.
+
+        ``temporarias`` são frames pequenos (por exemplo, a lista de materiais
+        críticos) registrados apenas durante esta consulta.
+        """
+        with self._lock:
+            for nome, df in temporarias.items():
+                self._con.register(nome, df)
+            try:
+                return self._con.execute(sql, parametros or []).df()
+            finally:
+                for nome in temporarias:
+                    self._con.unregister(nome)
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('conexao_dataset')
+def conexao_dataset(dataset):
+    """Conexão com os frames do dataset e as tabelas derivadas em cache registrados (uma por versão)."""
+    df_financeiro = calcular_financeiro_pedidos(dataset)
+    return ConexaoDuckDB({
+        'pedidos': dataset.pedidos,
+        'itens': dataset.itens,
+        'supply': dataset.supply,
+        'financeiro': df_financeiro[['order_id', 'created_at', 'desconto_calculado']],
+        'cobertura': calcular_cobertura(dataset)[['material_id', 'quantity']],
+    })
+
+
+def _literal(caminho):
+    return "'" + str(caminho).replace("'", "''") + "'"
+
+
+def conexao_parquet(fontes):
+    """Conexão sobre arquivos Parquet (``fontes['pedidos']``, ``fontes['itens']`` e, opcionalmente, ``'supply'``).
+
+    Os arquivos são lidos pelo próprio DuckDB, sem passar pelo pandas; serve às
+    consultas de faturamento e atrasos sobre bases maiores que a memória.
+    """
+    import pyarrow.parquet as pq
+
+    # Os snapshots guardam a chave dos pedidos como ``id``, como nas planilhas
+    chave = 'id AS order_id, * EXCLUDE (id)' if 'id' in pq.read_schema(fontes['pedidos']).names else '*'
+    comandos = [
+        f"CREATE VIEW pedidos AS SELECT {chave} FROM read_parquet({_literal(fontes['pedidos'])})",
+        f"CREATE VIEW itens AS SELECT * FROM read_parquet({_literal(fontes['itens'])})",
+        # Mesma regra de calcular_financeiro_pedidos, materializada uma vez. FSUM
+        # (soma compensada, como a do pandas) evita que pedidos sem desconto caiam
+        # em -1e-14 e saiam do filtro de desconto válido
+        """
+        CREATE TABLE financeiro AS
+        WITH soma AS (
+            SELECT order_id, FSUM(price) AS soma_precos_itens FROM itens GROUP BY order_id
+        )
+        SELECT p.order_id, p.created_at,
+               (1 - p."Valor de NF (R$)" / (COALESCE(s.soma_precos_itens, 0) + p."Frete Cobrado do Cliente (R$)")) * 100 AS desconto_calculado
+        FROM pedidos p LEFT JOIN soma s ON p.order_id = s.order_id
+        WHERE COALESCE(s.soma_precos_itens, 0) + p."Frete Cobrado do Cliente (R$)" > 0
+        """,
+    ]
+    if 'supply' in fontes:
+        comandos.append(f"CREATE VIEW supply AS SELECT * FROM read_parquet({_literal(fontes['supply'])})")
+    return ConexaoDuckDB(comandos=comandos)
+
+
+def _filtro_periodo(coluna, periodo):
+    """Condição SQL e parâmetros para dias entre ``inicio`` e ``fim`` (inclusivos), como em ``IndiceDatas.fatiar``."""
+    if periodo is None:
+        return 'TRUE', []
+    inicio, fim = periodo
+    return f'{coluna} >= ? AND {coluna} < ?', [pd.Timestamp(inicio), pd.Timestamp(fim) + pd.Timedelta(days=1)]
+
+
+# --- CONSULTAS ---
+
+def consultar_faturamento(conexao, periodo=None, calcular_com_desconto=False):
+    """Faturamento e ticket médio por categoria e produto (ver :func:`analises.analisar_faturamento`)."""
+    filtro, parametros = _filtro_periodo('created_at', periodo)
+    validos = f"""
+        SELECT order_id, desconto_calculado FROM financeiro
+        WHERE desconto_calculado >= 0 AND desconto_calculado <= 100 AND {filtro}
+    """
+
+    resumo = conexao.consultar(f"""
+        SELECT (SELECT COUNT(*) FROM ({validos})) AS pedidos_validos,
+               (SELECT SUM("Valor de NF (R$)") FROM pedidos WHERE {filtro}) AS faturamento_total
+    """, parametros + parametros)
+    if resumo['pedidos_validos'].iloc[0] == 0:
+        return {'vazio': True}
+
+    faturamento = 'i.price * (1 - v.desconto_calculado/100)' if calcular_com_desconto else 'i.price'
+    agregado = conexao.consultar(f"""
+        SELECT material_category, material_name, GROUPING(material_category) AS por_produto,
+               SUM(faturamento) AS faturamento, COUNT(DISTINCT order_id) AS pedidos
+        FROM (
+            SELECT i.material_category, i.material_name, i.order_id, {faturamento} AS faturamento
+            FROM itens i JOIN ({validos}) v ON i.order_id = v.order_id
+        )
+        GROUP BY GROUPING SETS ((material_category), (material_name))
+    """, parametros)
+
+    # Como no groupby do pandas, grupos com chave nula ficam de fora
+    por_categoria = agregado[(agregado['por_produto'] == 0) & agregado['material_category'].notna()].set_index('material_category')
+    por_produto = agregado[(agregado['por_produto'] == 1) & agregado['material_name'].notna()].set_index('material_name')
+    preco_por_categoria = por_categoria['faturamento'].sort_values(ascending=False)
+    preco_por_nome = por_produto['faturamento'].sort_values(ascending=False)
+
+    total = resumo['faturamento_total'].iloc[0]
+    return {
+        'vazio': False,
+        'faturamento_total': float(total) if pd.notna(total) else 0.0,
+        'preco_por_categoria': preco_por_categoria,
+        'preco_por_nome': preco_por_nome,
+        'ticket_medio_categoria': (preco_por_categoria / por_categoria['pedidos']).round(2).sort_values(ascending=False),
+        'ticket_medio_produto': (preco_por_nome / por_produto['pedidos']).round(2).sort_values(ascending=False),
+    }
+
+
+def consultar_itens_atrasados(conexao, ids_pedidos_atrasados, estoque_critico_limite=10):
+    """Itens dos pedidos atrasados cruzados com o estoque total de cada material."""
+    por_produto = conexao.consultar("""
+        WITH estoque AS (
+            SELECT material_id, material_name, SUM(quantity) AS quantity
+            FROM supply GROUP BY material_id, material_name
+        ),
+        itens_atrasados AS (
+            SELECT i.material_name, COALESCE(e.quantity, 0) AS quantity
+            FROM itens i
+            JOIN (SELECT DISTINCT order_id FROM atrasados) a ON i.order_id = a.order_id
+            LEFT JOIN estoque e ON i.material_id = e.material_id AND i.material_name = e.material_name
+        )
+        SELECT material_name,
+               COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE quantity = 0) AS zerado,
+               COUNT(*) FILTER (WHERE quantity > 0 AND quantity <= ?) AS critico
+        FROM itens_atrasados
+        GROUP BY material_name
+    """, [estoque_critico_limite], atrasados=pd.DataFrame({'order_id': ids_pedidos_atrasados}))
+
+    def ranking(coluna):
+        contagem = por_produto[por_produto[coluna] > 0].dropna(subset=['material_name']).set_index('material_name')[coluna]
+        return contagem.rename('count').sort_values(ascending=False)
+
+    total_itens_atrasados = int(por_produto['total'].sum())
+    qtd_zerado = int(por_produto['zerado'].sum())
+    qtd_critico = int(por_produto['critico'].sum())
+    return {
+        'total_itens_atrasados': total_itens_atrasados,
+        'qtd_zerado': qtd_zerado,
+        'qtd_critico': qtd_critico,
+        'perc_zerado': (qtd_zerado / total_itens_atrasados * 100) if total_itens_atrasados > 0 else 0,
+        'perc_critico': (qtd_critico / total_itens_atrasados * 100) if total_itens_atrasados > 0 else 0,
+        'ranking_zerado': ranking('zerado'),
+        'ranking_critico': ranking('critico'),
+    }
+
+
+# --- ANÁLISES DO DASHBOARD ---
+
+def analisar_faturamento(dataset, periodo=None, calcular_com_desconto=False):
+    """Versão em DuckDB de :func:`analises.analisar_faturamento`."""
+    return consultar_faturamento(conexao_dataset(dataset), periodo, calcular_com_desconto)
+
+
+def analisar_cancelamento(dataset, X=20):
+    """Versão em DuckDB de :func:`analises.analisar_cancelamento`."""
+    conexao = conexao_dataset(dataset)
+    criticos = top_criticos(calcular_cobertura(dataset), X)[['material_id']]
+
+    por_status = conexao.consultar("""
+        SELECT p."Status do Pedido" AS status,
+               AVG(CASE WHEN COALESCE(c.quantity, 0) = 0 THEN 1 ELSE 0 END) * 100 AS ruptura,
+               AVG(CASE WHEN k.material_id IS NOT NULL THEN 1 ELSE 0 END) * 100 AS critico
+        FROM itens i
+        JOIN pedidos p ON i.order_id = p.order_id
+        LEFT JOIN cobertura c ON i.material_id = c.material_id
+        LEFT JOIN (SELECT DISTINCT material_id FROM criticos) k ON i.material_id = k.material_id
+        WHERE p."Status do Pedido" IS NOT NULL
+        GROUP BY p."Status do Pedido"
+        ORDER BY status
+    """, criticos=criticos).set_index('status').rename_axis('Status do Pedido')
+
+    cancelados = conexao.consultar("""
+        SELECT material_name, material_category, GROUPING(material_name) AS por_categoria, COUNT(*) AS n
+        FROM itens
+        WHERE aasm_state = 'canceled'
+        GROUP BY GROUPING SETS ((material_name, material_category), (material_category))
+    """)
+    por_categoria = cancelados[(cancelados['por_categoria'] == 1) & cancelados['material_category'].notna()]
+    por_produto = cancelados[(cancelados['por_categoria'] == 0)].dropna(subset=['material_name', 'material_category'])
+
+    df_cancel_prod = por_produto.sort_values('n', ascending=False)[['material_name', 'material_category', 'n']].reset_index(drop=True)
+    df_cancel_prod.columns = ['Produto', 'Categoria', 'Número de Cancelamentos']
+    return {
+        'taxa_ruptura': por_status['ruptura'].rename('Taxa de Ruptura (%)'),
+        'taxa_critico': por_status['critico'].rename('Taxa de Estoque Crítico (%)'),
+        'cancelamentos_categoria': por_categoria.set_index('material_category')['n'].rename('count').sort_values(ascending=False),
+        'cancelamentos_produto': df_cancel_prod,
+    }
+
+
+def analisar_atraso(dataset, estado_selecionado=TODOS_OS_ESTADOS, estoque_critico_limite=10):
+    """Versão em DuckDB de :func:`analises.analisar_atraso`."""
+    # As tabelas por estado e transportadora só envolvem os pedidos e continuam no pandas
+    tabelas, ids_pedidos_atrasados = tabelas_atraso(dataset, estado_selecionado)
+    return {
+        **tabelas,
+        **consultar_itens_atrasados(conexao_dataset(dataset), ids_pedidos_atrasados, estoque_critico_limite),
+    }
+
+
+ANALISES_DUCKDB = {
+    'faturamento': analisar_faturamento,
+    'cancelamento': analisar_cancelamento,
+    'atraso': analisar_atraso,
+}
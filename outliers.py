@@ -0,0 +1,101 @@
+"""Filtro dos dias outliers de vendas da página de descontos.
+
+Um dia é outlier quando tem mais pedidos que o limite do método escolhido:
+
+- ``quantil``: o percentil ``limiar`` da série de pedidos por dia (o mesmo
+  ``Series.quantile``, com interpolação linear);
+- ``iqr``: ``Q3 + limiar * (Q3 - Q1)``;
+- ``mad``: ``mediana + limiar * 1,4826 * MAD``, o desvio absoluto mediano na
+  escala do desvio padrão.
+
+Os pedidos por dia são ordenados uma vez por versão dos dados
+(:func:`construir_filtro_outliers`), junto com as somas acumuladas do desconto
+e dos pedidos nessa ordem (:func:`correlacoes.somas_pares`). Os dias mantidos
+por um limite são então um prefixo da ordem: o número deles sai de uma busca
+binária, e o desconto médio e a correlação de Pearson dos dias mantidos, das
+somas acumuladas nesse ponto. Mover o slider não filtra nem reordena as séries.
+"""
+import numpy as np
+import streamlit as st
+
+from correlacoes import pearson_das_somas, somas_pares
+from dataset import HASH_DATASET, VERSOES_EM_CACHE
+from instrumentacao import cronometrado
+from rollup import calcular_rollup_diario, serie_desconto_medio
+
+METODOS = {
+    'quantil': 'Percentil',
+    'iqr': 'Intervalo interquartil (IQR)',
+    'mad': 'Desvio absoluto mediano (MAD)',
+}
+METODO_PADRAO = 'quantil'
+LIMIAR_PADRAO = {'quantil': 98.0, 'iqr': 1.5, 'mad': 3.5}
+# Mínimo, máximo e passo do slider de cada método
+FAIXA_LIMIAR = {'quantil': (80.0, 100.0, 0.5), 'iqr': (0.5, 5.0, 0.1), 'mad': (1.0, 10.0, 0.5)}
+
+# MAD x 1,4826 estima o desvio padrão em dados normais
+ESCALA_MAD = 1.4826
+
+
+def _quantil_ordenado(ordenados, q):
+    """Quantil ``q`` (entre 0 e 1) de valores já ordenados, com a interpolação linear do pandas."""
+    if len(ordenados) == 0:
+        return float('nan')
+    posicao = (len(ordenados) - 1) * q
+    abaixo = int(np.floor(posicao))
+    acima = min(abaixo + 1, len(ordenados) - 1)
+    return float(ordenados[abaixo] + (posicao - abaixo) * (ordenados[acima] - ordenados[abaixo]))
+
+
+class FiltroOutliers:
+    """Pedidos por dia ordenados e as somas acumuladas para filtrar por qualquer limite sem refazer as séries."""
+
+    def __init__(self, serie_desconto, serie_pedidos):
+        pedidos = serie_pedidos.to_numpy(dtype=float)
+        ordem = np.argsort(pedidos, kind='stable')
+        self.pedidos_ordenados = pedidos[ordem]
+        self.total_dias = len(pedidos)
+
+        self.mediana = _quantil_ordenado(self.pedidos_ordenados, 0.5)
+        self.q1 = _quantil_ordenado(self.pedidos_ordenados, 0.25)
+        self.q3 = _quantil_ordenado(self.pedidos_ordenados, 0.75)
+        self.mad = float(np.median(np.abs(pedidos - self.mediana))) if self.total_dias else float('nan')
+
+        # Somas acumuladas na ordem dos pedidos: os dias mantidos por um limite são um prefixo
+        self._acumuladas, (self._centro_desconto, _) = somas_pares(
+            serie_desconto.to_numpy(dtype=float)[ordem], self.pedidos_ordenados, acumular=True
+        )
+
+    def limite(self, metodo=METODO_PADRAO, limiar=None):
+        """Número de pedidos acima do qual um dia é outlier pelo ``metodo`` (``limiar`` padrão do método se ``None``)."""
+        if metodo not in METODOS:
+            raise ValueError(f"Método de outliers desconhecido: {metodo!r} (use um de {', '.join(METODOS)})")
+        if limiar is None:
+            limiar = LIMIAR_PADRAO[metodo]
+        if metodo == 'quantil':
+            return _quantil_ordenado(self.pedidos_ordenados, limiar / 100)
+        if metodo == 'iqr':
+            return self.q3 + limiar * (self.q3 - self.q1)
+        return self.mediana + limiar * ESCALA_MAD * self.mad
+
+    def dias_mantidos(self, limite):
+        """Número de dias com até ``limite`` pedidos (busca binária nos pedidos ordenados)."""
+        return int(np.searchsorted(self.pedidos_ordenados, limite, side='right'))
+
+    def resumo(self, limite=None):
+        """Dias removidos, desconto médio e correlação de Pearson dos dias com até ``limite`` pedidos (todos, se ``None``)."""
+        mantidos = self.total_dias if limite is None else self.dias_mantidos(limite)
+        somas = self._acumuladas[:, mantidos]
+        com_desconto, soma_desconto = somas[0], somas[1]
+        return {
+            'dias_removidos': self.total_dias - mantidos,
+            'desconto_medio': float(self._centro_desconto + soma_desconto / com_desconto) if com_desconto else float('nan'),
+            'correlacao': float(pearson_das_somas(somas)),
+        }
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('construir_filtro_outliers')
+def construir_filtro_outliers(dataset):
+    """Filtro de outliers da versão dos dados (compartilhado entre sessões, somente leitura)."""
+    return FiltroOutliers(*serie_desconto_medio(calcular_rollup_diario(dataset)))
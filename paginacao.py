@@ -0,0 +1,77 @@
+"""Busca, ordenação e paginação de tabelas no servidor.
+
+As tabelas grandes das páginas (faturamento por produto, cancelamentos por
+produto, distribuição do estoque) têm uma linha por SKU. Em vez de serializar
+o frame inteiro para o navegador a cada rerun, o filtro de busca e a ordenação
+são aplicados aqui, sobre o resultado já ordenado da análise, e só as linhas
+da página visível são enviadas. Nada aqui chama ``st.*``; o componente fica em
+:func:`paginas.comum.exibir_tabela_paginada`.
+"""
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+LINHAS_POR_PAGINA = int(os.environ.get('DASHBOARD_LINHAS_POR_PAGINA', 50))
+
+
+def como_frame(dados, colunas=None):
+    """Frame a partir de um frame ou de uma série (o índice vira coluna), com os nomes de ``colunas``."""
+    if isinstance(dados, pd.Series):
+        dados = dados.reset_index()
+    if colunas is not None:
+        dados = dados.set_axis(colunas, axis=1)
+    return dados
+
+
+def _contem(serie, termo):
+    """Máscara das linhas cujo texto contém ``termo`` (sem diferenciar maiúsculas)."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # Busca nas categorias, uma vez cada, e mapeia pelos códigos
+        categorias = serie.cat.categories.astype(str).str.contains(termo, case=False, regex=False)
+        codigos = serie.cat.codes.to_numpy()
+        return np.append(categorias, False)[codigos]
+    return serie.astype(str).str.contains(termo, case=False, regex=False, na=False).to_numpy()
+
+
+def filtrar_e_ordenar(df, termo='', colunas_busca=None, coluna_ordem=None, decrescente=False):
+    """Posições das linhas de ``df`` que contêm ``termo`` em ``colunas_busca``, na ordem pedida.
+
+    Sem termo e sem coluna de ordenação, devolve ``None``: a ordem do próprio
+    resultado vale e não há nada a calcular. A ordenação é estável e deixa os
+    valores ausentes no fim.
+    """
+    termo = termo.strip()
+    if not termo and coluna_ordem is None:
+        return None
+
+    posicoes = np.arange(len(df))
+    if termo:
+        colunas = colunas_busca if colunas_busca is not None else list(df.columns)
+        mascara = np.zeros(len(df), dtype=bool)
+        for coluna in colunas:
+            mascara |= _contem(df[coluna], termo)
+        posicoes = posicoes[mascara]
+
+    if coluna_ordem is not None:
+        valores = df[coluna_ordem].iloc[posicoes]
+        if isinstance(valores.dtype, pd.CategoricalDtype):
+            # Ordem alfabética, não a ordem das categorias (ausentes continuam ausentes)
+            valores = valores.astype(str)
+        ordem = valores.reset_index(drop=True).sort_values(ascending=not decrescente, kind='stable', na_position='last').index
+        posicoes = posicoes[ordem.to_numpy()]
+    return posicoes
+
+
+def numero_de_paginas(total, linhas_por_pagina=LINHAS_POR_PAGINA):
+    return max(1, math.ceil(total / linhas_por_pagina))
+
+
+def fatiar_pagina(df, posicoes, pagina, linhas_por_pagina=LINHAS_POR_PAGINA):
+    """Linhas da ``pagina`` (a partir de 1) de ``df``, na ordem de ``posicoes`` (ou na do frame, se ``None``)."""
+    inicio = (pagina - 1) * linhas_por_pagina
+    fim = inicio + linhas_por_pagina
+    if posicoes is None:
+        return df.iloc[inicio:fim]
+    return df.iloc[posicoes[inicio:fim]]
@@ -0,0 +1,70 @@
+"""Páginas do dashboard, importadas só quando abertas.
+
+Cada página é um módulo deste pacote com uma função ``renderizar``, que recebe
+o dataset, exceto as de :data:`PAGINAS_SEM_DADOS`. O módulo de uma página (e,
+com ele, pandas, as análises e as bibliotecas de gráficos) só é importado na
+primeira vez em que ela é aberta no processo; a página inicial não importa
+nada além do Streamlit nem carrega os dados.
+
+Depois de cada página, os resultados padrão das demais são pré-calculados em
+segundo plano (:mod:`aquecimento`); na página inicial, a importação das
+análises e a carga dos dados também ficam em segundo plano.
+"""
+import importlib
+import threading
+
+from instrumentacao import etapa
+
+PAGINA_INICIAL = 'home'
+
+# Nome da página em ``st.session_state.page`` -> módulo do pacote
+PAGINAS = {
+    'home': 'inicio',
+    'pedidos': 'pedidos',
+    'descontos': 'descontos',
+    'faturamento': 'faturamento',
+    'cancelamento': 'cancelamento',
+    'estoque': 'estoque',
+    'atraso': 'atraso',
+}
+
+PAGINAS_SEM_DADOS = {'home'}
+
+
+def modulo_pagina(nome):
+    """Módulo da página ``nome`` (importado na primeira chamada)."""
+    with etapa(f'importar:{nome}'):
+        return importlib.import_module(f'{__name__}.{PAGINAS[nome]}')
+
+
+def _aquecer(dataset=None):
+    import aquecimento
+
+    if not aquecimento.ATIVO:
+        return
+    if dataset is None:
+        from incremental import carregar_dataset_atualizado
+
+        aquecimento.aquecedor().carregar_e_aquecer(carregar_dataset_atualizado)
+    else:
+        aquecimento.aquecedor().aquecer(dataset)
+
+
+def renderizar_pagina(nome):
+    """Renderiza a página ``nome``, carregando o dataset só se ela o usa, e agenda o aquecimento."""
+    if nome not in PAGINAS:
+        nome = PAGINA_INICIAL
+    pagina = modulo_pagina(nome)
+    if nome in PAGINAS_SEM_DADOS:
+        pagina.renderizar()
+        # Enquanto o usuário escolhe uma página, os dados são carregados e as páginas, pré-calculadas
+        threading.Thread(target=_aquecer, name='aquecimento-carga', daemon=True).start()
+        return
+
+    from incremental import carregar_dataset_atualizado
+
+    with etapa('carga'):
+        dataset = carregar_dataset_atualizado()
+    pagina.renderizar(dataset)
+    # Depois da página aberta, para não disputar com o cálculo dela
+    _aquecer(dataset)
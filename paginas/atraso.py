@@ -0,0 +1,130 @@
+"""Página de atrasos na entrega e impacto do estoque."""
+import streamlit as st
+
+import graficos
+from analises import TODOS_OS_ESTADOS, estados_disponiveis, executar_analise
+from instrumentacao import cronometrado
+from memo import memo_da_sessao
+from paginas.comum import add_back_to_home_button, exibir_tabela
+
+
+@cronometrado('pagina:atraso')
+def renderizar(dataset):
+    """Renderiza a página de análise de atrasos na entrega."""
+    add_back_to_home_button()
+
+    st.header("Análise de Atrasos na Entrega e Impacto do Estoque")
+    st.write(
+        "Esta página analisa a performance logística, identificando os estados e transportadoras com maiores taxas de atraso, "
+        "e investiga a correlação entre os atrasos e a disponibilidade de estoque (ruptura ou estoque crítico)."
+    )
+
+    # --- CONTROLES INTERATIVOS NA BARRA LATERAL ---
+    st.sidebar.header("Opções de Análise de Atraso")
+
+    # Filtro de Estado
+    estado_selecionado = st.sidebar.selectbox(
+        "Selecione um Estado para análise detalhada:",
+        options=estados_disponiveis(dataset)
+    )
+
+    # Slider para Top X
+    top_x = st.sidebar.slider(
+        "Selecione o Top X para rankings de produtos:",
+        min_value=3, max_value=20, value=5
+    )
+    
+    # Slider para Limite de Estoque Crítico
+    estoque_critico_limite = st.sidebar.slider(
+        "Defina o limite para Estoque Crítico (unidades):",
+        min_value=1, max_value=50, value=10
+    )
+
+    resultado = executar_analise(
+        'atraso', dataset, memo=memo_da_sessao(), estado_selecionado=estado_selecionado, estoque_critico_limite=estoque_critico_limite
+    )
+
+    # --- SEÇÃO 1: ANÁLISE GERAL DE ATRASOS POR ESTADO ---
+    st.subheader("Performance Logística por Estado")
+    df_analise_atrasos = resultado['analise_estados']
+
+    _, col0, _ = st.columns([1, 3, 1])
+        
+    with col0:
+        graficos.barras_horizontais(
+            df_analise_atrasos['Percentual de Atraso (%)'], 'Percentual de Atraso por Estado',
+            'Percentual de Atraso (%)', 'Estado', formato_rotulo='{:.1f}%', tamanho=(10, 8),
+            chave=('atraso', estado_selecionado, dataset.versao)
+        )
+
+    with st.expander("Clique para ver a tabela detalhada de performance por Estado"):
+        exibir_tabela(df_analise_atrasos.style.format({
+            'Percentual de Atraso (%)': '{:.2f}%',
+            'Tempo Médio de Entrega (dias)': '{:.1f}',
+            'Pedidos Atrasados': '{:.0f}'
+        }), use_container_width=True)
+
+    st.write("---")
+
+    # --- NOVA SEÇÃO: ANÁLISE POR TRANSPORTADORA ---
+    st.subheader(f"Performance por Transportadora em '{estado_selecionado}'")
+    df_analise_transp = resultado['analise_transportadoras']
+
+    _, col00, _ = st.columns([1, 3, 1])
+    with col00:
+        # Gráfico de Atraso por Transportadora
+        graficos.barras_horizontais(
+            df_analise_transp['Percentual de Atraso (%)'], f"Percentual de Atraso por Transportadora em {estado_selecionado}",
+            'Percentual de Atraso (%)', 'Transportadora', formato_rotulo='{:.1f}%', tamanho=(12, 6),
+            chave=('atraso', estado_selecionado, dataset.versao)
+        )
+
+    # Tabela detalhada por Estado/Transportadora se a visão for geral
+    if estado_selecionado == TODOS_OS_ESTADOS:
+        with st.expander("Clique para ver a tabela detalhada de performance por Estado e Transportadora"):
+            exibir_tabela(resultado['analise_regional'].style.format({
+                'Percentual de Atraso (%)': '{:.2f}%'}),
+                # 'Pedidos Atrasados': '{:.0f}',
+                use_container_width=True)
+    else:
+        with st.expander("Clique para ver a tabela detalhada de performance por Transportadora"):
+            exibir_tabela(df_analise_transp.style.format({'Percentual de Atraso (%)': '{:.2f}%'}), use_container_width=True)
+
+
+    st.write("---")
+
+    # --- SEÇÃO 3: CORRELAÇÃO ENTRE ATRASOS E ESTOQUE ---
+    st.subheader(f"Análise da Relação entre Atrasos e Estoque em '{estado_selecionado}'")
+
+    total_itens_atrasados = resultado['total_itens_atrasados']
+
+    # Exibição com st.metric
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(
+            label="Itens em Pedidos Atrasados com Estoque Zerado",
+            value=f"{resultado['perc_zerado']:.1f}%",
+            help=f"{resultado['qtd_zerado']} de {total_itens_atrasados} itens"
+        )
+    with col2:
+        st.metric(
+            label=f"Itens em Pedidos Atrasados com Estoque Crítico (≤ {estoque_critico_limite} un.)",
+            value=f"{resultado['perc_critico']:.1f}%",
+            help=f"{resultado['qtd_critico']} de {total_itens_atrasados} itens"
+        )
+        
+    st.info("Estes cartões mostram a porcentagem de itens, dentro dos pedidos já atrasados, que também enfrentavam problemas de estoque no momento da análise.")
+
+    # Tabelas de Top X produtos problemáticos
+    col3, col4 = st.columns(2)
+    with col3:
+        st.write(f"**Top {top_x} Produtos com Estoque Zerado em Pedidos Atrasados**")
+        df_top_zerado = resultado['ranking_zerado'].head(top_x).reset_index()
+        df_top_zerado.columns = ['Produto', 'Nº de Ocorrências em Atrasos']
+        exibir_tabela(df_top_zerado, use_container_width=True)
+
+    with col4:
+        st.write(f"**Top {top_x} Produtos com Estoque Crítico em Pedidos Atrasados**")
+        df_top_critico = resultado['ranking_critico'].head(top_x).reset_index()
+        df_top_critico.columns = ['Produto', 'Nº de Ocorrências em Atrasos']
+        exibir_tabela(df_top_critico, use_container_width=True)
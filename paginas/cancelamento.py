@@ -0,0 +1,75 @@
+"""Página de causas de cancelamento."""
+import streamlit as st
+
+import graficos
+from analises import executar_analise
+from instrumentacao import cronometrado
+from memo import memo_da_sessao
+from paginas.comum import add_back_to_home_button, exibir_tabela_paginada
+
+
+@cronometrado('pagina:cancelamento')
+def renderizar(dataset):
+    """Renderiza a página de análise de correlação entre supply e cancelamentos."""
+    add_back_to_home_button()
+    st.header("Análise de Causas de Cancelamento")
+    st.write("Esta análise investiga a correlação entre problemas de supply (estoque zerado ou crítico) e o cancelamento de pedidos.")
+
+    # --- CONTROLES NA BARRA LATERAL ---
+    st.sidebar.header("Opções de Análise")
+    X = st.sidebar.slider(
+        "Defina o Top X para considerar como 'Estoque Crítico':",
+        min_value=5, max_value=100, value=20
+    )
+
+    # --- CÁLCULOS E PREPARAÇÃO DE DADOS ---
+    resultado = executar_analise('cancelamento', dataset, memo=memo_da_sessao(), X=X)
+
+    # --- SEÇÃO 1: CORRELAÇÃO ENTRE ESTOQUE E CANCELAMENTOS ---
+    st.subheader("Impacto do Status do Estoque nos Pedidos")
+    
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.write("**Ruptura de Estoque (Estoque Zerado)**")
+        # Plotar o gráfico comparativo da taxa de ruptura
+        graficos.barras_verticais(
+            resultado['taxa_ruptura'],
+            'Taxa de Estoque Zerado por Status do Pedido', '', '% de Itens com Estoque Zerado',
+            formato_rotulo='{:.1f}%', chave=('cancelamento', dataset.versao)
+        )
+
+        st.info("Em cada Estado do item na Supply Chain, a quantidade de Produtos com Estoque Crítico.")
+
+    with col2:
+        st.write(f"**Estoque Crítico (Top {X} com menor cobertura)**")
+        # Plotar o gráfico comparativo da taxa de criticidade
+        graficos.barras_verticais(
+            resultado['taxa_critico'],
+            'Taxa de Estoque Crítico por Status do Pedido', '', '% de Itens em Estoque Crítico',
+            formato_rotulo='{:.1f}%', chave=('cancelamento', X, dataset.versao)
+        )
+
+        st.info("Em cada Estado do item na Supply Chain, a quantidade de Produtos Zerados.")
+
+    st.write("---")
+
+    # --- SEÇÃO 2: ANÁLISE DE VOLUME DE CANCELAMENTOS ---
+    st.subheader("Análise de Volume: O Que Está Sendo Mais Cancelado?")
+
+    col3, col4 = st.columns(2)
+    
+    with col3:
+        st.write("**Categorias com Mais Cancelamentos**")
+        # Gráfico de barras para categorias com mais cancelamentos
+        graficos.barras_horizontais(
+            resultado['cancelamentos_categoria'], 'Volume de Cancelamentos por Categoria',
+            'Número de Itens Cancelados', '', tamanho=(8, 8), chave=('cancelamento', dataset.versao)
+        )
+    
+    with col4:
+        st.write("**Produtos com Mais Cancelamentos**")
+        exibir_tabela_paginada(
+            resultado['cancelamentos_produto'], 'cancelamento_produtos', ('cancelamento', dataset.versao),
+            colunas_busca=['Produto', 'Categoria'], height=650, width='stretch'
+        )
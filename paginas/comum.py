@@ -0,0 +1,66 @@
+"""Elementos compartilhados pelas páginas de análise."""
+import streamlit as st
+
+from instrumentacao import etapa
+from memo import memo_da_sessao
+from paginacao import LINHAS_POR_PAGINA, como_frame, fatiar_pagina, filtrar_e_ordenar, numero_de_paginas
+
+
+def add_back_to_home_button():
+    """Adiciona um botão para voltar à página inicial."""
+    if st.button("⬅️ Voltar à Página Inicial"):
+        st.session_state.page = 'home'
+        st.rerun() # Força a re-execução do script para atualizar a página
+
+
+def exibir_tabela(dados, **opcoes):
+    """``st.dataframe`` medido como uma etapa: a serialização do frame para o navegador."""
+    with etapa('tabela'):
+        st.dataframe(dados, **opcoes)
+
+
+def exibir_tabela_paginada(dados, nome, chave, colunas=None, colunas_busca=None, preparar=None,
+                           linhas_por_pagina=LINHAS_POR_PAGINA, **opcoes):
+    """Tabela com busca, ordenação e paginação no servidor: só a página visível vai para o navegador.
+
+    ``dados`` é o frame ou série do resultado da análise, já na ordem padrão;
+    ``colunas`` renomeia as colunas (o índice de uma série vira a primeira).
+    ``nome`` identifica os controles na página e ``chave`` os dados (página,
+    parâmetros e versão, como nos gráficos): a ordem calculada para uma busca
+    fica no memo da sessão. ``preparar`` é aplicado só às linhas exibidas (por
+    exemplo, arredondar ou formatar com ``.style``). Tabelas que cabem em uma
+    página são exibidas inteiras, sem controles.
+    """
+    df = como_frame(dados, colunas)
+    preparar = preparar or (lambda pagina: pagina)
+    if len(df) <= linhas_por_pagina:
+        exibir_tabela(preparar(df), **opcoes)
+        return
+
+    coluna_busca, coluna_ordem, coluna_direcao, coluna_pagina = st.columns([3, 2, 1, 1], vertical_alignment='bottom')
+    termo = coluna_busca.text_input("Buscar", key=f'{nome}:busca', placeholder="Filtrar linhas...")
+    ordenar_por = coluna_ordem.selectbox("Ordenar por", ['(padrão)', *df.columns], key=f'{nome}:ordem')
+    decrescente = coluna_direcao.toggle("Decrescente", key=f'{nome}:decrescente')
+    ordenar_por = None if ordenar_por == '(padrão)' else ordenar_por
+
+    posicoes = None
+    if termo.strip() or ordenar_por is not None:
+        posicoes = memo_da_sessao().obter(
+            ('tabela', nome, chave, termo.strip().lower(), ordenar_por, decrescente),
+            lambda: filtrar_e_ordenar(df, termo, colunas_busca, ordenar_por, decrescente)
+        )
+    total = len(df) if posicoes is None else len(posicoes)
+
+    chave_pagina = f'{nome}:pagina'
+    paginas = numero_de_paginas(total, linhas_por_pagina)
+    # Uma busca pode deixar menos páginas do que a escolhida antes
+    if st.session_state.get(chave_pagina, 1) > paginas:
+        st.session_state[chave_pagina] = paginas
+    pagina = coluna_pagina.number_input("Página", min_value=1, max_value=paginas, step=1, key=chave_pagina)
+
+    exibir_tabela(preparar(fatiar_pagina(df, posicoes, pagina, linhas_por_pagina)), **opcoes)
+    if total == 0:
+        st.caption("Nenhuma linha encontrada.")
+        return
+    inicio = (pagina - 1) * linhas_por_pagina
+    st.caption(f"Linhas {min(inicio + 1, total)}–{min(inicio + linhas_por_pagina, total)} de {total} · página {pagina} de {paginas}")
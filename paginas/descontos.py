@@ -0,0 +1,118 @@
+"""Página de análise de descontos e correlação com as vendas."""
+import streamlit as st
+
+import graficos
+from analises import executar_analise
+from instrumentacao import cronometrado
+from memo import memo_da_sessao
+from outliers import FAIXA_LIMIAR, LIMIAR_PADRAO, METODOS
+from paginas.comum import add_back_to_home_button
+
+ROTULOS_LIMIAR = {
+    'quantil': "Percentil de corte (%)",
+    'iqr': "Multiplicador do IQR (Q3 + k × IQR)",
+    'mad': "MADs acima da mediana",
+}
+DESCRICOES_LIMIAR = {
+    'quantil': "acima do percentil {:g}",
+    'iqr': "acima de Q3 + {:g} × IQR",
+    'mad': "acima da mediana + {:g} MADs",
+}
+
+
+@cronometrado('pagina:descontos')
+def renderizar(dataset):
+    """Renderiza a página de análise de descontos."""
+    add_back_to_home_button()
+    st.header("Análise de Descontos e Correlação com Vendas")
+
+    st.sidebar.header("Opções de Análise de Desconto")
+
+    # Checkbox para controlar a remoção de outliers; o método e o limiar só aparecem com ela marcada
+    desconsiderar_outliers = st.sidebar.checkbox("Desconsiderar Outliers de Vendas (dias com pedidos acima do limite)")
+    parametros_outliers = {}
+    if desconsiderar_outliers:
+        metodo = st.sidebar.selectbox("Método de detecção", list(METODOS), format_func=METODOS.get)
+        minimo, maximo, passo = FAIXA_LIMIAR[metodo]
+        limiar = st.sidebar.slider(ROTULOS_LIMIAR[metodo], minimo, maximo, LIMIAR_PADRAO[metodo], passo, key=f'limiar_outliers:{metodo}')
+        parametros_outliers = {'metodo_outliers': metodo, 'limiar_outliers': limiar}
+    filtro = (desconsiderar_outliers, *parametros_outliers.values())
+
+    # --- CÁLCULOS ---
+    # Séries diárias (já sem os outliers, se pedido) lidas do cubo pré-agregado
+    resultado = executar_analise(
+        'descontos', dataset, memo=memo_da_sessao(), desconsiderar_outliers=desconsiderar_outliers, **parametros_outliers
+    )
+    serie_pedidos_final = resultado['serie_pedidos']
+    serie_desconto_final = resultado['serie_desconto']
+
+    if desconsiderar_outliers:
+        st.info(
+            f"Outliers desconsiderados ({DESCRICOES_LIMIAR[metodo].format(limiar)}). "
+            f"{resultado['dias_removidos']} dia(s) com mais de {resultado['limite_outlier']:.0f} pedidos foram removidos da análise; "
+            f"desconto médio nos dias restantes: {resultado['desconto_medio']:.2f}%."
+        )
+
+    # --- PLOTS E MÉTRICAS ---
+    col1, col2 = st.columns(2)
+
+    with col1:
+        graficos.linha_diaria(
+            serie_desconto_final, 'Desconto médio por dia', 'Dia', 'Valor do desconto (%)',
+            rotulo_media='Média: {:.2f}%', formato_data='%d-%b', tamanho=(8, 5),
+            chave=('descontos', *filtro, dataset.versao)
+        )
+
+    with col2:
+        graficos.regressao(
+            serie_desconto_final, serie_pedidos_final, 'Correlação Pedidos vs Desconto',
+            'Desconto médio (%)', 'Número de Pedidos', reta=resultado['reta_regressao'],
+            chave=('descontos', *filtro, dataset.versao)
+        )
+    
+    # Correlação com os dados finais (filtrados ou não)
+    corr = resultado['correlacao']
+    st.markdown(f"""
+<div style="text-align: center;">
+    <p style="font-size: 20px; margin-bottom: 0;">Coeficiente de Correlação de Pearson</p>
+    <p style="font-size: 12px; margin-bottom: 0;">Entre Pedidos e Desconto Médio por dia</p>
+    <p style="font-size: 36px; font-weight: bold;">{corr:.3f}</p>
+</div>
+""", unsafe_allow_html=True)
+
+    # --- CORRELAÇÕES DETALHADAS ---
+    # Já calculadas junto com a de Pearson: aqui só se escolhe o que exibir
+    st.subheader("Correlação ao Longo do Tempo, com Defasagem e por Categoria")
+    defasadas = resultado['correlacao_defasada'].dropna()
+
+    col1, col2 = st.columns(2)
+    col1.metric("Correlação de Spearman (postos)", f"{resultado['correlacao_spearman']:.3f}")
+    if not defasadas.empty:
+        melhor = defasadas.abs().idxmax()
+        col2.metric("Defasagem de maior correlação", f"{melhor} dia(s)", f"{defasadas[melhor]:.3f}", delta_color='off')
+
+    correlacao_movel = resultado['correlacao_movel']
+    janela = st.selectbox("Janela da correlação móvel", list(correlacao_movel.columns))
+    serie_movel = correlacao_movel[janela]
+    if serie_movel.notna().any():
+        graficos.linha_diaria(
+            serie_movel, f'Correlação de Pearson em janelas de {janela}', 'Último dia da janela', 'Correlação',
+            rotulo_media='Média: {:.3f}', formato_data='%d-%b', tamanho=(12, 4),
+            chave=('descontos', *filtro, janela, dataset.versao)
+        )
+    else:
+        st.info(f"Não há janelas de {janela} consecutivos com dados no período.")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        graficos.barras_verticais(
+            defasadas, 'Correlação com os pedidos k dias depois', 'Defasagem (dias)', 'Correlação',
+            formato_rotulo='{:.3f}', chave=('descontos', *filtro, dataset.versao)
+        )
+
+    with col2:
+        graficos.barras_horizontais(
+            resultado['correlacao_categorias'].dropna(), 'Correlação por Categoria', 'Correlação', 'Categoria',
+            formato_rotulo='{:.3f}', tamanho=(8, 6), chave=('descontos', *filtro, dataset.versao)
+        )
@@ -0,0 +1,94 @@
+"""Página de estoque crítico e rupturas."""
+import streamlit as st
+
+import graficos
+from analises import executar_analise
+from instrumentacao import cronometrado
+from memo import memo_da_sessao
+from paginas.comum import add_back_to_home_button, exibir_tabela, exibir_tabela_paginada
+
+
+@cronometrado('pagina:estoque')
+def renderizar(dataset):
+    """Renderiza a página de análise de estoque."""
+    add_back_to_home_button()
+
+    st.header("Análise de Estoque Crítico e Rupturas")
+    st.write("Esta página analisa a saúde do estoque, identificando produtos com baixa cobertura (próximos da ruptura) e a distribuição desses itens nos centros de inventário.")
+
+    # --- CONTROLES INTERATIVOS NA BARRA LATERAL ---
+    st.sidebar.header("Opções de Análise de Estoque")
+    X = st.sidebar.slider(
+        "Selecione o número de itens críticos para analisar (Top X):",
+        min_value=5,
+        max_value=50,
+        value=15  # Um valor padrão
+    )
+
+    # --- CÁLCULO E LÓGICA DA ANÁLISE ---
+    # Cobertura de Estoque (vendas médias diárias x estoque total) e os Top X críticos
+    resultado = executar_analise('estoque', dataset, memo=memo_da_sessao(), X=X)
+    df_criticos = resultado['criticos']
+
+    # --- EXIBIÇÃO NA PÁGINA PRINCIPAL ---
+
+    # 1. Alerta de Ruptura (Estoque Zerado)
+    st.subheader("🚨 Alerta de Ruptura de Estoque")
+    produtos_zerados = resultado['produtos_zerados']
+
+    if not produtos_zerados.empty:
+        st.warning(f"Encontrado(s) {len(produtos_zerados)} produto(s) com VENDA e ESTOQUE ZERADO!")
+        with st.expander("Clique para ver os produtos com estoque zerado"):
+            exibir_tabela_paginada(produtos_zerados, 'estoque_zerados', ('estoque', dataset.versao), width='stretch')
+    else:
+        st.success("Ótima notícia! Nenhum produto com vendas ativas foi encontrado com estoque zerado.")
+
+    st.write("---")
+
+    # 2. Análise de Cobertura de Estoque
+    st.markdown(f"""
+        <div style="text-align: center; padding-top: 20px;">
+            <p style="font-size: 40px; margin-bottom: 0;">Top {X} Produtos com Menor Cobertura de Estoque</p>
+            <p style="font-size: 20px; margin-bottom: 0;">Estes são os produtos com maior risco de ruptura nos próximos dias, com base na sua venda média.</p>
+    
+        </div>
+        """, unsafe_allow_html=True)
+    
+    _, a, _ = st.columns([1, 4, 1])
+    with a:
+
+        # Gráfico de Cobertura
+        graficos.barras_horizontais(
+            df_criticos.set_index('material_name')['dias_de_estoque'],
+            f'Top {X} Produtos com Estoque Mais Crítico (Cobertura Total)', 'Dias de Cobertura de Estoque', 'Produto',
+            formato_rotulo='{:.1f} dias', rotulo_centralizado=True, chave=('estoque', X, dataset.versao)
+        )
+
+        # Tabela de dados de cobertura
+        with st.expander(f"Clique para ver a tabela detalhada do Top {X} de itens críticos"):
+            exibir_tabela(
+                df_criticos[['material_name', 'dias_de_estoque', 'quantity', 'total_vendido', 'venda_media_diaria']],
+                width='stretch'
+            )
+
+        st.write("---")
+
+        # 3. Análise de Distribuição do Estoque por Centro
+        st.subheader(f"Distribuição do Estoque dos {X} Itens Mais Críticos por Centro")
+        st.write("Este gráfico mostra onde o estoque dos itens mais críticos está localizado. Um estoque total pode parecer saudável, mas se estiver no centro de inventário errado, o risco de ruptura local é alto.")
+
+        df_distribuicao_estoque = resultado['distribuicao']
+
+        # Gráfico de Distribuição
+        graficos.barras_agrupadas(
+            df_distribuicao_estoque, 'quantity', 'material_name', 'inventory_centre_id',
+            f'Distribuição de Estoque dos {X} Itens Mais Críticos por Centro', 'Quantidade em Estoque', 'Produto',
+            'Centro de Inventário', chave=('estoque', X, dataset.versao)
+        )
+
+        # Tabela de dados de distribuição
+        with st.expander(f"Clique para ver a tabela detalhada da distribuição de estoque"):
+            exibir_tabela_paginada(
+                df_distribuicao_estoque, 'estoque_distribuicao', ('estoque', X, dataset.versao),
+                colunas_busca=['material_name', 'inventory_centre_id'], width='stretch'
+            )
@@ -0,0 +1,139 @@
+"""Página de faturamento por categoria e produto."""
+import streamlit as st
+
+import graficos
+from analises import executar_analise
+from indice_datas import construir_indices_datas
+from instrumentacao import cronometrado
+from memo import memo_da_sessao
+from paginas.comum import add_back_to_home_button, exibir_tabela_paginada
+
+
+@cronometrado('pagina:faturamento')
+def renderizar(dataset):
+    """Renderiza a página de análise de faturamento."""
+    add_back_to_home_button()
+    st.header("Análise de Faturamento por Categoria e Produto")
+
+    # --- NOVO: Filtro de Data na Barra Lateral ---
+    st.sidebar.header("Opções de Análise")
+
+    # Opção para filtrar por um dia ou período específico
+    filtrar_por_data = st.sidebar.checkbox("Filtrar por período específico")
+
+    periodo_selecionado = None
+
+    if filtrar_por_data:
+        # Define os limites do seletor de data
+        indices = construir_indices_datas(dataset)
+        min_date = indices['pedidos'].data_minima
+        max_date = indices['pedidos'].data_maxima
+
+        periodo = st.sidebar.date_input(
+            "Selecione o dia ou período",
+            value=(max_date, max_date),  # Padrão para o dia mais recente
+            min_value=min_date,
+            max_value=max_date
+        )
+        # Enquanto o usuário escolhe o período, o seletor devolve apenas a data inicial
+        data_inicio, data_fim = (periodo[0], periodo[-1]) if isinstance(periodo, (tuple, list)) and periodo else (periodo, periodo)
+        periodo_selecionado = (data_inicio, data_fim)
+
+    # --- Opções de Visualização ---
+    st.sidebar.header("Opções de Faturamento")
+    top_x = st.sidebar.slider("Selecione o Top X para visualizar:", min_value=5, max_value=50, value=10)
+    calcular_com_desconto = st.sidebar.checkbox("Calcular faturamento líquido (considerando desconto)")
+
+    # --- Cálculos de Faturamento (usando o período filtrado) ---
+    resultado = executar_analise('faturamento', dataset, memo=memo_da_sessao(), periodo=periodo_selecionado, calcular_com_desconto=calcular_com_desconto)
+    if resultado['vazio']:
+        st.warning("Não há dados de faturamento para o período selecionado.")
+        return # Encerra a execução da função se não houver dados
+
+    if calcular_com_desconto:
+        st.info("Visualizando faturamento líquido estimado (preço do item - desconto médio do item).")
+    else:
+        st.info("Visualizando faturamento bruto (baseado apenas no preço do item).")
+
+    preco_por_categoria = resultado['preco_por_categoria']
+    preco_por_nome = resultado['preco_por_nome']
+
+    st.markdown(f"""
+        <div style="text-align: center; padding-top: 10px;">
+            <p style="font-size: 20px; margin-bottom: 0;">Faturamento Total</p>
+            <p style="font-size: 32px; font-weight: bold;">R$ {resultado['faturamento_total']:,.2f}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    chave_faturamento = ('faturamento', periodo_selecionado, top_x, calcular_com_desconto, dataset.versao)
+    col_graf1, col_graf2 = st.columns(2)
+
+    # --- Gráfico da Esquerda (Categorias) ---
+    with col_graf1:
+        graficos.barras_horizontais(
+            preco_por_categoria.head(top_x), f'Top {top_x} Categorias por Faturamento', 'Faturamento (R$)', 'Categoria',
+            formato_rotulo='R$ {:.0f}', rotulo_centralizado=True, chave=chave_faturamento
+        )
+
+    # --- Gráfico da Direita (Produtos) ---
+    with col_graf2:
+        graficos.barras_horizontais(
+            preco_por_nome.head(top_x), f'Top {top_x} Produtos por Faturamento', 'Faturamento (R$)', 'Nome',
+            formato_rotulo='R$ {:.0f}', rotulo_centralizado=True, chave=chave_faturamento
+        )
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+       
+        total_faturamento_cat = preco_por_categoria.sum()
+        st.markdown(f"""
+        <div style="text-align: center; padding-top: 10px;">
+            <p style="font-size: 20px; margin-bottom: 0;">Faturamento Total Estimado (Categorias)</p>
+            <p style="font-size: 32px; font-weight: bold;">R$ {total_faturamento_cat:,.2f}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.write("---")
+        st.write("**Faturamento Detalhado por Categoria**")
+        exibir_tabela_paginada(
+            preco_por_categoria, 'faturamento_categorias', chave_faturamento, colunas=['Categoria', 'Faturamento (R$)'],
+            preparar=lambda pagina: pagina.round(2), height=300, width='stretch'
+        )
+
+        st.write("---")
+        st.write("**Ticket Médio por Categoria**")
+
+        # Ticket médio (Faturamento Total / Número de Pedidos Únicos), já ordenado
+        exibir_tabela_paginada(
+            resultado['ticket_medio_categoria'], 'faturamento_ticket_categorias', chave_faturamento,
+            colunas=['Categoria', 'Ticket Médio (R$)'], height=300, width='stretch'
+        )
+
+
+    with col2:
+
+        # --- NOVO: Total e Tabela de Faturamento por Produto ---
+        total_faturamento_prod = preco_por_nome.sum()
+        st.markdown(f"""
+        <div style="text-align: center; padding-top: 10px;">
+            <p style="font-size: 20px; margin-bottom: 0;">Faturamento Total Estimado (Produtos)</p>
+            <p style="font-size: 32px; font-weight: bold;">R$ {total_faturamento_prod:,.2f}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.write("---")
+        st.write("**Faturamento Detalhado por Produto**")
+        exibir_tabela_paginada(
+            preco_por_nome, 'faturamento_produtos', chave_faturamento, colunas=['Produto', 'Faturamento (R$)'],
+            preparar=lambda pagina: pagina.round(2), height=300, width='stretch'
+        )
+
+        st.write("---")
+        st.write("**Ticket Médio por Produto**")
+
+        # Ticket médio (Faturamento Total / Número de Pedidos Únicos), já ordenado
+        exibir_tabela_paginada(
+            resultado['ticket_medio_produto'], 'faturamento_ticket_produtos', chave_faturamento,
+            colunas=['Produto', 'Ticket Médio (R$)'], height=300, width='stretch'
+        )
@@ -0,0 +1,67 @@
+"""Página inicial, com os atalhos para as análises; não carrega os dados."""
+import streamlit as st
+
+from instrumentacao import cronometrado
+
+
+@cronometrado('pagina:home')
+def renderizar():
+    
+    st.markdown(f"""
+<div style="text-align: center;">
+    <p style="font-size: 50px; margin-bottom: 0;"><strong>Dashboard de Análise de Dados - Gocase Fev/2025</strong></p>
+    <p style="font-size: 30px; margin-bottom: 0;"><strong>Este dashboard apresenta análises detalhadas sobre pedidos, descontos e faturamento. Navegue pelas seções abaixo para explorar os dados.</strong></p>
+</div>
+                
+""", unsafe_allow_html=True)
+    st.divider()
+
+    col1, col2, col3 = st.columns(3, gap="large")
+    
+    with col1:
+        st.info("📦 **Pedidos por Dia**")
+        st.write("Visualize a distribuição de pedidos ao longo do tempo e identifique tendências diárias.")
+        if st.button("Analisar Pedidos", key="nav_pedidos"):
+            st.session_state.page = 'pedidos'
+            st.rerun()
+
+    with col2:
+        st.info("💰 **Análise de Descontos**")
+        st.write("Explore o impacto dos descontos e sua correlação com o número de vendas diárias.")
+        if st.button("Analisar Descontos", key="nav_descontos"):
+            st.session_state.page = 'descontos'
+            st.rerun()
+
+        
+            
+    with col3:
+        st.info("📊 **Faturamento por Categoria e Produto**")
+        st.write("Descubra quais categorias e produtos geram mais receita para o negócio.")
+        if st.button("Analisar Faturamento", key="nav_faturamento"):
+            st.session_state.page = 'faturamento'
+            st.rerun()
+
+    st.divider()
+
+    col4, col5, col6 = st.columns(3, gap='large')
+
+    with col4:
+        st.info("❌ **Cancelamento de Pedidos**")
+        st.write("Descubra quais categorias e produtos geram mais cancelamento para o negócio.")
+        if st.button("Analisar Cancelamento", key="nav_cancelamento"):
+            st.session_state.page = 'cancelamento'
+            st.rerun()
+    
+    with col5:
+        st.info("🏭 **Análise de Estoque**")
+        st.write("Visualize o Estoque e descobra as Rupturas e Produtos Críticos.")
+        if st.button("Analisar Estoque", key="nav_estoque"):
+            st.session_state.page = 'estoque'
+            st.rerun()
+    
+    with col6:
+        st.info("⏰ **Análise de Atraso**")
+        st.write("Visualize os Atrasos e Problemas Logísticos.")
+        if st.button("Analisar Atraso", key="nav_atraso"):
+            st.session_state.page = 'atraso'
+            st.rerun()
@@ -0,0 +1,60 @@
+"""Página de pedidos por dia."""
+import streamlit as st
+
+import graficos
+from analises import executar_analise
+from instrumentacao import cronometrado
+from memo import memo_da_sessao
+from paginas.comum import add_back_to_home_button, exibir_tabela
+
+
+@cronometrado('pagina:pedidos')
+def renderizar(dataset):
+    
+    add_back_to_home_button()
+    st.markdown(f"""
+        <div style="text-align: center; padding-top: 20px;">
+            <p style="font-size: 40px; margin-bottom: 0;">Distribuição dos Pedidos</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    resultado = executar_analise('pedidos', dataset, memo=memo_da_sessao())
+    serie_pedidos = resultado['serie_pedidos']
+    
+    _, col0, _ = st.columns([1, 3, 1])
+    with col0:
+
+        graficos.linha_diaria(
+            serie_pedidos, 'Pedidos por dia', 'Dia', 'Número de Pedidos',
+            rotulo_media='Média: {:.1f} pedidos/dia', formato_data='%d',
+            chave=('pedidos', dataset.versao)
+        )
+
+    st.write("---")
+
+    # --- NOVO: Métrica de Total de Pedidos e Tabela de Dados ---
+
+    # Usando colunas para centralizar a métrica e mostrar a tabela ao lado
+    col1, col2 = st.columns(2)
+
+    with col1:
+        total_pedidos = resultado['total_pedidos']
+        
+        # Markdown para exibir o total de pedidos de forma customizada
+        st.markdown(f"""
+        <div style="text-align: center; padding-top: 20px;">
+            <p style="font-size: 40px; margin-bottom: 0;">Total de Pedidos no Período</p>
+            <p style="font-size: 62px; font-weight: bold;">{total_pedidos}</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.subheader("Dados Diários")
+        
+        df_tabela = serie_pedidos.reset_index()
+        df_tabela.columns = ['Dia', 'Quantidade de Pedidos']
+
+        df_tabela['Dia'] = df_tabela['Dia'].dt.strftime('%d/%m/%Y')
+        
+        # Usa st.dataframe para uma tabela com barra de rolagem
+        exibir_tabela(df_tabela, height=500, width='stretch')
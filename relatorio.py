@@ -0,0 +1,170 @@
+"""Gerador de relatórios em lote: executa as análises de todas as páginas sem o Streamlit.
+
+Cada combinação de parâmetros da grade vira um diretório
+``<saida>/<versao dos dados>/<análise>/<parâmetros>/`` com um Parquet por
+tabela/série e um ``manifesto.json`` com as métricas escalares. O dashboard
+serve esses resultados em vez de calculá-los quando a variável de ambiente
+``DASHBOARD_RELATORIOS`` aponta para ``<saida>``.
+
+Uso::
+
+    python relatorio.py --saida relatorios --top-x 10 20 50 --limites 5 10 --processos 4
+"""
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from analises import estados_disponiveis, funcao_analise
+from dataset import ler_dataset
+from incremental import aplicar_deltas
+from outliers import LIMIAR_PADRAO, METODOS
+
+DIRETORIO_PADRAO = 'relatorios'
+ARQUIVO_MANIFESTO = 'manifesto.json'
+
+_dataset = None
+
+
+def _valor_slug(valor):
+    if isinstance(valor, (tuple, list)):
+        return '_'.join(_valor_slug(v) for v in valor)
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    return str(valor)
+
+
+def slug_parametros(parametros):
+    """Nome de diretório estável para uma combinação de parâmetros."""
+    if not parametros:
+        return 'padrao'
+    partes = [f"{chave}={_valor_slug(valor)}" for chave, valor in sorted(parametros.items())]
+    return re.sub(r'[^\w=.-]+', '-', '__'.join(partes))
+
+
+def caminho_resultado(saida, nome, versao, parametros):
+    return os.path.join(saida, versao, nome, slug_parametros(parametros))
+
+
+def _escalar(valor):
+    # Tipos do NumPy não são serializáveis em JSON
+    return valor.item() if hasattr(valor, 'item') else valor
+
+
+def salvar_resultado(resultado, destino):
+    """Grava o dicionário de uma análise: tabelas e séries em Parquet, escalares no manifesto."""
+    os.makedirs(destino, exist_ok=True)
+    manifesto = {}
+    for chave, valor in resultado.items():
+        if isinstance(valor, pd.DataFrame):
+            valor.to_parquet(os.path.join(destino, f"{chave}.parquet"))
+            manifesto[chave] = {'tipo': 'tabela'}
+        elif isinstance(valor, pd.Series):
+            valor.to_frame(name='valor').to_parquet(os.path.join(destino, f"{chave}.parquet"))
+            manifesto[chave] = {'tipo': 'serie', 'nome': valor.name}
+        else:
+            manifesto[chave] = {'tipo': 'escalar', 'valor': _escalar(valor)}
+
+    # O manifesto é gravado por último e de forma atômica: ele marca o resultado como completo
+    temporario = os.path.join(destino, f"{ARQUIVO_MANIFESTO}.{os.getpid()}.tmp")
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, default=str)
+    os.replace(temporario, os.path.join(destino, ARQUIVO_MANIFESTO))
+
+
+def ler_resultado(destino):
+    """Lê um resultado gravado por :func:`salvar_resultado` (ou ``None`` se incompleto)."""
+    caminho_manifesto = os.path.join(destino, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho_manifesto):
+        return None
+    with open(caminho_manifesto, encoding='utf-8') as arquivo:
+        manifesto = json.load(arquivo)
+
+    resultado = {}
+    for chave, item in manifesto.items():
+        if item['tipo'] == 'escalar':
+            resultado[chave] = item['valor']
+            continue
+        tabela = pd.read_parquet(os.path.join(destino, f"{chave}.parquet"))
+        resultado[chave] = tabela['valor'].rename(item['nome']) if item['tipo'] == 'serie' else tabela
+    return resultado
+
+
+def ler_resultado_precalculado(nome, versao, parametros):
+    """Resultado pré-calculado para o dashboard, se ``DASHBOARD_RELATORIOS`` estiver definido."""
+    saida = os.environ.get('DASHBOARD_RELATORIOS')
+    if not saida:
+        return None
+    return ler_resultado(caminho_resultado(saida, nome, versao, parametros))
+
+
+def montar_grade(dataset, top_x, limites, estados=None):
+    """Lista de tarefas ``(análise, parâmetros)`` a executar."""
+    tarefas = [('pedidos', {})]
+    tarefas += [('descontos', {'desconsiderar_outliers': False})]
+    tarefas += [
+        ('descontos', {'desconsiderar_outliers': True, 'metodo_outliers': metodo, 'limiar_outliers': LIMIAR_PADRAO[metodo]})
+        for metodo in METODOS
+    ]
+    tarefas += [('faturamento', {'periodo': None, 'calcular_com_desconto': liquido}) for liquido in (False, True)]
+    tarefas += [('cancelamento', {'X': x}) for x in top_x]
+    tarefas += [('estoque', {'X': x}) for x in top_x]
+
+    estados = estados or estados_disponiveis(dataset)
+    tarefas += [
+        ('atraso', {'estado_selecionado': estado, 'estoque_critico_limite': limite})
+        for estado in estados for limite in limites
+    ]
+    return tarefas
+
+
+def _inicializar_worker():
+    global _dataset
+    import streamlit.logger
+
+    # Fora de uma sessão os caches do Streamlit funcionam em memória, mas avisam a cada chamada
+    streamlit.logger.set_log_level('error')
+    # Com os mesmos deltas do dashboard, a versão dos resultados coincide com a dele
+    _dataset = aplicar_deltas(ler_dataset())
+
+
+def _executar_tarefa(saida, nome, parametros):
+    inicio = time.perf_counter()
+    resultado = funcao_analise(nome)(_dataset, **parametros)
+    salvar_resultado(resultado, caminho_resultado(saida, nome, _dataset.versao, parametros))
+    return nome, parametros, time.perf_counter() - inicio
+
+
+def gerar_relatorios(saida, top_x, limites, estados=None, processos=None):
+    """Executa a grade completa em um pool de processos e grava os resultados em ``saida``."""
+    _inicializar_worker()
+    tarefas = montar_grade(_dataset, top_x, limites, estados)
+
+    with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_worker) as pool:
+        futuros = [pool.submit(_executar_tarefa, saida, nome, parametros) for nome, parametros in tarefas]
+        for futuro in as_completed(futuros):
+            nome, parametros, duracao = futuro.result()
+            print(f"{nome:<13} {slug_parametros(parametros):<60} {duracao:6.2f}s")
+
+    return os.path.join(saida, _dataset.versao)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pré-calcula as análises do dashboard e grava os resultados em Parquet.")
+    parser.add_argument('--saida', default=DIRETORIO_PADRAO, help="Diretório de saída (padrão: %(default)s)")
+    parser.add_argument('--top-x', type=int, nargs='+', default=[15, 20], help="Valores de Top X para cancelamento e estoque")
+    parser.add_argument('--limites', type=int, nargs='+', default=[10], help="Limites de estoque crítico (unidades) para atrasos")
+    parser.add_argument('--estados', nargs='+', help="Estados para a análise de atrasos (padrão: todos)")
+    parser.add_argument('--processos', type=int, help="Número de processos (padrão: número de CPUs)")
+    args = parser.parse_args(argv)
+
+    destino = gerar_relatorios(args.saida, args.top_x, args.limites, args.estados, args.processos)
+    print(f"Relatórios gravados em {destino}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Cubo diário pré-agregado dos pedidos, usado pelas páginas de séries temporais.
+
+Cada linha é um dia (índice ``created_at``) com contagens e somas aditivas.
+Médias são derivadas das somas e contagens, então o custo de desenhar um mês
+ou um ano de pedidos é o mesmo: o número de dias.
+"""
+import pandas as pd
+import streamlit as st
+
+from dataset import HASH_DATASET, VERSOES_EM_CACHE
+from financeiro import calcular_financeiro_pedidos
+from instrumentacao import cronometrado
+
+COLUNAS_ROLLUP = [
+    'qtd_pedidos', 'pedidos_distintos', 'soma_nf', 'soma_frete',
+    'soma_desconto', 'contagem_desconto', 'pedidos_distintos_desconto',
+]
+COLUNAS_INTEIRAS = ['qtd_pedidos', 'pedidos_distintos', 'contagem_desconto', 'pedidos_distintos_desconto']
+
+
+def agregar_dias(df_pedido, df_financeiro_pedidos):
+    """Agrega por dia os pedidos e os descontos calculados da tabela financeira."""
+    return _completar_dias(_agregar(df_pedido, df_financeiro_pedidos))
+
+
+def _agregar(df_pedido, df_financeiro_pedidos):
+    """Agregados dos dias que têm pedidos, sem completar os dias vazios."""
+    dia_pedido = df_pedido['created_at'].dt.floor('D')
+    pedidos = df_pedido.groupby(dia_pedido).agg(
+        qtd_pedidos=('order_id', 'size'),
+        pedidos_distintos=('order_id', 'nunique'),
+        soma_nf=('Valor de NF (R$)', 'sum'),
+        soma_frete=('Frete Cobrado do Cliente (R$)', 'sum'),
+    )
+
+    dia_financeiro = df_financeiro_pedidos['created_at'].dt.floor('D')
+    descontos = df_financeiro_pedidos.groupby(dia_financeiro).agg(
+        soma_desconto=('desconto_calculado', 'sum'),
+        contagem_desconto=('desconto_calculado', 'count'),
+        pedidos_distintos_desconto=('order_id', 'nunique'),
+    )
+    return pedidos.join(descontos, how='outer')
+
+
+def _completar_dias(rollup):
+    """Inclui os dias sem pedidos (como o resample('D') faz) e fixa os tipos."""
+    if not rollup.empty:
+        rollup = rollup.reindex(pd.date_range(rollup.index.min(), rollup.index.max(), freq='D'))
+    rollup = rollup.reindex(columns=COLUNAS_ROLLUP).fillna(0)
+    rollup[COLUNAS_INTEIRAS] = rollup[COLUNAS_INTEIRAS].astype('int64')
+    rollup.index.name = 'created_at'
+    return rollup
+
+
+def atualizar_rollup_diario(rollup, df_pedido_novos, df_financeiro_novos):
+    """Incorpora novos pedidos agregando apenas os dias novos.
+
+    O último dia já agregado pode ter sido parcial, então ele é reagregado
+    junto com os dias novos: ``df_pedido_novos`` e ``df_financeiro_novos``
+    devem conter todos os pedidos a partir desse dia.
+    """
+    if rollup.empty:
+        return agregar_dias(df_pedido_novos, df_financeiro_novos)
+
+    ultimo_dia = rollup.index.max()
+    novos = agregar_dias(
+        df_pedido_novos[df_pedido_novos['created_at'] >= ultimo_dia],
+        df_financeiro_novos[df_financeiro_novos['created_at'] >= ultimo_dia],
+    )
+    if novos.empty:
+        return rollup
+    return _completar_dias(pd.concat([rollup[rollup.index < novos.index.min()], novos]))
+
+
+def reagregar_dias(rollup, df_pedido, df_financeiro_pedidos, dias):
+    """Recalcula só os ``dias`` do cubo a partir dos frames completos, já atualizados.
+
+    Usado quando pedidos de dias já agregados mudam ou são acrescentados: os
+    demais dias são mantidos como estão.
+    """
+    dias = pd.DatetimeIndex(dias).dropna().unique()
+    if rollup.empty:
+        return agregar_dias(df_pedido, df_financeiro_pedidos)
+
+    recalculados = _agregar(
+        df_pedido[df_pedido['created_at'].dt.floor('D').isin(dias)],
+        df_financeiro_pedidos[df_financeiro_pedidos['created_at'].dt.floor('D').isin(dias)],
+    )
+    combinado = pd.concat([rollup.drop(dias, errors='ignore'), recalculados]).sort_index()
+
+    # Dias das pontas que ficaram sem pedidos saem do intervalo, como em agregar_dias
+    com_pedidos = combinado.index[combinado['qtd_pedidos'] > 0]
+    if com_pedidos.empty:
+        return _completar_dias(combinado.iloc[:0])
+    return _completar_dias(combinado.loc[com_pedidos.min():com_pedidos.max()])
+
+
+@st.cache_resource(show_spinner=False, hash_funcs=HASH_DATASET, max_entries=VERSOES_EM_CACHE)
+@cronometrado('calcular_rollup_diario')
+def calcular_rollup_diario(dataset):
+    """Cubo diário da versão dos dados (compartilhado entre sessões, somente leitura)."""
+    if 'rollup' in dataset.derivados:
+        return dataset.derivados['rollup']
+    return agregar_dias(dataset.pedidos, calcular_financeiro_pedidos(dataset))
+
+
+def serie_pedidos_por_dia(rollup):
+    """Pedidos distintos por dia, equivalente a ``resample('D')['order_id'].nunique()``."""
+    return rollup['pedidos_distintos'].rename('order_id')
+
+
+def serie_desconto_medio(rollup):
+    """Desconto médio por dia e pedidos distintos com desconto calculado."""
+    serie_desconto = (rollup['soma_desconto'] / rollup['contagem_desconto'].where(rollup['contagem_desconto'] > 0)).rename('desconto_calculado')
+    serie_pedidos = rollup['pedidos_distintos_desconto'].rename('order_id')
+    return serie_desconto, serie_pedidos